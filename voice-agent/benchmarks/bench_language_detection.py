@@ -0,0 +1,77 @@
+"""
+Language Detection Micro-benchmark
+Per-transcript latency of detect_language compared with the original chain of
+per-script any() scans in VoiceAgent.on_user_speech_committed
+
+Run with: python benchmarks/bench_language_detection.py
+"""
+
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from language_detection import detect_language
+
+SAMPLES = [
+    "What is my balance for account 4421? I also want to see my last ten transactions and pending bills please.",
+    "मेरे खाते 4421 का बैलेंस बताइए",
+    "నా ఖాతా బ్యాలెన్స్ ఎంత?",
+    "என் கணக்கு இருப்பு என்ன?",
+    "ನನ್ನ ಖಾತೆಯ ಬ್ಯಾಲೆನ್ಸ್ ಎಷ್ಟು?",
+    "എന്റെ അക്കൗണ്ട് ബാലൻസ് എത്രയാണ്?",
+    "আমার অ্যাকাউন্টের ব্যালেন্স কত?",
+    "ਮੇਰਾ ਬੈਲੈਂਸ ਕਿੰਨਾ ਹੈ?",
+    "મારું બેલેન્સ કેટલું છે?",
+    "ମୋ ବାଲାନ୍ସ କେତେ?",
+    "Anjali ko 500 rupees bhej do, aur BESCOM ka bill bhi pay kar do",
+]
+
+
+def legacy_detect(text: str) -> str:
+    """The original implementation: up to ten generator scans per transcript"""
+    if any("\u0900" <= char <= "\u097f" for char in text):
+        return "hi-IN"
+    elif any("\u0c00" <= char <= "\u0c7f" for char in text):
+        return "te-IN"
+    elif any("\u0a80" <= char <= "\u0aff" for char in text):
+        return "gu-IN"
+    elif any("\u0b80" <= char <= "\u0bff" for char in text):
+        return "ta-IN"
+    elif any("\u0c80" <= char <= "\u0cff" for char in text):
+        return "kn-IN"
+    elif any("\u0d00" <= char <= "\u0d7f" for char in text):
+        return "ml-IN"
+    elif any("\u0980" <= char <= "\u09ff" for char in text):
+        return "bn-IN"
+    elif any("\u0a00" <= char <= "\u0a7f" for char in text):
+        return "pa-IN"
+    elif any("\u0b00" <= char <= "\u0b7f" for char in text):
+        return "od-IN"
+    return "en-IN"
+
+
+def per_call_us(fn, samples, number: int = 20_000) -> float:
+    seconds = min(
+        timeit.repeat(
+            lambda: [fn(s) for s in samples], number=number // len(samples), repeat=5
+        )
+    )
+    return seconds / number * 1e6
+
+
+if __name__ == "__main__":
+    for sample in SAMPLES:
+        if detect_language(sample).language != legacy_detect(sample):
+            print(
+                f"MISMATCH: {sample!r}: {detect_language(sample).language} vs {legacy_detect(sample)}"
+            )
+
+    english = [SAMPLES[0], SAMPLES[-1]]
+    for label, samples in (("all samples", SAMPLES), ("english only", english)):
+        legacy = per_call_us(legacy_detect, samples)
+        current = per_call_us(lambda s: detect_language(s).language, samples)
+        print(
+            f"{label:12}: legacy {legacy:6.2f} µs, current {current:6.2f} µs  ({legacy / current:.1f}x faster)"
+        )
@@ -0,0 +1,120 @@
+"""
+Sanitizer Micro-benchmark
+Per-call latency of sanitize_response on realistic multilingual LLM output,
+compared with the original multi-pass implementation, and time until the first
+clean text reaches TTS when streaming LLM deltas instead of buffering the reply
+
+Run with: python benchmarks/bench_sanitizer.py
+"""
+
+import asyncio
+import os
+import re
+import sys
+import time
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from sanitizer import sanitize_response, sanitize_stream
+
+SAMPLES = [
+    "Your account 4421 has 27,940 rupees.",
+    "आपके खाते 4421 में 27,940 रुपये हैं। क्या मैं और कुछ मदद कर सकती हूँ?",
+    "మీ ఖాతా 4421 లో 27,940 రూపాయలు ఉన్నాయి.",
+    "உங்கள் கணக்கில் 27,940 ரூபாய் உள்ளது. வேறு ஏதாவது உதவி வேண்டுமா?",
+    'Tool: get_banking_data Parameters: {"data_type": "balance", "account_number": "4421"} Your balance is 27,940 rupees.',
+    "Let me check that for you. calling get_banking_data with data_type=balance. आपका बैलेंस 27,940 रुपये है।",
+    "Alright, transfer 500 rupees to Anjali Verma. Is that correct?",
+    "Personal loan is 10.5% per year, home loan is 8.5% per year , car loan is 9.2% per year ..",
+    "Your pending bills are BESCOM 720 rupees, Water 350 rupees and Gas 845 rupees.   Would you like to pay one?",
+    'ನಿಮ್ಮ ಖಾತೆ 4421 ರಲ್ಲಿ 27,940 ರೂಪಾಯಿ ಇದೆ. {"status": "success"}',
+]
+
+
+def legacy_sanitize_response(text: str) -> str:
+    """The original implementation: ~15 uncompiled re.sub passes per call"""
+    if not text:
+        return text
+    text = re.sub(
+        r"Tool:\s*\w+\s+Parameters:\s*\{[^}]*\}", "", text, flags=re.IGNORECASE
+    )
+    text = re.sub(
+        r"\b(Tool|Function|API|called with|calling|Parameters?):\s*[^\n.]*",
+        "",
+        text,
+        flags=re.IGNORECASE,
+    )
+    text = re.sub(r'\{["\']?\w+["\']?\s*:\s*[^}]{0,100}\}', "", text)
+    for func_name in [
+        "get_banking_data",
+        "transfer_funds",
+        "pay_bill",
+        "check_balance",
+    ]:
+        text = re.sub(rf"\b{func_name}\b", "", text, flags=re.IGNORECASE)
+    for marker in [
+        r"data_type\s*=",
+        r"account_number\s*=",
+        r"called with",
+        r"executing",
+        r"running tool",
+        r"using function",
+    ]:
+        text = re.sub(marker, "", text, flags=re.IGNORECASE)
+    text = re.sub(r"\s+([.,!?])", r"\1", text)
+    text = re.sub(r"\s{2,}", " ", text)
+    text = re.sub(r"^\s+|\s+$", "", text)
+    text = re.sub(r"[.!?]\s*[.!?]+", ".", text)
+    return text
+
+
+def per_call_us(fn, number: int = 20_000) -> float:
+    seconds = min(
+        timeit.repeat(
+            lambda: [fn(s) for s in SAMPLES], number=number // len(SAMPLES), repeat=5
+        )
+    )
+    return seconds / number * 1e6
+
+
+async def llm_deltas(text: str, seconds_per_token: float):
+    """Simulated LLM: one whitespace-delimited token every seconds_per_token"""
+    for token in re.findall(r"\S+\s*", text):
+        await asyncio.sleep(seconds_per_token)
+        yield token
+
+
+async def time_to_first_text(
+    text: str, seconds_per_token: float = 0.02
+) -> tuple[float, float]:
+    """(buffered, streaming) seconds until the first clean text is ready for TTS"""
+    started = time.perf_counter()
+    reply = "".join([delta async for delta in llm_deltas(text, seconds_per_token)])
+    sanitize_response(reply)
+    buffered = time.perf_counter() - started
+
+    started = time.perf_counter()
+    async for _ in sanitize_stream(llm_deltas(text, seconds_per_token)):
+        break
+    return buffered, time.perf_counter() - started
+
+
+if __name__ == "__main__":
+    mismatches = [
+        s for s in SAMPLES if sanitize_response(s) != legacy_sanitize_response(s)
+    ]
+    for sample in mismatches:
+        print(
+            f"MISMATCH: {sample!r}\n  new:    {sanitize_response(sample)!r}\n  legacy: {legacy_sanitize_response(sample)!r}"
+        )
+
+    legacy = per_call_us(legacy_sanitize_response)
+    current = per_call_us(sanitize_response)
+    print(f"legacy  : {legacy:7.2f} µs/call")
+    print(f"current : {current:7.2f} µs/call  ({legacy / current:.1f}x faster)")
+
+    reply = " ".join(SAMPLES[4:7])
+    buffered, streaming = asyncio.run(time_to_first_text(reply))
+    print(f"first text to TTS, buffered  : {buffered * 1000:6.0f} ms")
+    print(f"first text to TTS, streaming : {streaming * 1000:6.0f} ms")
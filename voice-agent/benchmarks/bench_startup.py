@@ -0,0 +1,56 @@
+"""
+Session Startup Benchmark
+Per-session model setup cost when every session loads its own Silero VAD
+(the old VoiceAgent.__init__) versus reusing the one loaded by the worker's
+prewarm hook
+
+Run with: python benchmarks/bench_startup.py [--sessions 20]
+"""
+
+import argparse
+import resource
+import time
+
+from livekit.plugins import silero
+
+
+def load_vad():
+    return silero.VAD.load(
+        min_speech_duration=0.1,
+        min_silence_duration=0.5,
+        prefix_padding_duration=0.2,
+        max_buffered_speech=30.0,
+    )
+
+
+def rss_mb() -> float:
+    # ru_maxrss is KiB on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Compare per-session VAD loading with a prewarmed shared VAD"
+    )
+    parser.add_argument("--sessions", type=int, default=20)
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    userdata = {"vad": load_vad()}
+    prewarm_ms = (time.perf_counter() - started) * 1000
+    baseline_rss = rss_mb()
+
+    started = time.perf_counter()
+    shared = [userdata["vad"] for _ in range(args.sessions)]
+    shared_ms = (time.perf_counter() - started) * 1000 / args.sessions
+
+    started = time.perf_counter()
+    per_session = [load_vad() for _ in range(args.sessions)]
+    per_session_ms = (time.perf_counter() - started) * 1000 / args.sessions
+
+    print(f"prewarm (once per process): {prewarm_ms:8.2f} ms")
+    print(f"per session, prewarmed    : {shared_ms:8.4f} ms")
+    print(
+        f"per session, load each    : {per_session_ms:8.2f} ms, "
+        f"peak RSS +{rss_mb() - baseline_rss:.0f} MB for {args.sessions} sessions"
+    )
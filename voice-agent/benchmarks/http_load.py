@@ -0,0 +1,202 @@
+"""
+Mock Banking API HTTP Load Test
+Reports requests per second and latency percentiles for each read endpoint of mock_banking_api
+
+Starts the API with the requested number of workers (or targets --url), then
+drives one endpoint at a time for --duration seconds from --processes client
+processes with --concurrency keep-alive connections each. Requests rotate over
+synthetic users so lookups are not all served from one record. With --db the
+API serves a SQLite database seeded beforehand with
+`python mock_banking_sqlite.py seed DB --users N` (same N as --users).
+
+Run with: python benchmarks/http_load.py --workers 4 --processes 4 --concurrency 32
+"""
+
+import argparse
+import asyncio
+import multiprocessing
+import os
+import socket
+import subprocess
+import sys
+import time
+from typing import Optional
+
+import httpx
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from mock_banking_seed import generate_users
+
+# name -> path template; {user_id} and {account} rotate over synthetic users
+ENDPOINTS: dict[str, str] = {
+    "loans": "/api/loans",
+    "interest_rates": "/api/interest-rates",
+    "account_user": "/api/accounts/{account}/user",
+    "balance": "/api/accounts/{account}/balance",
+    "accounts": "/api/users/{user_id}/accounts",
+    "transactions": "/api/users/{user_id}/transactions?limit=10",
+    "spending": "/api/users/{user_id}/spending?group_by=category",
+    "bills": "/api/users/{user_id}/bills",
+    "batch": "/api/batch?account_number={account}&fields=accounts,bills,transactions,contacts,credit_limit",
+}
+
+
+def percentile(ordered: list[float], p: float) -> float:
+    if not ordered:
+        return float("nan")
+    return ordered[min(len(ordered) - 1, int(p / 100 * len(ordered)))]
+
+
+async def _drive(
+    url: str, paths: list[str], concurrency: int, duration: float
+) -> tuple[list[float], int]:
+    latencies: list[float] = []
+    errors = 0
+    deadline = time.perf_counter() + duration
+    limits = httpx.Limits(
+        max_connections=concurrency, max_keepalive_connections=concurrency
+    )
+
+    async with httpx.AsyncClient(base_url=url, limits=limits, timeout=10.0) as client:
+
+        async def worker(offset: int) -> None:
+            nonlocal errors
+            i = offset
+            while time.perf_counter() < deadline:
+                started = time.perf_counter()
+                try:
+                    response = await client.get(paths[i % len(paths)])
+                    if response.status_code != 200:
+                        errors += 1
+                except httpx.HTTPError:
+                    errors += 1
+                latencies.append(time.perf_counter() - started)
+                i += concurrency
+
+        await asyncio.gather(*(worker(n) for n in range(concurrency)))
+    return latencies, errors
+
+
+def _client_process(args: tuple[str, list[str], int, float]) -> tuple[list[float], int]:
+    return asyncio.run(_drive(*args))
+
+
+def run_endpoint(
+    pool, url: str, paths: list[str], processes: int, concurrency: int, duration: float
+) -> dict:
+    """Load one endpoint from all client processes at once"""
+    started = time.perf_counter()
+    shards = [paths[n::processes] or paths for n in range(processes)]
+    results = pool.map(
+        _client_process, [(url, shard, concurrency, duration) for shard in shards]
+    )
+    elapsed = time.perf_counter() - started
+    latencies = sorted(latency for shard, _ in results for latency in shard)
+    return {
+        "requests": len(latencies),
+        "errors": sum(errors for _, errors in results),
+        "rps": len(latencies) / elapsed,
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p95_ms": percentile(latencies, 95) * 1000,
+        "p99_ms": percentile(latencies, 99) * 1000,
+    }
+
+
+def start_api(
+    workers: int, users: int, db: Optional[str] = None
+) -> tuple[subprocess.Popen, str]:
+    """Serve mock_banking_api with `workers` processes on a free port"""
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        port = s.getsockname()[1]
+    if db is not None:
+        env = {**os.environ, "MOCK_BANK_DB": os.path.abspath(db)}
+    else:
+        env = {**os.environ, "MOCK_BANK_SYNTHETIC_USERS": str(users)}
+    server = subprocess.Popen(
+        [
+            sys.executable,
+            "mock_banking_api.py",
+            "--port",
+            str(port),
+            "--workers",
+            str(workers),
+            "--no-access-log",
+            "--no-cors",
+        ],
+        cwd=os.path.join(os.path.dirname(__file__), ".."),
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    url = f"http://127.0.0.1:{port}"
+    for _ in range(300):
+        try:
+            httpx.get(f"{url}/", timeout=0.5)
+            return server, url
+        except httpx.TransportError:
+            time.sleep(0.1)
+    server.terminate()
+    raise RuntimeError("Mock banking API did not start")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[1])
+    parser.add_argument(
+        "--workers", type=int, default=1, help="API worker processes to start"
+    )
+    parser.add_argument("--processes", type=int, default=2, help="client processes")
+    parser.add_argument(
+        "--concurrency", type=int, default=32, help="connections per client process"
+    )
+    parser.add_argument(
+        "--duration", type=float, default=5.0, help="seconds per endpoint"
+    )
+    parser.add_argument(
+        "--users",
+        type=int,
+        default=10_000,
+        help="synthetic users to serve and rotate over",
+    )
+    parser.add_argument(
+        "--endpoints",
+        default=",".join(ENDPOINTS),
+        help="comma-separated subset of endpoints",
+    )
+    parser.add_argument("--url", help="load a running API instead of starting one")
+    parser.add_argument(
+        "--db", help="serve this seeded SQLite database instead of the in-memory store"
+    )
+    args = parser.parse_args()
+
+    # Must match the users the server generated (same count, default seed)
+    users = [
+        (user_id, user["accounts"][0]["account_number"])
+        for user_id, user in generate_users(args.users)
+    ]
+    server = None
+    url = args.url
+    if url is None:
+        server, url = start_api(args.workers, args.users, args.db)
+    try:
+        print(
+            f"{'endpoint':<16} {'req/s':>9} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'errors':>7}"
+        )
+        with multiprocessing.get_context("spawn").Pool(args.processes) as pool:
+            for name in args.endpoints.split(","):
+                paths = [
+                    ENDPOINTS[name].format(user_id=user_id, account=account)
+                    for user_id, account in users
+                ]
+                result = run_endpoint(
+                    pool, url, paths, args.processes, args.concurrency, args.duration
+                )
+                print(
+                    f"{name:<16} {result['rps']:>9.0f} {result['p50_ms']:>8.2f} {result['p95_ms']:>8.2f} "
+                    f"{result['p99_ms']:>8.2f} {result['errors']:>7}"
+                )
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
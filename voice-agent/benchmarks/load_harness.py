@@ -0,0 +1,597 @@
+"""
+Concurrent Call Load Harness
+Runs N synthetic AgentSessions of VoiceAgent in one worker process, with
+deterministic local stand-ins for Sarvam STT/TTS and the Groq/Gemini LLM,
+against the mock banking API
+
+Every synthetic caller speaks a fixed script (balance, transactions, spending,
+loan rates, contacts) from its own synthetic bank account. Each stand-in's
+latency is drawn from a log-normal distribution given as median:p95 in ms.
+Turn latency runs from the moment the caller stops speaking to the first agent
+audio frame, so it covers STT finalization, endpointing, the fast path or LLM
+plus tools, and TTS time-to-first-byte. Agent audio is "played" in real time,
+so a session stays busy for as long as a real call would.
+
+Reports p50/p95/p99 turn latency, throughput and RSS per call at each
+concurrency level. All sessions share one event loop, like the jobs of one
+worker process.
+
+Run with: python benchmarks/load_harness.py --concurrency 1,10,50 --turns 5
+"""
+
+import argparse
+import asyncio
+import contextvars
+import json
+import logging
+import math
+import os
+import random
+import resource
+import socket
+import subprocess
+import sys
+import time
+import uuid
+from dataclasses import dataclass, field
+from typing import Any, Callable, Optional
+
+import httpx
+from livekit import rtc
+from livekit.agents import AgentSession, APIConnectOptions, llm, stt, tts
+from livekit.agents.voice import io
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from context_budget import estimate_tokens
+from mock_banking_seed import generate_users
+from speech_pool import SpeechModelPool
+from tts_cache import TTSAudioCache
+
+SAMPLE_RATE = 16000
+FRAME_MS = 20
+CONN_OPTIONS = APIConnectOptions()
+
+# (what the caller says, tool the stand-in LLM calls for it or None)
+SCRIPT = [
+    ("What's my balance for account {account}?", None),
+    ("Show me my recent transactions", "get_transactions"),
+    ("How much did I spend by category?", "get_spending"),
+    ("What are the loan interest rates?", None),
+    ("Who can I send money to?", "get_contacts"),
+]
+
+
+@dataclass
+class Latency:
+    """Log-normal latency given by its median and 95th percentile"""
+
+    median_ms: float
+    p95_ms: float
+
+    @classmethod
+    def parse(cls, value: str) -> "Latency":
+        median, _, p95 = value.partition(":")
+        return cls(float(median), float(p95 or median))
+
+    def sample(self, rng: random.Random) -> float:
+        """One draw, in seconds"""
+        if self.p95_ms <= self.median_ms:
+            return self.median_ms / 1000
+        sigma = math.log(self.p95_ms / self.median_ms) / 1.645
+        return rng.lognormvariate(math.log(self.median_ms), sigma) / 1000
+
+
+@dataclass
+class SyntheticCaller:
+    """One caller's script, random source and measurements"""
+
+    index: int
+    account_number: str
+    rng: random.Random
+    utterances: "asyncio.Queue[str]" = field(default_factory=asyncio.Queue)
+    turn_latencies: list[float] = field(default_factory=list)
+    timeouts: int = 0
+    stopped_speaking_at: Optional[float] = None
+    answered: asyncio.Event = field(default_factory=asyncio.Event)
+    replied: asyncio.Event = field(default_factory=asyncio.Event)
+
+    def say(self, text: str) -> None:
+        self.answered.clear()
+        self.replied.clear()
+        self.utterances.put_nowait(text)
+
+    def on_agent_audio(self) -> None:
+        if self.stopped_speaking_at is not None and not self.answered.is_set():
+            self.turn_latencies.append(time.perf_counter() - self.stopped_speaking_at)
+            self.answered.set()
+
+
+# The caller whose session is running. Set in each session's task before the
+# session starts, so every task the session spawns (and the speech streams and
+# LLM calls they make) sees it, while the STT/TTS instances stay shared.
+_CALLER: "contextvars.ContextVar[SyntheticCaller]" = contextvars.ContextVar("caller")
+
+
+# Stand-ins
+
+
+class FakeSTT(stt.STT):
+    """Streaming STT that 'hears' whatever the current caller says next"""
+
+    def __init__(self, latency: Latency, language: str):
+        super().__init__(
+            capabilities=stt.STTCapabilities(streaming=True, interim_results=False)
+        )
+        self.latency = latency
+        self.language = language if language != "unknown" else "en-IN"
+
+    async def _recognize_impl(
+        self, buffer, *, language=None, conn_options=CONN_OPTIONS
+    ) -> stt.SpeechEvent:
+        """One-shot recognition: the caller's next queued utterance, or an empty final transcript"""
+        caller = _CALLER.get()
+        text = caller.utterances.get_nowait() if not caller.utterances.empty() else ""
+        await asyncio.sleep(self.latency.sample(caller.rng))
+        return stt.SpeechEvent(
+            type=stt.SpeechEventType.FINAL_TRANSCRIPT,
+            alternatives=[stt.SpeechData(language=self.language, text=text)],
+        )
+
+    def stream(
+        self, *, language=None, conn_options: APIConnectOptions = CONN_OPTIONS
+    ) -> "FakeRecognizeStream":
+        return FakeRecognizeStream(stt=self, conn_options=conn_options)
+
+
+class FakeRecognizeStream(stt.RecognizeStream):
+    def __init__(self, *, stt: FakeSTT, conn_options: APIConnectOptions):
+        super().__init__(stt=stt, conn_options=conn_options)
+        self._fake = stt
+        self._caller = _CALLER.get()
+
+    async def _drain_audio(self) -> None:
+        async for _ in self._input_ch:
+            pass
+
+    async def _run(self) -> None:
+        drain = asyncio.create_task(self._drain_audio())
+        try:
+            while True:
+                text = await self._caller.utterances.get()
+                self._event_ch.send_nowait(
+                    stt.SpeechEvent(type=stt.SpeechEventType.START_OF_SPEECH)
+                )
+                self._caller.stopped_speaking_at = time.perf_counter()
+                await asyncio.sleep(self._fake.latency.sample(self._caller.rng))
+                self._event_ch.send_nowait(
+                    stt.SpeechEvent(
+                        type=stt.SpeechEventType.FINAL_TRANSCRIPT,
+                        alternatives=[
+                            stt.SpeechData(language=self._fake.language, text=text)
+                        ],
+                    )
+                )
+                self._event_ch.send_nowait(
+                    stt.SpeechEvent(type=stt.SpeechEventType.END_OF_SPEECH)
+                )
+        finally:
+            drain.cancel()
+
+
+class FakeLLM(llm.LLM):
+    """Scripted LLM: calls the tool the script names, then reads back its first row"""
+
+    def __init__(self, ttft: Latency, tokens_per_second: float):
+        super().__init__()
+        self.ttft = ttft
+        self.tokens_per_second = tokens_per_second
+
+    def chat(
+        self,
+        *,
+        chat_ctx: llm.ChatContext,
+        tools=None,
+        conn_options: APIConnectOptions = CONN_OPTIONS,
+        **kwargs,
+    ) -> "FakeLLMStream":
+        return FakeLLMStream(
+            self, chat_ctx=chat_ctx, tools=tools or [], conn_options=conn_options
+        )
+
+
+class FakeLLMStream(llm.LLMStream):
+    async def _run(self) -> None:
+        fake: FakeLLM = self._llm
+        caller = _CALLER.get()
+        items = self._chat_ctx.items
+        prompt_tokens = sum(
+            estimate_tokens(
+                getattr(item, "text_content", None) or getattr(item, "output", "")
+            )
+            for item in items
+        )
+        request_id = uuid.uuid4().hex
+        await asyncio.sleep(fake.ttft.sample(caller.rng))
+
+        last = items[-1]
+        if last.type == "function_call_output":
+            rows = [line for line in last.output.splitlines() if "|" in line]
+            reply = f"Here is what I found: {rows[1] if len(rows) > 1 else last.output[:80]}. Anything else?"
+        else:
+            said = last.text_content or ""
+            tool = next((name for text, name in SCRIPT if name and text == said), None)
+            if tool is not None:
+                self._event_ch.send_nowait(
+                    llm.ChatChunk(
+                        id=request_id,
+                        delta=llm.ChoiceDelta(
+                            role="assistant",
+                            tool_calls=[
+                                llm.FunctionToolCall(
+                                    name=tool,
+                                    arguments=json.dumps(
+                                        {"account_number": caller.account_number}
+                                    ),
+                                    call_id=f"call_{uuid.uuid4().hex[:8]}",
+                                )
+                            ],
+                        ),
+                    )
+                )
+                return
+            reply = "Sure, I can help with that. Could you tell me a little more?"
+
+        words = reply.split()
+        for i, word in enumerate(words):
+            if i:
+                await asyncio.sleep(1 / fake.tokens_per_second)
+            self._event_ch.send_nowait(
+                llm.ChatChunk(
+                    id=request_id,
+                    delta=llm.ChoiceDelta(role="assistant", content=f"{word} "),
+                )
+            )
+        self._event_ch.send_nowait(
+            llm.ChatChunk(
+                id=request_id,
+                usage=llm.CompletionUsage(
+                    completion_tokens=len(words),
+                    prompt_tokens=prompt_tokens,
+                    total_tokens=prompt_tokens + len(words),
+                ),
+            )
+        )
+
+
+class FakeTTS(tts.TTS):
+    """Returns silence as long as the text would take to speak"""
+
+    def __init__(self, ttfb: Latency, ms_per_char: float):
+        super().__init__(
+            capabilities=tts.TTSCapabilities(streaming=False),
+            sample_rate=SAMPLE_RATE,
+            num_channels=1,
+        )
+        self.ttfb = ttfb
+        self.ms_per_char = ms_per_char
+
+    def synthesize(
+        self, text: str, *, conn_options: APIConnectOptions = CONN_OPTIONS
+    ) -> "FakeChunkedStream":
+        return FakeChunkedStream(tts=self, input_text=text, conn_options=conn_options)
+
+
+class FakeChunkedStream(tts.ChunkedStream):
+    async def _run(self, output_emitter) -> None:
+        fake: FakeTTS = self._tts
+        output_emitter.initialize(
+            request_id=uuid.uuid4().hex,
+            sample_rate=SAMPLE_RATE,
+            num_channels=1,
+            mime_type="audio/pcm",
+        )
+        await asyncio.sleep(fake.ttfb.sample(_CALLER.get().rng))
+        samples = int(SAMPLE_RATE * len(self.input_text) * fake.ms_per_char / 1000)
+        output_emitter.push(bytes(samples * 2))
+        output_emitter.flush()
+
+
+class SilenceInput(io.AudioInput):
+    """Microphone stand-in: 20 ms of silence every 20 ms"""
+
+    def __init__(self):
+        super().__init__(label="load-harness")
+        self._frame = rtc.AudioFrame(
+            data=bytes(SAMPLE_RATE * FRAME_MS // 1000 * 2),
+            sample_rate=SAMPLE_RATE,
+            num_channels=1,
+            samples_per_channel=SAMPLE_RATE * FRAME_MS // 1000,
+        )
+
+    async def __anext__(self) -> rtc.AudioFrame:
+        await asyncio.sleep(FRAME_MS / 1000)
+        return self._frame
+
+
+class RealtimeOutput(io.AudioOutput):
+    """Speaker stand-in: takes as long to 'play' a segment as its audio lasts"""
+
+    def __init__(self, caller: SyntheticCaller):
+        super().__init__(
+            label="load-harness",
+            capabilities=io.AudioOutputCapabilities(pause=False),
+            sample_rate=None,
+        )
+        self._caller = caller
+        self._pushed = 0.0
+        self._started: Optional[float] = None
+        self._playout: Optional[asyncio.TimerHandle] = None
+
+    async def capture_frame(self, frame: rtc.AudioFrame) -> None:
+        await super().capture_frame(frame)
+        if self._started is None:
+            self._started = time.monotonic()
+            self._caller.on_agent_audio()
+            if hasattr(self, "on_playback_started"):
+                # livekit-agents >= 1.4 moves the agent to "speaking" on this event
+                self.on_playback_started(created_at=time.time())
+        self._pushed += frame.duration
+
+    def flush(self) -> None:
+        super().flush()
+        if self._started is None:
+            return
+        remaining = max(0.0, self._started + self._pushed - time.monotonic())
+        self._playout = asyncio.get_running_loop().call_later(
+            remaining, self._finish, False
+        )
+
+    def clear_buffer(self) -> None:
+        if self._playout is not None:
+            self._playout.cancel()
+        if self._started is not None:
+            self._finish(True)
+
+    def _finish(self, interrupted: bool) -> None:
+        played = (
+            self._pushed
+            if not interrupted
+            else min(self._pushed, time.monotonic() - self._started)
+        )
+        self._pushed, self._started, self._playout = 0.0, None, None
+        self.on_playback_finished(playback_position=played, interrupted=interrupted)
+
+
+# Harness
+
+
+@dataclass
+class LevelResult:
+    calls: int
+    turns: int
+    timeouts: int
+    seconds: float
+    latencies: list[float]
+    rss_mb_per_call: float
+
+    def percentile(self, p: float) -> float:
+        ordered = sorted(self.latencies)
+        if not ordered:
+            return float("nan")
+        return (
+            ordered[min(len(ordered) - 1, math.ceil(p / 100 * len(ordered)) - 1)] * 1000
+        )
+
+
+def rss_mb() -> float:
+    """Current resident set size (peak RSS where /proc is unavailable)"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 1024 / 1024
+    except OSError:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+async def run_caller(
+    caller: SyntheticCaller, make_agent: Callable[[], Any], args: argparse.Namespace
+) -> None:
+    _CALLER.set(caller)
+    await asyncio.sleep(caller.rng.uniform(0, args.ramp))
+    session = AgentSession(
+        turn_detection="stt", min_endpointing_delay=args.endpointing_ms / 1000
+    )
+    session.input.audio = SilenceInput()
+    session.output.audio = RealtimeOutput(caller)
+
+    @session.on("agent_state_changed")
+    def _on_state(ev) -> None:
+        if ev.new_state == "listening" and caller.answered.is_set():
+            caller.replied.set()
+
+    agent = make_agent()
+    agent.tracer.observe(session)
+    await session.start(agent=agent)
+    try:
+        for turn in range(args.turns):
+            text, _ = SCRIPT[turn % len(SCRIPT)]
+            caller.say(text.format(account=caller.account_number))
+            try:
+                await asyncio.wait_for(caller.replied.wait(), args.turn_timeout)
+            except asyncio.TimeoutError:
+                caller.timeouts += 1
+            await asyncio.sleep(
+                Latency(args.think_ms, args.think_ms * 2).sample(caller.rng)
+            )
+    finally:
+        await session.aclose()
+
+
+async def run_level(
+    calls: int,
+    accounts: list[str],
+    make_agent: Callable[[], Any],
+    args: argparse.Namespace,
+) -> LevelResult:
+    baseline = rss_mb()
+    peak = baseline
+    callers = [
+        SyntheticCaller(i, accounts[i % len(accounts)], random.Random(args.seed + i))
+        for i in range(calls)
+    ]
+    started = time.perf_counter()
+    tasks = [
+        asyncio.create_task(run_caller(caller, make_agent, args)) for caller in callers
+    ]
+    while not all(task.done() for task in tasks):
+        await asyncio.wait(tasks, timeout=0.5)
+        peak = max(peak, rss_mb())
+    seconds = time.perf_counter() - started
+    for task in tasks:
+        if task.exception() is not None:
+            logging.getLogger("load-harness").error(
+                f"Caller failed: {task.exception()!r}"
+            )
+    latencies = [latency for caller in callers for latency in caller.turn_latencies]
+    return LevelResult(
+        calls=calls,
+        turns=len(latencies),
+        timeouts=sum(caller.timeouts for caller in callers),
+        seconds=seconds,
+        latencies=latencies,
+        rss_mb_per_call=(peak - baseline) / calls,
+    )
+
+
+def start_mock_api(users: int) -> "tuple[subprocess.Popen, str]":
+    """Serve mock_banking_api on a free port with `users` synthetic users"""
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        port = s.getsockname()[1]
+    env = {**os.environ, "MOCK_BANK_SYNTHETIC_USERS": str(users)}
+    server = subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            "uvicorn",
+            "mock_banking_api:app",
+            "--port",
+            str(port),
+            "--log-level",
+            "warning",
+        ],
+        cwd=os.path.join(os.path.dirname(__file__), ".."),
+        env=env,
+    )
+    url = f"http://127.0.0.1:{port}"
+    for _ in range(100):
+        try:
+            httpx.get(url, timeout=0.5)
+            return server, url
+        except httpx.TransportError:
+            time.sleep(0.1)
+    server.terminate()
+    raise RuntimeError("Mock banking API did not start")
+
+
+async def main(args: argparse.Namespace, api_url: str) -> None:
+    os.environ["BANKING_API_URL"] = api_url
+    # Imported here because agent reads BANKING_API_URL at import
+    import agent
+
+    # Per-turn agent logs would swamp the report
+    logging.getLogger("voice-agent").setLevel(logging.WARNING)
+    logging.getLogger("livekit.agents").setLevel(logging.ERROR)
+
+    levels = [int(n) for n in args.concurrency.split(",")]
+    accounts = [
+        user["accounts"][0]["account_number"] for _, user in generate_users(max(levels))
+    ]
+    speech = SpeechModelPool(
+        stt_factory=lambda language: FakeSTT(Latency.parse(args.stt_ms), language),
+        tts_factory=lambda language: FakeTTS(
+            Latency.parse(args.tts_ms), args.audio_ms_per_char
+        ),
+    )
+    fake_llm = FakeLLM(Latency.parse(args.llm_ttft_ms), args.llm_tokens_per_second)
+    tts_cache = TTSAudioCache()
+
+    def make_agent() -> Any:
+        return agent.VoiceAgent(
+            agent.banking_pool.session(), speech, None, tts_cache, llm_model=fake_llm
+        )
+
+    print(
+        f"{'calls':>6} {'turns':>6} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'turns/s':>8} {'timeouts':>9} {'RSS MB/call':>12}"
+    )
+    for calls in levels:
+        result = await run_level(calls, accounts, make_agent, args)
+        print(
+            f"{result.calls:>6} {result.turns:>6} {result.percentile(50):>8.0f} {result.percentile(95):>8.0f} "
+            f"{result.percentile(99):>8.0f} {result.turns / result.seconds:>8.2f} {result.timeouts:>9} "
+            f"{result.rss_mb_per_call:>12.2f}"
+        )
+    await speech.aclose()
+    await agent.banking_pool.aclose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[1])
+    parser.add_argument(
+        "--concurrency",
+        default="1,10,50",
+        help="comma-separated numbers of simultaneous calls",
+    )
+    parser.add_argument("--turns", type=int, default=5, help="caller turns per call")
+    parser.add_argument(
+        "--stt-ms", default="150:300", help="STT finalization latency, median:p95"
+    )
+    parser.add_argument(
+        "--llm-ttft-ms", default="350:900", help="LLM time to first token, median:p95"
+    )
+    parser.add_argument("--llm-tokens-per-second", type=float, default=150.0)
+    parser.add_argument(
+        "--tts-ms", default="200:450", help="TTS time to first byte, median:p95"
+    )
+    parser.add_argument(
+        "--audio-ms-per-char",
+        type=float,
+        default=60.0,
+        help="length of synthesized speech",
+    )
+    parser.add_argument(
+        "--endpointing-ms",
+        type=float,
+        default=500.0,
+        help="min_endpointing_delay of the sessions",
+    )
+    parser.add_argument(
+        "--think-ms",
+        type=float,
+        default=1000.0,
+        help="median pause before the caller's next turn",
+    )
+    parser.add_argument(
+        "--ramp", type=float, default=2.0, help="seconds over which calls start"
+    )
+    parser.add_argument("--turn-timeout", type=float, default=30.0)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument(
+        "--api-url", help="use a running mock banking API instead of starting one"
+    )
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    server = None
+    api_url = args.api_url
+    if api_url is None:
+        server, api_url = start_mock_api(
+            max(int(n) for n in args.concurrency.split(","))
+        )
+    try:
+        asyncio.run(main(args, api_url))
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
@@ -0,0 +1,63 @@
+"""
+Transfer Contention Benchmark
+Measures ledger write throughput as concurrent transfers concentrate on fewer accounts
+
+Run with: python benchmarks/transfer_contention.py --threads 16 --transfers 20000
+"""
+
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from mock_banking_seed import generate_users
+from mock_banking_store import InMemoryBankingStore
+
+
+def run(threads: int, transfers: int, hot_accounts: int) -> dict:
+    """Fire `transfers` transfers from `hot_accounts` source accounts on `threads` threads"""
+    store = InMemoryBankingStore()
+    users = list(
+        generate_users(
+            max(hot_accounts, 1), accounts_per_user=(1, 1), transactions_per_user=0
+        )
+    )
+    for _, user in users:
+        user["accounts"][0]["balance"] = 1e12
+    store.load(users)
+    sources = [
+        (user["accounts"][0]["account_number"], user["contacts"][0]["name"])
+        for _, user in users
+    ]
+
+    def transfer(i: int) -> None:
+        account, contact = sources[i % len(sources)]
+        store.transfer(account, contact, 1.0, idempotency_key=f"bench-{i}")
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        list(pool.map(transfer, range(transfers)))
+    elapsed = time.perf_counter() - started
+
+    stats = store.ledger_stats()
+    assert stats["ledger_entries"] == transfers
+    return {"tps": transfers / elapsed, **stats}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[1])
+    parser.add_argument("--threads", type=int, default=16)
+    parser.add_argument("--transfers", type=int, default=20_000)
+    args = parser.parse_args()
+
+    print(
+        f"{'hot accounts':>12} {'transfers/s':>12} {'contended':>10} {'lock wait ms':>13}"
+    )
+    for hot in (1, 4, 16, 256):
+        result = run(args.threads, args.transfers, hot)
+        print(
+            f"{hot:>12} {result['tps']:>12.0f} {result['contention_ratio']:>10.2%} {result['lock_wait_ms']:>13.1f}"
+        )
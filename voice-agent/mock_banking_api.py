@@ -2,393 +2,60 @@
 Mock Banking API Server
 Provides REST API endpoints for banking operations
 Run with: uvicorn mock_banking_api:app --reload --port 8000
+Serve for load tests with: python mock_banking_api.py --workers 4 --no-access-log
 """
 
-from fastapi import FastAPI, HTTPException
+import argparse
+import os
+from datetime import datetime
+from typing import Any, Optional
+
+from fastapi import FastAPI, Header, HTTPException, Query
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, Response
 from pydantic import BaseModel
-from typing import List, Optional
-from datetime import datetime
 
-app = FastAPI(title="VaaniPay Mock Banking API")
+from mock_banking_seed import USERS
+from mock_banking_store import BankingStore, InMemoryBankingStore, LedgerError
+
+# orjson (the mock-api extra: uv sync --extra mock-api) encodes responses several
+# times faster than the standard library; without it the standard encoder is used.
+try:
+    import orjson
+
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+
+class FastJSONResponse(JSONResponse):
+    """JSON response encoded with orjson when it is installed"""
 
-# Enable CORS for local development
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+    def render(self, content: Any) -> bytes:
+        if ORJSON_AVAILABLE:
+            return orjson.dumps(content)
+        return super().render(content)
+
+
+app = FastAPI(
+    title="VaaniPay Mock Banking API", default_response_class=FastJSONResponse
 )
 
-# Mock Database
-USERS = {
-    "rahul_sharma": {
-        "user_id": "USER001",
-        "name": "Rahul Sharma",
-        "phone": "9876543210",
-        "accounts": [
-            {
-                "account_number": "4421",
-                "account_type": "Primary Savings",
-                "balance": 27940.0,
-                "currency": "INR"
-            },
-            {
-                "account_number": "9920",
-                "account_type": "Salary Account",
-                "balance": 3210.0,
-                "currency": "INR"
-            },
-            {
-                "account_number": "1187",
-                "account_type": "Fixed Deposit",
-                "balance": 112785.0,
-                "currency": "INR"
-            }
-        ],
-        "contacts": [
-            {
-                "name": "Anjali Verma",
-                "phone": "9876543210",
-                "account": "ACC_ANJALI"
-            },
-            {
-                "name": "Ramesh Kumar",
-                "phone": "9123456789",
-                "account": "ACC_RAMESH"
-            },
-            {
-                "name": "Father",
-                "phone": "9988776655",
-                "account": "ACC_FATHER"
-            }
-        ],
-        "bills": [
-            {
-                "biller": "BESCOM",
-                "amount": 720.0,
-                "due_date": "2025-11-30",
-                "status": "pending"
-            },
-            {
-                "biller": "Water",
-                "amount": 350.0,
-                "due_date": "2025-11-28",
-                "status": "pending"
-            },
-            {
-                "biller": "Gas",
-                "amount": 845.0,
-                "due_date": "2025-12-05",
-                "status": "pending"
-            }
-        ],
-        "transactions": [
-            {
-                "id": "TXN001",
-                "amount": -750.0,
-                "type": "transfer",
-                "description": "to Anjali Verma",
-                "timestamp": "2025-11-22T17:30:00",
-                "category": "transfer"
-            },
-            {
-                "id": "TXN002",
-                "amount": -1200.0,
-                "type": "bill_payment",
-                "description": "BESCOM bill payment",
-                "timestamp": "2025-11-21T14:15:00",
-                "category": "utilities"
-            },
-            {
-                "id": "TXN003",
-                "amount": 5000.0,
-                "type": "credit",
-                "description": "Salary credit",
-                "timestamp": "2025-11-20T09:00:00",
-                "category": "income"
-            },
-            {
-                "id": "TXN004",
-                "amount": -399.0,
-                "type": "payment",
-                "description": "Airtel mobile recharge",
-                "timestamp": "2025-11-19T18:45:00",
-                "category": "mobile"
-            },
-            {
-                "id": "TXN005",
-                "amount": -2200.0,
-                "type": "transfer",
-                "description": "transfer to Father",
-                "timestamp": "2025-11-18T11:30:00",
-                "category": "transfer"
-            },
-            {
-                "id": "TXN006",
-                "amount": -850.0,
-                "type": "payment",
-                "description": "grocery shopping at BigBazaar",
-                "timestamp": "2025-11-17T16:20:00",
-                "category": "groceries"
-            },
-            {
-                "id": "TXN007",
-                "amount": 500.0,
-                "type": "credit",
-                "description": "Amazon refund",
-                "timestamp": "2025-11-16T13:10:00",
-                "category": "refund"
-            },
-            {
-                "id": "TXN008",
-                "amount": -450.0,
-                "type": "payment",
-                "description": "restaurant payment",
-                "timestamp": "2025-11-15T20:30:00",
-                "category": "dining"
-            },
-            {
-                "id": "TXN009",
-                "amount": -1100.0,
-                "type": "bill_payment",
-                "description": "utility bills",
-                "timestamp": "2025-11-14T10:00:00",
-                "category": "utilities"
-            },
-            {
-                "id": "TXN010",
-                "amount": -300.0,
-                "type": "payment",
-                "description": "movie tickets booking",
-                "timestamp": "2025-11-13T19:15:00",
-                "category": "entertainment"
-            }
-        ],
-        "credit_limit": 250000.0,
-        "credit_utilized": 0.0
-    },
-    "priya_patel": {
-        "user_id": "USER002",
-        "name": "Priya Patel",
-        "phone": "9845612378",
-        "accounts": [
-            {
-                "account_number": "5532",
-                "account_type": "Savings Account",
-                "balance": 45600.0,
-                "currency": "INR"
-            },
-            {
-                "account_number": "7789",
-                "account_type": "Current Account",
-                "balance": 15240.0,
-                "currency": "INR"
-            }
-        ],
-        "contacts": [
-            {
-                "name": "Amit Shah",
-                "phone": "9876501234",
-                "account": "ACC_AMIT"
-            },
-            {
-                "name": "Mother",
-                "phone": "9823456789",
-                "account": "ACC_MOTHER"
-            }
-        ],
-        "bills": [
-            {
-                "biller": "Airtel",
-                "amount": 599.0,
-                "due_date": "2025-11-25",
-                "status": "pending"
-            },
-            {
-                "biller": "Internet",
-                "amount": 899.0,
-                "due_date": "2025-11-28",
-                "status": "pending"
-            }
-        ],
-        "transactions": [
-            {
-                "id": "TXN201",
-                "amount": -599.0,
-                "type": "payment",
-                "description": "Airtel postpaid",
-                "timestamp": "2025-11-21T10:30:00",
-                "category": "mobile"
-            },
-            {
-                "id": "TXN202",
-                "amount": 8000.0,
-                "type": "credit",
-                "description": "Freelance payment",
-                "timestamp": "2025-11-20T15:45:00",
-                "category": "income"
-            },
-            {
-                "id": "TXN203",
-                "amount": -1200.0,
-                "type": "transfer",
-                "description": "to Mother",
-                "timestamp": "2025-11-19T12:00:00",
-                "category": "transfer"
-            }
-        ],
-        "credit_limit": 150000.0,
-        "credit_utilized": 0.0
-    },
-    "arjun_reddy": {
-        "user_id": "USER003",
-        "name": "Arjun Reddy",
-        "phone": "9912345678",
-        "accounts": [
-            {
-                "account_number": "3366",
-                "account_type": "Premium Savings",
-                "balance": 185000.0,
-                "currency": "INR"
-            },
-            {
-                "account_number": "8844",
-                "account_type": "Investment Account",
-                "balance": 550000.0,
-                "currency": "INR"
-            }
-        ],
-        "contacts": [
-            {
-                "name": "Sneha Rao",
-                "phone": "9876012345",
-                "account": "ACC_SNEHA"
-            },
-            {
-                "name": "Brother",
-                "phone": "9845678901",
-                "account": "ACC_BROTHER"
-            },
-            {
-                "name": "Business Partner",
-                "phone": "9823344556",
-                "account": "ACC_PARTNER"
-            }
-        ],
-        "bills": [
-            {
-                "biller": "Credit Card",
-                "amount": 12500.0,
-                "due_date": "2025-11-30",
-                "status": "pending"
-            },
-            {
-                "biller": "Electricity",
-                "amount": 2350.0,
-                "due_date": "2025-12-02",
-                "status": "pending"
-            }
-        ],
-        "transactions": [
-            {
-                "id": "TXN301",
-                "amount": -12500.0,
-                "type": "payment",
-                "description": "Credit card payment",
-                "timestamp": "2025-11-22T09:15:00",
-                "category": "payment"
-            },
-            {
-                "id": "TXN302",
-                "amount": 50000.0,
-                "type": "credit",
-                "description": "Business income",
-                "timestamp": "2025-11-20T11:30:00",
-                "category": "income"
-            },
-            {
-                "id": "TXN303",
-                "amount": -25000.0,
-                "type": "transfer",
-                "description": "to Business Partner",
-                "timestamp": "2025-11-18T14:20:00",
-                "category": "business"
-            }
-        ],
-        "credit_limit": 500000.0,
-        "credit_utilized": 0.0
-    },
-    "ananya_krishnan": {
-        "user_id": "USER004",
-        "name": "Ananya Krishnan",
-        "phone": "9745678901",
-        "accounts": [
-            {
-                "account_number": "2211",
-                "account_type": "Student Account",
-                "balance": 8500.0,
-                "currency": "INR"
-            }
-        ],
-        "contacts": [
-            {
-                "name": "Roommate",
-                "phone": "9876543210",
-                "account": "ACC_ROOMMATE"
-            },
-            {
-                "name": "Dad",
-                "phone": "9823456780",
-                "account": "ACC_DAD"
-            }
-        ],
-        "bills": [
-            {
-                "biller": "Netflix",
-                "amount": 199.0,
-                "due_date": "2025-11-26",
-                "status": "pending"
-            },
-            {
-                "biller": "Spotify",
-                "amount": 119.0,
-                "due_date": "2025-11-28",
-                "status": "pending"
-            }
-        ],
-        "transactions": [
-            {
-                "id": "TXN401",
-                "amount": 5000.0,
-                "type": "credit",
-                "description": "Scholarship",
-                "timestamp": "2025-11-20T10:00:00",
-                "category": "income"
-            },
-            {
-                "id": "TXN402",
-                "amount": -650.0,
-                "type": "payment",
-                "description": "Books purchase",
-                "timestamp": "2025-11-19T16:30:00",
-                "category": "education"
-            },
-            {
-                "id": "TXN403",
-                "amount": -1200.0,
-                "type": "transfer",
-                "description": "to Roommate - rent split",
-                "timestamp": "2025-11-18T20:00:00",
-                "category": "transfer"
-            }
-        ],
-        "credit_limit": 50000.0,
-        "credit_utilized": 0.0
-    }
-}
+# CORS for the local frontend. Comma-separated origins; set it empty (as
+# `--no-cors` does) to skip the middleware on every request in load tests.
+CORS_ORIGINS = [
+    o.strip() for o in os.getenv("MOCK_BANK_CORS_ORIGINS", "*").split(",") if o.strip()
+]
+if CORS_ORIGINS:
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=CORS_ORIGINS,
+        allow_credentials=True,
+        allow_methods=["*"],
+        allow_headers=["*"],
+    )
 
+# Reference data (the demo users live in mock_banking_seed)
 LOAN_PRODUCTS = [
     {
         "type": "Personal Loan",
@@ -396,7 +63,7 @@ LOAN_PRODUCTS = [
         "max_amount": 500000,
         "min_tenure": 1,
         "max_tenure": 5,
-        "unit": "years"
+        "unit": "years",
     },
     {
         "type": "Home Loan",
@@ -404,7 +71,7 @@ LOAN_PRODUCTS = [
         "max_amount": 5000000,
         "min_tenure": 1,
         "max_tenure": 20,
-        "unit": "years"
+        "unit": "years",
     },
     {
         "type": "Car Loan",
@@ -412,7 +79,7 @@ LOAN_PRODUCTS = [
         "max_amount": 1500000,
         "min_tenure": 1,
         "max_tenure": 7,
-        "unit": "years"
+        "unit": "years",
     },
     {
         "type": "Education Loan",
@@ -420,17 +87,66 @@ LOAN_PRODUCTS = [
         "max_amount": 2000000,
         "min_tenure": 1,
         "max_tenure": 10,
-        "unit": "years"
-    }
+        "unit": "years",
+    },
 ]
 
 INTEREST_RATES = {
     "savings_account": 3.5,
     "fd_1_year": 6.8,
     "fd_3_years": 7.2,
-    "recurring_deposit": 6.5
+    "recurring_deposit": 6.5,
 }
 
+
+def static_json(content: Any) -> Response:
+    """Response serialized once at startup, for endpoints whose data never changes"""
+    return Response(
+        content=FastJSONResponse(content).body, media_type="application/json"
+    )
+
+
+ROOT_RESPONSE = static_json(
+    {
+        "service": "VaaniPay Mock Banking API",
+        "version": "1.0.0",
+        "status": "operational",
+    }
+)
+LOANS_RESPONSE = static_json({"loan_products": LOAN_PRODUCTS})
+INTEREST_RATES_RESPONSE = static_json({"interest_rates": INTEREST_RATES})
+
+# MOCK_BANK_DB=path serves a SQLite database shared by every worker and kept
+# across restarts (seeded with the demo users when empty; add synthetic users
+# with mock_banking_sqlite.py seed).
+MOCK_BANK_DB = os.getenv("MOCK_BANK_DB")
+
+store: BankingStore
+if MOCK_BANK_DB:
+    from mock_banking_sqlite import SQLiteBankingStore
+
+    store = SQLiteBankingStore(MOCK_BANK_DB)
+    store.seed_if_empty(USERS.items())
+else:
+    # Indexed store built from the demo users. Set MOCK_BANK_SYNTHETIC_USERS to add
+    # generated users on top for load testing (see mock_banking_seed.py).
+    store = InMemoryBankingStore.from_users(USERS)
+    # Not when run as a script: that process only starts uvicorn, which imports
+    # this module again (once per worker) and loads the users there
+    if int(os.getenv("MOCK_BANK_SYNTHETIC_USERS", "0")) > 0 and __name__ != "__main__":
+        from mock_banking_seed import generate_users
+
+        store.load(generate_users(int(os.environ["MOCK_BANK_SYNTHETIC_USERS"])))
+
+
+def require_user(user_id: str) -> dict:
+    """Return the user record or raise 404"""
+    user = store.get_user(user_id)
+    if user is None:
+        raise HTTPException(status_code=404, detail="User not found")
+    return user
+
+
 # Pydantic Models
 class Account(BaseModel):
     account_number: str
@@ -438,6 +154,7 @@ class Account(BaseModel):
     balance: float
     currency: str = "INR"
 
+
 class Transaction(BaseModel):
     id: str
     amount: float
@@ -446,176 +163,338 @@ class Transaction(BaseModel):
     timestamp: str
     category: str
 
+
 class TransferRequest(BaseModel):
     from_account: str
     to_contact: str
     amount: float
     pin: str
 
+
 class BillPaymentRequest(BaseModel):
     account: str
     biller: str
     amount: float
     pin: str
 
+
 # API Endpoints
+# Handlers that touch the store are plain `def`: FastAPI runs them in its
+# threadpool, so a SQLite write waiting on busy_timeout never stalls the event
+# loop. Only the pre-serialized static responses are `async def`.
+
 
 @app.get("/")
-def root():
-    return {
-        "service": "VaaniPay Mock Banking API",
-        "version": "1.0.0",
-        "status": "operational"
-    }
+async def root():
+    return ROOT_RESPONSE
+
 
 @app.get("/api/users/{user_id}/accounts")
 def get_accounts(user_id: str = "rahul_sharma"):
     """Get all accounts for a user"""
-    if user_id not in USERS:
-        raise HTTPException(status_code=404, detail="User not found")
-    return {"accounts": USERS[user_id]["accounts"]}
+    return {"accounts": require_user(user_id)["accounts"]}
+
 
 @app.get("/api/accounts/{account_number}/user")
 def get_user_by_account(account_number: str):
     """Find user_id by account number"""
-    for user_id, user_data in USERS.items():
-        for account in user_data["accounts"]:
-            if account["account_number"] == account_number:
-                return {
-                    "user_id": user_id,
-                    "name": user_data["name"],
-                    "account_number": account_number,
-                    "account_type": account["account_type"]
-                }
-    raise HTTPException(status_code=404, detail="Account not found")
+    found = store.find_account(account_number)
+    if found is None:
+        raise HTTPException(status_code=404, detail="Account not found")
+    user_id, account = found
+    return {
+        "user_id": user_id,
+        "name": store.get_user(user_id)["name"],
+        "account_number": account_number,
+        "account_type": account["account_type"],
+    }
+
 
 @app.get("/api/accounts/{account_number}/balance")
-def get_balance(account_number: str, user_id: str = None):
+def get_balance(account_number: str, user_id: Optional[str] = None):
     """Get balance for a specific account"""
-    # If user_id not provided, find it by account number
-    if user_id is None:
-        for uid, user_data in USERS.items():
-            for account in user_data["accounts"]:
-                if account["account_number"] == account_number:
-                    user_id = uid
-                    break
-            if user_id:
-                break
-        if user_id is None:
-            raise HTTPException(status_code=404, detail="Account not found")
-    
-    if user_id not in USERS:
+    found = store.find_account(account_number)
+    if user_id is not None and user_id not in store:
         raise HTTPException(status_code=404, detail="User not found")
-    
-    for account in USERS[user_id]["accounts"]:
-        if account["account_number"] == account_number:
-            return {
-                "account_number": account_number,
-                "balance": account["balance"],
-                "currency": account["currency"],
-                "account_type": account["account_type"]
-            }
-    
-    raise HTTPException(status_code=404, detail="Account not found")
+    # If user_id is provided, the account must belong to that user
+    if found is None or (user_id is not None and found[0] != user_id):
+        raise HTTPException(status_code=404, detail="Account not found")
+
+    account = found[1]
+    return {
+        "account_number": account_number,
+        "balance": account["balance"],
+        "currency": account["currency"],
+        "account_type": account["account_type"],
+    }
+
+
+def parse_date_bound(name: str, value: Optional[str]) -> Optional[str]:
+    """Validate an ISO date/datetime query bound, or raise 400"""
+    if value is None:
+        return None
+    try:
+        datetime.fromisoformat(value)
+    except ValueError:
+        raise HTTPException(
+            status_code=400, detail=f"{name} must be an ISO date, e.g. 2025-11-01"
+        ) from None
+    return value
+
 
 @app.get("/api/users/{user_id}/transactions")
-def get_transactions(user_id: str = "rahul_sharma", limit: int = 10):
-    """Get recent transactions"""
-    if user_id not in USERS:
-        raise HTTPException(status_code=404, detail="User not found")
-    
-    transactions = USERS[user_id]["transactions"][:limit]
-    return {"transactions": transactions, "count": len(transactions)}
+def get_transactions(
+    user_id: str = "rahul_sharma",
+    limit: int = Query(10, ge=1, le=100),
+    start: Optional[str] = None,
+    end: Optional[str] = None,
+    category: Optional[str] = None,
+    cursor: Optional[str] = None,
+):
+    """
+    Get transactions, newest first. Optional filters: start <= timestamp < end
+    (ISO dates) and category. Pass next_cursor back as cursor for the next page.
+    """
+    require_user(user_id)
+    try:
+        transactions, next_cursor = store.transactions_page(
+            user_id,
+            limit=limit,
+            start=parse_date_bound("start", start),
+            end=parse_date_bound("end", end),
+            category=category,
+            cursor=cursor,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e)) from e
+    return {
+        "transactions": transactions,
+        "count": len(transactions),
+        "next_cursor": next_cursor,
+    }
+
+
+@app.get("/api/users/{user_id}/spending")
+def get_spending(
+    user_id: str = "rahul_sharma",
+    group_by: str = "category",
+    start_month: Optional[str] = Query(None, pattern=r"^\d{4}-\d{2}$"),
+    end_month: Optional[str] = Query(None, pattern=r"^\d{4}-\d{2}$"),
+):
+    """
+    Spent and received totals grouped by category, month or counterparty for the
+    months start_month..end_month (YYYY-MM, inclusive), from precomputed rollups
+    """
+    require_user(user_id)
+    return spending_summary(user_id, group_by, start_month, end_month)
+
+
+def spending_summary(
+    user_id: str, group_by: str, start_month: Optional[str], end_month: Optional[str]
+) -> dict:
+    """Spending response body for an existing user; 400 on an unknown group_by"""
+    try:
+        groups = store.spending_summary(user_id, group_by, start_month, end_month)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e)) from e
+    return {
+        "group_by": group_by,
+        "start_month": start_month,
+        "end_month": end_month,
+        "groups": groups,
+        "total_spent": round(sum(g["spent"] for g in groups), 2),
+        "total_received": round(sum(g["received"] for g in groups), 2),
+    }
+
 
 @app.get("/api/users/{user_id}/bills")
 def get_bills(user_id: str = "rahul_sharma"):
     """Get pending bills"""
-    if user_id not in USERS:
-        raise HTTPException(status_code=404, detail="User not found")
-    
-    return {"bills": USERS[user_id]["bills"]}
+    return {"bills": require_user(user_id)["bills"]}
+
 
 @app.get("/api/users/{user_id}/contacts")
 def get_contacts(user_id: str = "rahul_sharma"):
     """Get saved contacts"""
-    if user_id not in USERS:
-        raise HTTPException(status_code=404, detail="User not found")
-    
-    return {"contacts": USERS[user_id]["contacts"]}
+    return {"contacts": require_user(user_id)["contacts"]}
+
 
 @app.get("/api/loans")
-def get_loan_products():
+async def get_loan_products():
     """Get available loan products"""
-    return {"loan_products": LOAN_PRODUCTS}
+    return LOANS_RESPONSE
 
-@app.get("/api/users/{user_id}/credit-limit")
-def get_credit_limit(user_id: str = "rahul_sharma"):
-    """Get credit limit information"""
-    if user_id not in USERS:
-        raise HTTPException(status_code=404, detail="User not found")
-    
-    user = USERS[user_id]
+
+def credit_summary(user: dict) -> dict:
     return {
         "credit_limit": user["credit_limit"],
         "credit_utilized": user["credit_utilized"],
-        "credit_available": user["credit_limit"] - user["credit_utilized"]
+        "credit_available": user["credit_limit"] - user["credit_utilized"],
     }
 
+
+@app.get("/api/users/{user_id}/credit-limit")
+def get_credit_limit(user_id: str = "rahul_sharma"):
+    """Get credit limit information"""
+    return credit_summary(require_user(user_id))
+
+
 @app.get("/api/interest-rates")
-def get_interest_rates():
+async def get_interest_rates():
     """Get current interest rates"""
-    return {"interest_rates": INTEREST_RATES}
+    return INTEREST_RATES_RESPONSE
+
 
 @app.post("/api/transfer")
-def transfer_money(request: TransferRequest):
-    """Execute money transfer (mock)"""
+def transfer_money(
+    request: TransferRequest, idempotency_key: Optional[str] = Header(None)
+):
+    """Execute money transfer: debits the account and appends to the ledger"""
     # Mock PIN validation
     if request.pin != "1234":
-        raise HTTPException(status_code=401, detail="Invalid PIN")
-    
-    return {
-        "status": "success",
-        "transaction_id": f"TXN{datetime.now().strftime('%Y%m%d%H%M%S')}",
-        "message": f"Successfully transferred ₹{request.amount} to {request.to_contact}",
-        "from_account": request.from_account,
-        "amount": request.amount,
-        "timestamp": datetime.now().isoformat()
-    }
+        raise HTTPException(
+            status_code=401,
+            detail="Invalid PIN",
+            headers={"X-Error-Code": "invalid_pin"},
+        )
+
+    try:
+        return store.transfer(
+            request.from_account, request.to_contact, request.amount, idempotency_key
+        )
+    except LedgerError as e:
+        raise HTTPException(
+            status_code=e.status_code, detail=e.detail, headers={"X-Error-Code": e.code}
+        ) from e
+
 
 @app.post("/api/pay-bill")
-def pay_bill(request: BillPaymentRequest):
-    """Pay bill (mock)"""
+def pay_bill(
+    request: BillPaymentRequest, idempotency_key: Optional[str] = Header(None)
+):
+    """Pay bill: debits the account, marks the bill paid and appends to the ledger"""
     # Mock PIN validation
     if request.pin != "1234":
-        raise HTTPException(status_code=401, detail="Invalid PIN")
-    
-    return {
-        "status": "success",
-        "transaction_id": f"BILL{datetime.now().strftime('%Y%m%d%H%M%S')}",
-        "message": f"Successfully paid ₹{request.amount} to {request.biller}",
-        "biller": request.biller,
-        "amount": request.amount,
-        "timestamp": datetime.now().isoformat()
-    }
+        raise HTTPException(
+            status_code=401,
+            detail="Invalid PIN",
+            headers={"X-Error-Code": "invalid_pin"},
+        )
+
+    try:
+        return store.pay_bill(
+            request.account, request.biller, request.amount, idempotency_key
+        )
+    except LedgerError as e:
+        raise HTTPException(
+            status_code=e.status_code, detail=e.detail, headers={"X-Error-Code": e.code}
+        ) from e
+
+
+# Resources /api/batch can return, each built by the matching single-resource endpoint
+BATCH_RESOURCES = {
+    "accounts": lambda user_id: store.get_user(user_id)["accounts"],
+    "transactions": lambda user_id: store.transactions_page(user_id, limit=10)[0],
+    "bills": lambda user_id: store.get_user(user_id)["bills"],
+    "contacts": lambda user_id: store.get_user(user_id)["contacts"],
+    "credit_limit": lambda user_id: credit_summary(store.get_user(user_id)),
+    "spending": lambda user_id: spending_summary(user_id, "category", None, None),
+}
+
+
+@app.get("/api/batch")
+def get_batch(
+    fields: str = "accounts,bills",
+    user_id: Optional[str] = None,
+    account_number: Optional[str] = None,
+):
+    """
+    Several resources for one user in a single response. Identify the user by
+    user_id or by any of their account numbers (then "user" is included too).
+    fields is a comma-separated subset of BATCH_RESOURCES; balances are part of
+    accounts.
+    """
+    requested = [f.strip() for f in fields.split(",") if f.strip()]
+    unknown = [f for f in requested if f not in BATCH_RESOURCES]
+    if unknown:
+        raise HTTPException(
+            status_code=400, detail=f"Unknown fields: {', '.join(unknown)}"
+        )
+
+    result = {}
+    if account_number is not None:
+        result["user"] = get_user_by_account(account_number)
+        if user_id is not None and user_id != result["user"]["user_id"]:
+            raise HTTPException(status_code=404, detail="Account not found")
+        user_id = result["user"]["user_id"]
+    if user_id is None:
+        raise HTTPException(
+            status_code=400, detail="user_id or account_number is required"
+        )
+    require_user(user_id)
+
+    result["user_id"] = user_id
+    for field in requested:
+        result[field] = BATCH_RESOURCES[field](user_id)
+    return result
+
+
+@app.get("/api/ledger/stats")
+def get_ledger_stats():
+    """Ledger size and lock contention counters"""
+    return store.ledger_stats()
+
 
 @app.get("/api/users/{user_id}/loan-eligibility")
-def check_loan_eligibility(user_id: str = "rahul_sharma", loan_type: str = "Personal Loan"):
+def check_loan_eligibility(
+    user_id: str = "rahul_sharma", loan_type: str = "Personal Loan"
+):
     """Check loan eligibility"""
-    if user_id not in USERS:
-        raise HTTPException(status_code=404, detail="User not found")
-    
+    require_user(user_id)
+
     # Mock eligibility logic
     return {
         "eligible": True,
         "loan_type": loan_type,
         "max_eligible_amount": 300000,
         "pre_approved": True,
-        "message": f"You are pre-approved for {loan_type} up to ₹3,00,000"
+        "message": f"You are pre-approved for {loan_type} up to ₹3,00,000",
     }
 
+
 if __name__ == "__main__":
     import uvicorn
-    print("Starting VaaniPay Mock Banking API on http://localhost:8000")
-    print("API Documentation: http://localhost:8000/docs")
-    uvicorn.run(app, host="0.0.0.0", port=8000)
 
+    parser = argparse.ArgumentParser(description="VaaniPay Mock Banking API")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="worker processes; each holds its own copy of the in-memory store unless MOCK_BANK_DB is set",
+    )
+    parser.add_argument(
+        "--no-access-log", action="store_true", help="skip per-request logging"
+    )
+    parser.add_argument(
+        "--no-cors", action="store_true", help="skip the CORS middleware"
+    )
+    args = parser.parse_args()
+
+    if args.no_cors:
+        # Workers re-import this module, so the setting travels through the environment
+        os.environ["MOCK_BANK_CORS_ORIGINS"] = ""
+    print(
+        f"Starting VaaniPay Mock Banking API on http://localhost:{args.port} ({args.workers} worker(s))"
+    )
+    print(f"API Documentation: http://localhost:{args.port}/docs")
+    # An import string, so every worker builds its own app and store
+    uvicorn.run(
+        "mock_banking_api:app",
+        host=args.host,
+        port=args.port,
+        workers=args.workers,
+        access_log=not args.no_access_log,
+        app_dir=os.path.dirname(os.path.abspath(__file__)),
+    )
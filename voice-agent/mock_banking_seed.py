@@ -0,0 +1,547 @@
+"""
+Mock Banking Seed Data
+The demo USERS served by the mock API, and deterministic synthetic users in
+the same layout for load testing
+
+Usage:
+    python mock_banking_seed.py --users 1000000
+    MOCK_BANK_SYNTHETIC_USERS=1000000 python mock_banking_api.py
+"""
+
+import argparse
+import random
+import time
+from collections.abc import Iterator
+from datetime import datetime, timedelta
+
+# Demo users, served by mock_banking_api and seeded into empty SQLite databases
+USERS = {
+    "rahul_sharma": {
+        "user_id": "USER001",
+        "name": "Rahul Sharma",
+        "phone": "9876543210",
+        "accounts": [
+            {
+                "account_number": "4421",
+                "account_type": "Primary Savings",
+                "balance": 27940.0,
+                "currency": "INR",
+            },
+            {
+                "account_number": "9920",
+                "account_type": "Salary Account",
+                "balance": 3210.0,
+                "currency": "INR",
+            },
+            {
+                "account_number": "1187",
+                "account_type": "Fixed Deposit",
+                "balance": 112785.0,
+                "currency": "INR",
+            },
+        ],
+        "contacts": [
+            {"name": "Anjali Verma", "phone": "9876543210", "account": "ACC_ANJALI"},
+            {"name": "Ramesh Kumar", "phone": "9123456789", "account": "ACC_RAMESH"},
+            {"name": "Father", "phone": "9988776655", "account": "ACC_FATHER"},
+        ],
+        "bills": [
+            {
+                "biller": "BESCOM",
+                "amount": 720.0,
+                "due_date": "2025-11-30",
+                "status": "pending",
+            },
+            {
+                "biller": "Water",
+                "amount": 350.0,
+                "due_date": "2025-11-28",
+                "status": "pending",
+            },
+            {
+                "biller": "Gas",
+                "amount": 845.0,
+                "due_date": "2025-12-05",
+                "status": "pending",
+            },
+        ],
+        "transactions": [
+            {
+                "id": "TXN001",
+                "amount": -750.0,
+                "type": "transfer",
+                "description": "to Anjali Verma",
+                "timestamp": "2025-11-22T17:30:00",
+                "category": "transfer",
+            },
+            {
+                "id": "TXN002",
+                "amount": -1200.0,
+                "type": "bill_payment",
+                "description": "BESCOM bill payment",
+                "timestamp": "2025-11-21T14:15:00",
+                "category": "utilities",
+            },
+            {
+                "id": "TXN003",
+                "amount": 5000.0,
+                "type": "credit",
+                "description": "Salary credit",
+                "timestamp": "2025-11-20T09:00:00",
+                "category": "income",
+            },
+            {
+                "id": "TXN004",
+                "amount": -399.0,
+                "type": "payment",
+                "description": "Airtel mobile recharge",
+                "timestamp": "2025-11-19T18:45:00",
+                "category": "mobile",
+            },
+            {
+                "id": "TXN005",
+                "amount": -2200.0,
+                "type": "transfer",
+                "description": "transfer to Father",
+                "timestamp": "2025-11-18T11:30:00",
+                "category": "transfer",
+            },
+            {
+                "id": "TXN006",
+                "amount": -850.0,
+                "type": "payment",
+                "description": "grocery shopping at BigBazaar",
+                "timestamp": "2025-11-17T16:20:00",
+                "category": "groceries",
+            },
+            {
+                "id": "TXN007",
+                "amount": 500.0,
+                "type": "credit",
+                "description": "Amazon refund",
+                "timestamp": "2025-11-16T13:10:00",
+                "category": "refund",
+            },
+            {
+                "id": "TXN008",
+                "amount": -450.0,
+                "type": "payment",
+                "description": "restaurant payment",
+                "timestamp": "2025-11-15T20:30:00",
+                "category": "dining",
+            },
+            {
+                "id": "TXN009",
+                "amount": -1100.0,
+                "type": "bill_payment",
+                "description": "utility bills",
+                "timestamp": "2025-11-14T10:00:00",
+                "category": "utilities",
+            },
+            {
+                "id": "TXN010",
+                "amount": -300.0,
+                "type": "payment",
+                "description": "movie tickets booking",
+                "timestamp": "2025-11-13T19:15:00",
+                "category": "entertainment",
+            },
+        ],
+        "credit_limit": 250000.0,
+        "credit_utilized": 0.0,
+    },
+    "priya_patel": {
+        "user_id": "USER002",
+        "name": "Priya Patel",
+        "phone": "9845612378",
+        "accounts": [
+            {
+                "account_number": "5532",
+                "account_type": "Savings Account",
+                "balance": 45600.0,
+                "currency": "INR",
+            },
+            {
+                "account_number": "7789",
+                "account_type": "Current Account",
+                "balance": 15240.0,
+                "currency": "INR",
+            },
+        ],
+        "contacts": [
+            {"name": "Amit Shah", "phone": "9876501234", "account": "ACC_AMIT"},
+            {"name": "Mother", "phone": "9823456789", "account": "ACC_MOTHER"},
+        ],
+        "bills": [
+            {
+                "biller": "Airtel",
+                "amount": 599.0,
+                "due_date": "2025-11-25",
+                "status": "pending",
+            },
+            {
+                "biller": "Internet",
+                "amount": 899.0,
+                "due_date": "2025-11-28",
+                "status": "pending",
+            },
+        ],
+        "transactions": [
+            {
+                "id": "TXN201",
+                "amount": -599.0,
+                "type": "payment",
+                "description": "Airtel postpaid",
+                "timestamp": "2025-11-21T10:30:00",
+                "category": "mobile",
+            },
+            {
+                "id": "TXN202",
+                "amount": 8000.0,
+                "type": "credit",
+                "description": "Freelance payment",
+                "timestamp": "2025-11-20T15:45:00",
+                "category": "income",
+            },
+            {
+                "id": "TXN203",
+                "amount": -1200.0,
+                "type": "transfer",
+                "description": "to Mother",
+                "timestamp": "2025-11-19T12:00:00",
+                "category": "transfer",
+            },
+        ],
+        "credit_limit": 150000.0,
+        "credit_utilized": 0.0,
+    },
+    "arjun_reddy": {
+        "user_id": "USER003",
+        "name": "Arjun Reddy",
+        "phone": "9912345678",
+        "accounts": [
+            {
+                "account_number": "3366",
+                "account_type": "Premium Savings",
+                "balance": 185000.0,
+                "currency": "INR",
+            },
+            {
+                "account_number": "8844",
+                "account_type": "Investment Account",
+                "balance": 550000.0,
+                "currency": "INR",
+            },
+        ],
+        "contacts": [
+            {"name": "Sneha Rao", "phone": "9876012345", "account": "ACC_SNEHA"},
+            {"name": "Brother", "phone": "9845678901", "account": "ACC_BROTHER"},
+            {
+                "name": "Business Partner",
+                "phone": "9823344556",
+                "account": "ACC_PARTNER",
+            },
+        ],
+        "bills": [
+            {
+                "biller": "Credit Card",
+                "amount": 12500.0,
+                "due_date": "2025-11-30",
+                "status": "pending",
+            },
+            {
+                "biller": "Electricity",
+                "amount": 2350.0,
+                "due_date": "2025-12-02",
+                "status": "pending",
+            },
+        ],
+        "transactions": [
+            {
+                "id": "TXN301",
+                "amount": -12500.0,
+                "type": "payment",
+                "description": "Credit card payment",
+                "timestamp": "2025-11-22T09:15:00",
+                "category": "payment",
+            },
+            {
+                "id": "TXN302",
+                "amount": 50000.0,
+                "type": "credit",
+                "description": "Business income",
+                "timestamp": "2025-11-20T11:30:00",
+                "category": "income",
+            },
+            {
+                "id": "TXN303",
+                "amount": -25000.0,
+                "type": "transfer",
+                "description": "to Business Partner",
+                "timestamp": "2025-11-18T14:20:00",
+                "category": "business",
+            },
+        ],
+        "credit_limit": 500000.0,
+        "credit_utilized": 0.0,
+    },
+    "ananya_krishnan": {
+        "user_id": "USER004",
+        "name": "Ananya Krishnan",
+        "phone": "9745678901",
+        "accounts": [
+            {
+                "account_number": "2211",
+                "account_type": "Student Account",
+                "balance": 8500.0,
+                "currency": "INR",
+            }
+        ],
+        "contacts": [
+            {"name": "Roommate", "phone": "9876543210", "account": "ACC_ROOMMATE"},
+            {"name": "Dad", "phone": "9823456780", "account": "ACC_DAD"},
+        ],
+        "bills": [
+            {
+                "biller": "Netflix",
+                "amount": 199.0,
+                "due_date": "2025-11-26",
+                "status": "pending",
+            },
+            {
+                "biller": "Spotify",
+                "amount": 119.0,
+                "due_date": "2025-11-28",
+                "status": "pending",
+            },
+        ],
+        "transactions": [
+            {
+                "id": "TXN401",
+                "amount": 5000.0,
+                "type": "credit",
+                "description": "Scholarship",
+                "timestamp": "2025-11-20T10:00:00",
+                "category": "income",
+            },
+            {
+                "id": "TXN402",
+                "amount": -650.0,
+                "type": "payment",
+                "description": "Books purchase",
+                "timestamp": "2025-11-19T16:30:00",
+                "category": "education",
+            },
+            {
+                "id": "TXN403",
+                "amount": -1200.0,
+                "type": "transfer",
+                "description": "to Roommate - rent split",
+                "timestamp": "2025-11-18T20:00:00",
+                "category": "transfer",
+            },
+        ],
+        "credit_limit": 50000.0,
+        "credit_utilized": 0.0,
+    },
+}
+
+FIRST_NAMES = [
+    "Aarav",
+    "Vivaan",
+    "Aditya",
+    "Vihaan",
+    "Arjun",
+    "Sai",
+    "Reyansh",
+    "Krishna",
+    "Ishaan",
+    "Rohan",
+    "Ananya",
+    "Diya",
+    "Priya",
+    "Saanvi",
+    "Aadhya",
+    "Lakshmi",
+    "Kavya",
+    "Meera",
+    "Sneha",
+    "Pooja",
+    "Rahul",
+    "Anjali",
+    "Ramesh",
+    "Suresh",
+]
+LAST_NAMES = [
+    "Sharma",
+    "Verma",
+    "Patel",
+    "Reddy",
+    "Iyer",
+    "Nair",
+    "Krishnan",
+    "Gupta",
+    "Singh",
+    "Kumar",
+    "Rao",
+    "Das",
+    "Banerjee",
+    "Mehta",
+    "Joshi",
+    "Pillai",
+]
+ACCOUNT_TYPES = [
+    "Savings Account",
+    "Salary Account",
+    "Current Account",
+    "Fixed Deposit",
+]
+BILLERS = [
+    "BESCOM",
+    "Water",
+    "Gas",
+    "Airtel",
+    "Jio",
+    "Internet",
+    "Netflix",
+    "Credit Card",
+]
+RELATIONS = ["Father", "Mother", "Brother", "Sister", "Roommate", "Landlord"]
+# (type, category, description, sign)
+TRANSACTION_KINDS = [
+    ("payment", "groceries", "grocery shopping", -1),
+    ("payment", "dining", "restaurant payment", -1),
+    ("bill_payment", "utilities", "electricity bill payment", -1),
+    ("payment", "mobile", "mobile recharge", -1),
+    ("transfer", "transfer", "transfer to contact", -1),
+    ("payment", "entertainment", "movie tickets booking", -1),
+    ("credit", "income", "Salary credit", 1),
+    ("credit", "refund", "online refund", 1),
+]
+
+# Synthetic account numbers are 10 digits so they never collide with the
+# 4-digit demo accounts in USERS
+ACCOUNT_NUMBER_BASE = 1_000_000_000
+
+
+def generate_users(
+    count: int,
+    seed: int = 42,
+    accounts_per_user: tuple[int, int] = (1, 3),
+    transactions_per_user: int = 5,
+    start: datetime = datetime(2025, 11, 1),
+) -> Iterator[tuple[str, dict]]:
+    """Yield (user_id, user) pairs lazily so millions of users never sit in one list"""
+    rng = random.Random(seed)
+    next_account = ACCOUNT_NUMBER_BASE
+    next_txn = 0
+    for i in range(count):
+        user_id = f"user_{i:07d}"
+        first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+
+        accounts = []
+        for _ in range(rng.randint(*accounts_per_user)):
+            accounts.append(
+                {
+                    "account_number": str(next_account),
+                    "account_type": rng.choice(ACCOUNT_TYPES),
+                    "balance": float(rng.randint(500, 500_000)),
+                    "currency": "INR",
+                }
+            )
+            next_account += 1
+
+        contacts = [
+            {
+                "name": f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}",
+                "phone": f"9{rng.randint(100_000_000, 999_999_999)}",
+                "account": f"ACC_{user_id}_{c}",
+            }
+            for c in range(2)
+        ]
+        relation = rng.choice(RELATIONS)
+        contacts.append(
+            {
+                "name": relation,
+                "phone": f"9{rng.randint(100_000_000, 999_999_999)}",
+                "account": f"ACC_{user_id}_{relation.upper()}",
+            }
+        )
+
+        bills = [
+            {
+                "biller": biller,
+                "amount": float(rng.randint(99, 5000)),
+                "due_date": (start + timedelta(days=rng.randint(20, 45))).strftime(
+                    "%Y-%m-%d"
+                ),
+                "status": "pending",
+            }
+            for biller in rng.sample(BILLERS, 2)
+        ]
+
+        transactions = []
+        for _ in range(transactions_per_user):
+            txn_type, category, description, sign = rng.choice(TRANSACTION_KINDS)
+            next_txn += 1
+            transactions.append(
+                {
+                    "id": f"SYN{next_txn:010d}",
+                    "amount": sign * float(rng.randint(50, 20_000)),
+                    "type": txn_type,
+                    "description": description,
+                    "timestamp": (
+                        start + timedelta(minutes=rng.randint(0, 30 * 24 * 60))
+                    ).isoformat(),
+                    "category": category,
+                }
+            )
+
+        yield (
+            user_id,
+            {
+                "user_id": user_id,
+                "name": f"{first} {last}",
+                "phone": f"9{rng.randint(100_000_000, 999_999_999)}",
+                "accounts": accounts,
+                "contacts": contacts,
+                "bills": bills,
+                "transactions": transactions,
+                "credit_limit": float(rng.choice([50_000, 150_000, 250_000, 500_000])),
+                "credit_utilized": 0.0,
+            },
+        )
+
+
+if __name__ == "__main__":
+    import resource
+
+    from mock_banking_store import InMemoryBankingStore
+
+    parser = argparse.ArgumentParser(
+        description="Load synthetic users into the in-memory store and report cost"
+    )
+    parser.add_argument("--users", type=int, default=100_000)
+    parser.add_argument("--transactions-per-user", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    store = InMemoryBankingStore()
+    started = time.perf_counter()
+    store.load(
+        generate_users(
+            args.users, seed=args.seed, transactions_per_user=args.transactions_per_user
+        )
+    )
+    elapsed = time.perf_counter() - started
+
+    # ru_maxrss is KiB on Linux
+    rss_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(f"Loaded {store.stats()} in {elapsed:.1f}s, peak RSS {rss_mb:.0f} MB")
+
+    lookups = 100_000
+    started = time.perf_counter()
+    for i in range(lookups):
+        store.find_account(str(ACCOUNT_NUMBER_BASE + i % max(1, args.users)))
+    per_lookup_us = (time.perf_counter() - started) / lookups * 1e6
+    print(f"account -> user lookup: {per_lookup_us:.2f} µs")
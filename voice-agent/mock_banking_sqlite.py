@@ -0,0 +1,990 @@
+"""
+Mock Banking SQLite Store
+Durable SQLite (WAL) storage engine with the same interface as InMemoryBankingStore
+
+One database file can be shared by every uvicorn/gunicorn worker and survives
+restarts. WAL lets readers run alongside the single writer; writers serialize
+on a process-local lock and then on BEGIN IMMEDIATE, so a transfer's balance
+check and debit are atomic across processes. Lookups go through indexes on
+account_number, user_id and (user_id, timestamp), and the spending rollup is
+a table updated in the same transaction as every inserted transaction.
+
+Usage:
+    python mock_banking_sqlite.py migrate bank.db
+    python mock_banking_sqlite.py seed bank.db --users 1000000
+    MOCK_BANK_DB=bank.db python mock_banking_api.py --workers 4
+"""
+
+import argparse
+import json
+import queue
+import sqlite3
+import threading
+import time
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any, Optional
+
+from mock_banking_store import (
+    SPENDING_GROUPS,
+    LedgerError,
+    counterparty_of,
+    credit_leg_id,
+    decode_cursor,
+    encode_cursor,
+    new_transaction_id,
+    require_amount_due,
+)
+
+# Schema versions, applied in order and recorded in PRAGMA user_version
+MIGRATIONS: list[list[str]] = [
+    [
+        """CREATE TABLE users (
+            user_id TEXT PRIMARY KEY,
+            name TEXT NOT NULL,
+            profile TEXT NOT NULL
+        )""",
+        """CREATE TABLE accounts (
+            account_number TEXT PRIMARY KEY,
+            user_id TEXT NOT NULL REFERENCES users(user_id),
+            position INTEGER NOT NULL,
+            account_type TEXT NOT NULL,
+            balance REAL NOT NULL,
+            currency TEXT NOT NULL
+        )""",
+        "CREATE INDEX accounts_by_user ON accounts(user_id, position)",
+        """CREATE TABLE contacts (
+            user_id TEXT NOT NULL REFERENCES users(user_id),
+            position INTEGER NOT NULL,
+            name TEXT NOT NULL,
+            phone TEXT,
+            account TEXT,
+            PRIMARY KEY (user_id, position)
+        ) WITHOUT ROWID""",
+        """CREATE TABLE bills (
+            user_id TEXT NOT NULL REFERENCES users(user_id),
+            position INTEGER NOT NULL,
+            biller TEXT NOT NULL,
+            amount REAL NOT NULL,
+            due_date TEXT,
+            status TEXT NOT NULL,
+            paid_on TEXT,
+            transaction_id TEXT,
+            PRIMARY KEY (user_id, position)
+        ) WITHOUT ROWID""",
+        # seq orders transactions with equal timestamps by insertion, like the in-memory lists
+        """CREATE TABLE transactions (
+            seq INTEGER PRIMARY KEY,
+            user_id TEXT NOT NULL REFERENCES users(user_id),
+            id TEXT NOT NULL,
+            amount REAL NOT NULL,
+            type TEXT,
+            description TEXT,
+            timestamp TEXT NOT NULL,
+            category TEXT,
+            counterparty TEXT
+        )""",
+        "CREATE INDEX transactions_by_user_time ON transactions(user_id, timestamp)",
+        "CREATE INDEX transactions_by_user_category_time ON transactions(user_id, category, timestamp)",
+        """CREATE TABLE spending (
+            user_id TEXT NOT NULL,
+            month TEXT NOT NULL,
+            kind TEXT NOT NULL,
+            key TEXT NOT NULL,
+            spent REAL NOT NULL,
+            received REAL NOT NULL,
+            count INTEGER NOT NULL,
+            PRIMARY KEY (user_id, month, kind, key)
+        ) WITHOUT ROWID""",
+        """CREATE TABLE ledger (
+            seq INTEGER PRIMARY KEY,
+            transaction_id TEXT NOT NULL,
+            account_number TEXT NOT NULL,
+            amount REAL NOT NULL,
+            balance_after REAL NOT NULL,
+            timestamp TEXT NOT NULL,
+            idempotency_key TEXT
+        )""",
+        "CREATE INDEX ledger_by_account ON ledger(account_number)",
+        """CREATE TABLE idempotency (
+            key TEXT PRIMARY KEY,
+            fingerprint TEXT NOT NULL,
+            result TEXT NOT NULL
+        )""",
+    ],
+]
+
+# Statements are fixed strings so every connection's statement cache reuses
+# the compiled form; only the transaction-page query has (two) variants.
+_USER = "SELECT name, profile FROM users WHERE user_id = ?"
+_USER_EXISTS = "SELECT 1 FROM users WHERE user_id = ?"
+_USER_ACCOUNTS = "SELECT account_number, account_type, balance, currency FROM accounts WHERE user_id = ? ORDER BY position"
+_USER_CONTACTS = (
+    "SELECT name, phone, account FROM contacts WHERE user_id = ? ORDER BY position"
+)
+_USER_BILLS = (
+    "SELECT position, biller, amount, due_date, status, paid_on, transaction_id FROM bills "
+    "WHERE user_id = ? ORDER BY position"
+)
+_FIND_ACCOUNT = "SELECT user_id, account_number, account_type, balance, currency FROM accounts WHERE account_number = ?"
+_INSERT_USER = "INSERT INTO users (user_id, name, profile) VALUES (?, ?, ?)"
+_INSERT_ACCOUNT = (
+    "INSERT INTO accounts (account_number, user_id, position, account_type, balance, currency) "
+    "VALUES (?, ?, (SELECT COUNT(*) FROM accounts WHERE user_id = ?), ?, ?, ?)"
+)
+_INSERT_CONTACT = "INSERT INTO contacts (user_id, position, name, phone, account) VALUES (?, ?, ?, ?, ?)"
+_INSERT_BILL = (
+    "INSERT INTO bills (user_id, position, biller, amount, due_date, status, paid_on, transaction_id) "
+    "VALUES (?, ?, ?, ?, ?, ?, ?, ?)"
+)
+_INSERT_TRANSACTION = (
+    "INSERT INTO transactions (user_id, id, amount, type, description, timestamp, category, counterparty) "
+    "VALUES (?, ?, ?, ?, ?, ?, ?, ?)"
+)
+_ROLL_UP = (
+    "INSERT INTO spending (user_id, month, kind, key, spent, received, count) VALUES (?, ?, ?, ?, ?, ?, ?) "
+    "ON CONFLICT (user_id, month, kind, key) DO UPDATE SET "
+    "spent = spent + excluded.spent, received = received + excluded.received, count = count + excluded.count"
+)
+_TRANSACTION_COLUMNS = (
+    "seq, id, amount, type, description, timestamp, category, counterparty"
+)
+_PAGE = (
+    f"SELECT {_TRANSACTION_COLUMNS} FROM transactions "
+    "WHERE user_id = ? AND timestamp >= ? AND timestamp < ? AND (timestamp < ? OR (timestamp = ? AND seq < ?)) "
+    "ORDER BY timestamp DESC, seq DESC LIMIT ?"
+)
+_CATEGORY_PAGE = (
+    f"SELECT {_TRANSACTION_COLUMNS} FROM transactions "
+    "WHERE user_id = ? AND category = ? AND timestamp >= ? AND timestamp < ? "
+    "AND (timestamp < ? OR (timestamp = ? AND seq < ?)) "
+    "ORDER BY timestamp DESC, seq DESC LIMIT ?"
+)
+_CURSOR_SEQ = (
+    "SELECT MAX(seq) FROM transactions WHERE user_id = ? AND timestamp = ? AND id = ?"
+)
+_SPENDING = (
+    "SELECT key, SUM(spent), SUM(received), SUM(count) FROM spending "
+    "WHERE user_id = ? AND kind = ? AND month >= ? AND month <= ? GROUP BY key"
+)
+_SPENDING_BY_MONTH = (
+    "SELECT month, SUM(spent), SUM(received), SUM(count) FROM spending "
+    "WHERE user_id = ? AND kind = 'category' AND month >= ? AND month <= ? GROUP BY month ORDER BY month"
+)
+# No RETURNING (SQLite 3.35+): the balance is read back inside the same write transaction
+_UPDATE_BALANCE = (
+    "UPDATE accounts SET balance = round(balance + ?, 2) WHERE account_number = ?"
+)
+_BALANCE = "SELECT balance FROM accounts WHERE account_number = ?"
+_INSERT_LEDGER = (
+    "INSERT INTO ledger (transaction_id, account_number, amount, balance_after, timestamp, idempotency_key) "
+    "VALUES (?, ?, ?, ?, ?, ?)"
+)
+_IDEMPOTENCY = "SELECT fingerprint, result FROM idempotency WHERE key = ?"
+_INSERT_IDEMPOTENCY = (
+    "INSERT INTO idempotency (key, fingerprint, result) VALUES (?, ?, ?)"
+)
+_PAY_BILL = "UPDATE bills SET status = 'paid', paid_on = ?, transaction_id = ? WHERE user_id = ? AND position = ?"
+
+# Bounds that compare above/below every ISO timestamp and YYYY-MM month
+_MIN_TEXT, _MAX_TEXT = "", "~"
+
+# Users per write transaction when bulk loading
+LOAD_BATCH_USERS = 5_000
+
+
+def _transaction(row: tuple) -> dict:
+    """Row in _TRANSACTION_COLUMNS order -> transaction dict (optional fields only when set)"""
+    _, txn_id, amount, txn_type, description, timestamp, category, counterparty = row
+    txn = {"id": txn_id, "amount": amount}
+    for key, value in (
+        ("type", txn_type),
+        ("description", description),
+        ("timestamp", timestamp),
+        ("category", category),
+        ("counterparty", counterparty),
+    ):
+        if value is not None:
+            txn[key] = value
+    return txn
+
+
+class SQLiteBankingStore:
+    """
+    InMemoryBankingStore's interface over a SQLite database file.
+
+    Connections come from a pool of up to `pool_size`, each in autocommit mode
+    with explicit BEGIN/COMMIT. Opening a store applies pending migrations.
+    Returned dicts are snapshots; changes go through the store's methods.
+    """
+
+    def __init__(self, path: str, pool_size: int = 4, busy_timeout: float = 10.0):
+        if path == ":memory:":
+            raise ValueError(
+                "SQLiteBankingStore needs a database file; use InMemoryBankingStore for :memory:"
+            )
+        self.path = path
+        self.busy_timeout = busy_timeout
+        self._pool: queue.LifoQueue[sqlite3.Connection] = queue.LifoQueue()
+        self._pool_size = pool_size
+        self._created = 0
+        self._pool_lock = threading.Lock()
+        # Writers in this process queue here rather than in SQLite's sleeping busy handler
+        self._write_lock = threading.Lock()
+        self._lock_stats = {"acquisitions": 0, "contended": 0, "wait_seconds": 0.0}
+        self.migrate()
+
+    @classmethod
+    def from_users(cls, users: dict[str, dict], path: str) -> "SQLiteBankingStore":
+        """Create a store at path from {user_id: user} dicts in the USERS layout"""
+        store = cls(path)
+        store.load(users.items())
+        return store
+
+    # Connections
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(
+            self.path,
+            timeout=self.busy_timeout,
+            isolation_level=None,
+            check_same_thread=False,
+            cached_statements=256,
+        )
+        conn.execute("PRAGMA journal_mode = WAL")
+        # In WAL mode NORMAL only syncs at checkpoints: a crash can lose the
+        # last commits but never corrupts the database
+        conn.execute("PRAGMA synchronous = NORMAL")
+        conn.execute("PRAGMA foreign_keys = ON")
+        conn.execute("PRAGMA cache_size = -16384")
+        conn.execute("PRAGMA mmap_size = 268435456")
+        conn.execute("PRAGMA temp_store = MEMORY")
+        return conn
+
+    @contextmanager
+    def _connection(self) -> Iterator[sqlite3.Connection]:
+        """Borrow a pooled connection, opening one while the pool is below pool_size"""
+        try:
+            conn = self._pool.get_nowait()
+        except queue.Empty:
+            with self._pool_lock:
+                create = self._created < self._pool_size
+                if create:
+                    self._created += 1
+            if create:
+                try:
+                    conn = self._connect()
+                except BaseException:
+                    # Give the slot back, or failed opens would shrink the pool until get() blocks forever
+                    with self._pool_lock:
+                        self._created -= 1
+                    raise
+            else:
+                conn = self._pool.get()
+        try:
+            yield conn
+        finally:
+            self._pool.put(conn)
+
+    @contextmanager
+    def _write(self) -> Iterator[sqlite3.Connection]:
+        """Connection inside a BEGIN IMMEDIATE transaction; committed unless the block raises"""
+        with self._connection() as conn:
+            started = time.perf_counter()
+            contended = not self._write_lock.acquire(blocking=False)
+            if contended:
+                self._write_lock.acquire()
+            try:
+                conn.execute("BEGIN IMMEDIATE")
+                self._lock_stats["acquisitions"] += 1
+                self._lock_stats["contended"] += contended
+                self._lock_stats["wait_seconds"] += time.perf_counter() - started
+                try:
+                    yield conn
+                except BaseException:
+                    conn.execute("ROLLBACK")
+                    raise
+                conn.execute("COMMIT")
+            finally:
+                self._write_lock.release()
+
+    def close(self) -> None:
+        """Close every idle pooled connection"""
+        while True:
+            try:
+                self._pool.get_nowait().close()
+            except queue.Empty:
+                break
+            with self._pool_lock:
+                self._created -= 1
+
+    # Schema
+
+    def schema_version(self) -> int:
+        with self._connection() as conn:
+            return conn.execute("PRAGMA user_version").fetchone()[0]
+
+    def migrate(self) -> int:
+        """Apply pending migrations; returns the resulting schema version"""
+        with self._write() as conn:
+            version = conn.execute("PRAGMA user_version").fetchone()[0]
+            for target, statements in enumerate(
+                MIGRATIONS[version:], start=version + 1
+            ):
+                for statement in statements:
+                    conn.execute(statement)
+                conn.execute(f"PRAGMA user_version = {target}")
+                version = target
+        return version
+
+    # Loading
+
+    def load(self, users: Iterable[tuple[str, dict]]) -> int:
+        """Bulk-load (user_id, user) pairs in batched transactions. Returns the number loaded."""
+        count = 0
+        batch: list[tuple[str, dict]] = []
+        for pair in users:
+            batch.append(pair)
+            if len(batch) >= LOAD_BATCH_USERS:
+                count += self._load_batch(batch)
+                batch = []
+        if batch:
+            count += self._load_batch(batch)
+        return count
+
+    def seed_if_empty(self, users: Iterable[tuple[str, dict]]) -> int:
+        """Load users only into an empty database (safe when several workers start at once)"""
+        with self._write() as conn:
+            if conn.execute("SELECT EXISTS (SELECT 1 FROM users)").fetchone()[0]:
+                return 0
+            return self._insert_users(conn, list(users))
+
+    def _load_batch(self, batch: list[tuple[str, dict]]) -> int:
+        with self._write() as conn:
+            return self._insert_users(conn, batch)
+
+    def _insert_users(
+        self, conn: sqlite3.Connection, batch: list[tuple[str, dict]]
+    ) -> int:
+        users, accounts, contacts, bills, txns = [], [], [], [], []
+        spending: dict[tuple[str, str, str, str], list[float]] = {}
+        for user_id, user in batch:
+            profile = {
+                k: v
+                for k, v in user.items()
+                if k not in ("accounts", "transactions", "contacts", "bills")
+            }
+            users.append((user_id, user["name"], json.dumps(profile)))
+            for position, account in enumerate(user.get("accounts", [])):
+                accounts.append(
+                    (
+                        account["account_number"],
+                        user_id,
+                        position,
+                        account["account_type"],
+                        account["balance"],
+                        account.get("currency", "INR"),
+                    )
+                )
+            for position, contact in enumerate(user.get("contacts", [])):
+                contacts.append(
+                    (
+                        user_id,
+                        position,
+                        contact["name"],
+                        contact.get("phone"),
+                        contact.get("account"),
+                    )
+                )
+            for position, bill in enumerate(user.get("bills", [])):
+                bills.append(
+                    (
+                        user_id,
+                        position,
+                        bill["biller"],
+                        bill["amount"],
+                        bill.get("due_date"),
+                        bill["status"],
+                        bill.get("paid_on"),
+                        bill.get("transaction_id"),
+                    )
+                )
+            # Same order as the in-memory bulk path: stable sort by timestamp
+            for txn in sorted(
+                user.get("transactions", []), key=lambda t: t["timestamp"]
+            ):
+                txns.append(self._transaction_row(user_id, txn))
+                for key, (spent, received) in self._rollup_keys(user_id, txn):
+                    totals = spending.setdefault(key, [0.0, 0.0, 0])
+                    totals[0] += spent
+                    totals[1] += received
+                    totals[2] += 1
+        try:
+            conn.executemany(_INSERT_USER, users)
+            conn.executemany(
+                "INSERT INTO accounts (account_number, user_id, position, account_type, balance, currency) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                accounts,
+            )
+        except sqlite3.IntegrityError as e:
+            raise ValueError(f"User or account already exists: {e}") from e
+        conn.executemany(_INSERT_CONTACT, contacts)
+        conn.executemany(_INSERT_BILL, bills)
+        conn.executemany(_INSERT_TRANSACTION, txns)
+        conn.executemany(
+            _ROLL_UP, [key + tuple(totals) for key, totals in spending.items()]
+        )
+        return len(users)
+
+    def __len__(self) -> int:
+        with self._connection() as conn:
+            return conn.execute("SELECT COUNT(*) FROM users").fetchone()[0]
+
+    def __contains__(self, user_id: str) -> bool:
+        with self._connection() as conn:
+            return conn.execute(_USER_EXISTS, (user_id,)).fetchone() is not None
+
+    # Users
+
+    def add_user(self, user_id: str, user: dict) -> None:
+        """Insert a user with its accounts and transactions"""
+        self._load_batch([(user_id, user)])
+
+    def get_user(self, user_id: str) -> Optional[dict]:
+        with self._connection() as conn:
+            return self._get_user(conn, user_id)
+
+    def _get_user(self, conn: sqlite3.Connection, user_id: str) -> Optional[dict]:
+        row = conn.execute(_USER, (user_id,)).fetchone()
+        if row is None:
+            return None
+        user = json.loads(row[1])
+        user["accounts"] = [
+            {
+                "account_number": number,
+                "account_type": kind,
+                "balance": balance,
+                "currency": currency,
+            }
+            for number, kind, balance, currency in conn.execute(
+                _USER_ACCOUNTS, (user_id,)
+            )
+        ]
+        user["contacts"] = [
+            {"name": name, "phone": phone, "account": account}
+            for name, phone, account in conn.execute(_USER_CONTACTS, (user_id,))
+        ]
+        user["bills"] = []
+        for _, biller, amount, due_date, status, paid_on, txn_id in conn.execute(
+            _USER_BILLS, (user_id,)
+        ):
+            bill = {
+                "biller": biller,
+                "amount": amount,
+                "due_date": due_date,
+                "status": status,
+            }
+            if paid_on is not None:
+                bill["paid_on"] = paid_on
+                bill["transaction_id"] = txn_id
+            user["bills"].append(bill)
+        return user
+
+    # Accounts
+
+    def add_account(self, user_id: str, account: dict) -> None:
+        try:
+            with self._write() as conn:
+                conn.execute(
+                    _INSERT_ACCOUNT,
+                    (
+                        account["account_number"],
+                        user_id,
+                        user_id,
+                        account["account_type"],
+                        account["balance"],
+                        account.get("currency", "INR"),
+                    ),
+                )
+        except sqlite3.IntegrityError as e:
+            raise ValueError(
+                f"Account {account['account_number']} already exists"
+            ) from e
+
+    def find_account(self, account_number: str) -> Optional[tuple[str, dict]]:
+        """Indexed lookup of (user_id, account) by account number"""
+        with self._connection() as conn:
+            return self._find_account(conn, account_number)
+
+    @staticmethod
+    def _find_account(
+        conn: sqlite3.Connection, account_number: str
+    ) -> Optional[tuple[str, dict]]:
+        row = conn.execute(_FIND_ACCOUNT, (account_number,)).fetchone()
+        if row is None:
+            return None
+        user_id, number, kind, balance, currency = row
+        return user_id, {
+            "account_number": number,
+            "account_type": kind,
+            "balance": balance,
+            "currency": currency,
+        }
+
+    def get_accounts(self, user_id: str) -> list[dict]:
+        with self._connection() as conn:
+            return [
+                {
+                    "account_number": number,
+                    "account_type": kind,
+                    "balance": balance,
+                    "currency": currency,
+                }
+                for number, kind, balance, currency in conn.execute(
+                    _USER_ACCOUNTS, (user_id,)
+                )
+            ]
+
+    # Transactions
+
+    @staticmethod
+    def _transaction_row(user_id: str, txn: dict) -> tuple:
+        return (
+            user_id,
+            txn["id"],
+            txn["amount"],
+            txn.get("type"),
+            txn.get("description"),
+            txn["timestamp"],
+            txn.get("category"),
+            txn.get("counterparty"),
+        )
+
+    @staticmethod
+    def _rollup_keys(
+        user_id: str, txn: dict
+    ) -> list[tuple[tuple[str, str, str, str], tuple[float, float]]]:
+        """Spending-table keys one transaction adds to, with its (spent, received)"""
+        month = txn["timestamp"][:7]
+        amount = txn["amount"]
+        totals = (-amount, 0.0) if amount < 0 else (0.0, amount)
+        return [
+            ((user_id, month, "category", txn.get("category") or "other"), totals),
+            ((user_id, month, "counterparty", counterparty_of(txn)), totals),
+        ]
+
+    def add_transaction(self, user_id: str, txn: dict) -> None:
+        """Insert a transaction and add it to the spending rollup"""
+        with self._write() as conn:
+            self._insert_transaction(conn, user_id, txn)
+
+    def _insert_transaction(
+        self, conn: sqlite3.Connection, user_id: str, txn: dict
+    ) -> None:
+        conn.execute(_INSERT_TRANSACTION, self._transaction_row(user_id, txn))
+        for key, (spent, received) in self._rollup_keys(user_id, txn):
+            conn.execute(_ROLL_UP, (*key, spent, received, 1))
+
+    def spending_summary(
+        self,
+        user_id: str,
+        group_by: str = "category",
+        start_month: Optional[str] = None,
+        end_month: Optional[str] = None,
+    ) -> list[dict]:
+        """
+        Spent/received totals per category, month or counterparty over the
+        months start_month..end_month ("YYYY-MM", inclusive), read from the rollup.
+        Groups are ordered by amount spent (months chronologically).
+        """
+        if group_by not in SPENDING_GROUPS:
+            raise ValueError(f"group_by must be one of {', '.join(SPENDING_GROUPS)}")
+        start, end = start_month or _MIN_TEXT, end_month or _MAX_TEXT
+        with self._connection() as conn:
+            if group_by == "month":
+                rows = conn.execute(
+                    _SPENDING_BY_MONTH, (user_id, start, end)
+                ).fetchall()
+            else:
+                rows = conn.execute(
+                    _SPENDING, (user_id, group_by, start, end)
+                ).fetchall()
+                rows.sort(key=lambda row: -row[1])
+        return [
+            {
+                group_by: key,
+                "spent": round(spent, 2),
+                "received": round(received, 2),
+                "count": count,
+            }
+            for key, spent, received, count in rows
+        ]
+
+    def recent_transactions(self, user_id: str, limit: int = 10) -> list[dict]:
+        """Newest-first transactions for a user"""
+        return self.transactions_page(user_id, limit=limit)[0]
+
+    def transactions_between(
+        self, user_id: str, start: Optional[str] = None, end: Optional[str] = None
+    ) -> list[dict]:
+        """Oldest-first transactions with start <= timestamp < end"""
+        with self._connection() as conn:
+            rows = conn.execute(
+                f"SELECT {_TRANSACTION_COLUMNS} FROM transactions "
+                "WHERE user_id = ? AND timestamp >= ? AND timestamp < ? ORDER BY timestamp, seq",
+                (user_id, start or _MIN_TEXT, end or _MAX_TEXT),
+            ).fetchall()
+        return [_transaction(row) for row in rows]
+
+    def transactions_page(
+        self,
+        user_id: str,
+        limit: int = 10,
+        start: Optional[str] = None,
+        end: Optional[str] = None,
+        category: Optional[str] = None,
+        cursor: Optional[str] = None,
+    ) -> tuple[list[dict], Optional[str]]:
+        """
+        Newest-first page of transactions with start <= timestamp < end, optionally
+        in one category, plus the cursor for the next page (None on the last page).
+
+        Keyset pagination on the (user_id[, category], timestamp) index: the
+        cursor resumes just below the last item returned, so cost does not grow
+        with the page number.
+        """
+        if cursor is not None:
+            cursor_time, txn_id = decode_cursor(cursor)
+        if limit <= 0:
+            return [], None
+        with self._connection() as conn:
+            if cursor is None:
+                cursor_time, cursor_seq = _MAX_TEXT, 0
+            else:
+                # An unknown id resumes below every item at the cursor's timestamp
+                found = conn.execute(
+                    _CURSOR_SEQ, (user_id, cursor_time, txn_id)
+                ).fetchone()[0]
+                cursor_seq = found if found is not None else -1
+            bounds = (
+                start or _MIN_TEXT,
+                end or _MAX_TEXT,
+                cursor_time,
+                cursor_time,
+                cursor_seq,
+                limit + 1,
+            )
+            if category is None:
+                rows = conn.execute(_PAGE, (user_id, *bounds)).fetchall()
+            else:
+                rows = conn.execute(
+                    _CATEGORY_PAGE, (user_id, category, *bounds)
+                ).fetchall()
+        page = [_transaction(row) for row in rows[:limit]]
+        return page, encode_cursor(page[-1]) if len(rows) > limit else None
+
+    def find_contact(self, user_id: str, name: str) -> Optional[dict]:
+        """Match a saved contact by full name or first name, ignoring case"""
+        with self._connection() as conn:
+            return self._find_contact(conn, user_id, name)
+
+    @staticmethod
+    def _find_contact(
+        conn: sqlite3.Connection, user_id: str, name: str
+    ) -> Optional[dict]:
+        wanted = name.strip().casefold()
+        for contact_name, phone, account in conn.execute(_USER_CONTACTS, (user_id,)):
+            full = contact_name.casefold()
+            if wanted == full or wanted == full.split()[0]:
+                return {"name": contact_name, "phone": phone, "account": account}
+        return None
+
+    # Ledger
+
+    def _replay(
+        self, conn: sqlite3.Connection, key: Optional[str], fingerprint: str
+    ) -> Optional[dict]:
+        """Stored result for a repeated idempotency key, or None for a new request"""
+        if key is None:
+            return None
+        row = conn.execute(_IDEMPOTENCY, (key,)).fetchone()
+        if row is None:
+            return None
+        if row[0] != fingerprint:
+            raise LedgerError(
+                422,
+                "Idempotency key was already used for a different request",
+                "idempotency_conflict",
+            )
+        return json.loads(row[1])
+
+    def _post(
+        self,
+        conn: sqlite3.Connection,
+        user_id: str,
+        account_number: str,
+        amount: float,
+        txn: dict,
+        idempotency_key: Optional[str],
+    ) -> float:
+        """Apply one signed amount to an account inside the caller's write transaction"""
+        conn.execute(_UPDATE_BALANCE, (amount, account_number))
+        balance = conn.execute(_BALANCE, (account_number,)).fetchone()[0]
+        conn.execute(
+            _INSERT_LEDGER,
+            (
+                txn["id"],
+                account_number,
+                amount,
+                balance,
+                txn["timestamp"],
+                idempotency_key,
+            ),
+        )
+        self._insert_transaction(conn, user_id, txn)
+        return balance
+
+    def transfer(
+        self,
+        from_account: str,
+        to_contact: str,
+        amount: float,
+        idempotency_key: Optional[str] = None,
+    ) -> dict:
+        """Debit from_account and credit the contact (when it is one of our accounts)"""
+        fingerprint = json.dumps(["transfer", from_account, to_contact, amount])
+        with self._write() as conn:
+            previous = self._replay(conn, idempotency_key, fingerprint)
+            if previous is not None:
+                return previous
+            if amount <= 0:
+                raise LedgerError(400, "Amount must be positive", "invalid_amount")
+            found = self._find_account(conn, from_account)
+            if found is None:
+                raise LedgerError(404, "Account not found", "account_not_found")
+            user_id, account = found
+            contact = self._find_contact(conn, user_id, to_contact)
+            if contact is None:
+                raise LedgerError(404, "Contact not found", "contact_not_found")
+            if account["balance"] < amount:
+                raise LedgerError(400, "Insufficient balance", "insufficient_funds")
+            payee = (
+                self._find_account(conn, contact["account"])
+                if contact["account"]
+                else None
+            )
+
+            txn_id = new_transaction_id("TXN")
+            timestamp = datetime.now().isoformat()
+            balance = self._post(
+                conn,
+                user_id,
+                from_account,
+                -amount,
+                {
+                    "id": txn_id,
+                    "amount": -amount,
+                    "type": "transfer",
+                    "description": f"to {contact['name']}",
+                    "timestamp": timestamp,
+                    "category": "transfer",
+                },
+                idempotency_key,
+            )
+            if payee is not None:
+                payer_name = conn.execute(_USER, (user_id,)).fetchone()[0]
+                self._post(
+                    conn,
+                    payee[0],
+                    contact["account"],
+                    amount,
+                    {
+                        "id": credit_leg_id(txn_id),
+                        "amount": amount,
+                        "type": "credit",
+                        "description": f"from {payer_name}",
+                        "timestamp": timestamp,
+                        "category": "transfer",
+                    },
+                    idempotency_key,
+                )
+
+            result = {
+                "status": "success",
+                "transaction_id": txn_id,
+                "message": f"Successfully transferred ₹{amount} to {contact['name']}",
+                "from_account": from_account,
+                "amount": amount,
+                "balance": balance,
+                "timestamp": timestamp,
+            }
+            if idempotency_key is not None:
+                conn.execute(
+                    _INSERT_IDEMPOTENCY,
+                    (idempotency_key, fingerprint, json.dumps(result)),
+                )
+            return result
+
+    def pay_bill(
+        self,
+        account_number: str,
+        biller: str,
+        amount: float,
+        idempotency_key: Optional[str] = None,
+    ) -> dict:
+        """Debit the account and mark the user's pending bill as paid"""
+        fingerprint = json.dumps(["pay_bill", account_number, biller, amount])
+        with self._write() as conn:
+            previous = self._replay(conn, idempotency_key, fingerprint)
+            if previous is not None:
+                return previous
+            if amount <= 0:
+                raise LedgerError(400, "Amount must be positive", "invalid_amount")
+            found = self._find_account(conn, account_number)
+            if found is None:
+                raise LedgerError(404, "Account not found", "account_not_found")
+            user_id, account = found
+            bill = next(
+                (
+                    row
+                    for row in conn.execute(_USER_BILLS, (user_id,))
+                    if row[1].casefold() == biller.strip().casefold()
+                    and row[4] == "pending"
+                ),
+                None,
+            )
+            if bill is None:
+                raise LedgerError(
+                    404, "No pending bill for this biller", "bill_not_found"
+                )
+            position, biller_name = bill[0], bill[1]
+            require_amount_due(biller_name, bill[2], amount)
+            if account["balance"] < amount:
+                raise LedgerError(400, "Insufficient balance", "insufficient_funds")
+
+            txn_id = new_transaction_id("BILL")
+            timestamp = datetime.now().isoformat()
+            balance = self._post(
+                conn,
+                user_id,
+                account_number,
+                -amount,
+                {
+                    "id": txn_id,
+                    "amount": -amount,
+                    "type": "bill_payment",
+                    "description": f"{biller_name} bill payment",
+                    "timestamp": timestamp,
+                    "category": "utilities",
+                },
+                idempotency_key,
+            )
+            conn.execute(_PAY_BILL, (timestamp, txn_id, user_id, position))
+
+            result = {
+                "status": "success",
+                "transaction_id": txn_id,
+                "message": f"Successfully paid ₹{amount} to {biller_name}",
+                "biller": biller_name,
+                "amount": amount,
+                "balance": balance,
+                "timestamp": timestamp,
+            }
+            if idempotency_key is not None:
+                conn.execute(
+                    _INSERT_IDEMPOTENCY,
+                    (idempotency_key, fingerprint, json.dumps(result)),
+                )
+            return result
+
+    def ledger_entries(self, account_number: Optional[str] = None) -> list[dict]:
+        """Append-only ledger, optionally for one account"""
+        columns = (
+            "transaction_id",
+            "account_number",
+            "amount",
+            "balance_after",
+            "timestamp",
+            "idempotency_key",
+        )
+        query = f"SELECT {', '.join(columns)} FROM ledger"
+        with self._connection() as conn:
+            if account_number is None:
+                rows = conn.execute(f"{query} ORDER BY seq").fetchall()
+            else:
+                rows = conn.execute(
+                    f"{query} WHERE account_number = ? ORDER BY seq", (account_number,)
+                ).fetchall()
+        return [dict(zip(columns, row)) for row in rows]
+
+    # Stats
+
+    def stats(self) -> dict[str, int]:
+        with self._connection() as conn:
+            return {
+                table: conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+                for table in ("users", "accounts", "transactions")
+            }
+
+    def ledger_stats(self) -> dict[str, Any]:
+        """Write volume, and write-lock contention within this process"""
+        with self._connection() as conn:
+            entries = conn.execute("SELECT COUNT(*) FROM ledger").fetchone()[0]
+            keys = conn.execute("SELECT COUNT(*) FROM idempotency").fetchone()[0]
+        acquisitions = self._lock_stats["acquisitions"]
+        return {
+            "ledger_entries": entries,
+            "idempotency_keys": keys,
+            "lock_acquisitions": acquisitions,
+            "lock_contended": self._lock_stats["contended"],
+            "contention_ratio": round(self._lock_stats["contended"] / acquisitions, 4)
+            if acquisitions
+            else 0.0,
+            "lock_wait_ms": round(self._lock_stats["wait_seconds"] * 1000, 3),
+        }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Create, migrate and seed a mock banking SQLite database"
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+    migrate = commands.add_parser(
+        "migrate", help="create the database or apply pending migrations"
+    )
+    migrate.add_argument("db")
+    seed = commands.add_parser(
+        "seed", help="load the demo users (into an empty database) and synthetic users"
+    )
+    seed.add_argument("db")
+    seed.add_argument(
+        "--users", type=int, default=100_000, help="synthetic users to add"
+    )
+    seed.add_argument("--transactions-per-user", type=int, default=5)
+    seed.add_argument("--seed", type=int, default=42)
+    stats = commands.add_parser("stats", help="print row counts")
+    stats.add_argument("db")
+    args = parser.parse_args()
+
+    store = SQLiteBankingStore(args.db)
+    if args.command == "migrate":
+        print(f"{args.db} is at schema version {store.schema_version()}")
+    elif args.command == "seed":
+        from mock_banking_seed import USERS, generate_users
+
+        started = time.perf_counter()
+        demo = store.seed_if_empty(USERS.items())
+        synthetic = store.load(
+            generate_users(
+                args.users,
+                seed=args.seed,
+                transactions_per_user=args.transactions_per_user,
+            )
+        )
+        print(
+            f"Loaded {demo} demo and {synthetic} synthetic users in {time.perf_counter() - started:.1f}s: {store.stats()}"
+        )
+    else:
+        print(store.stats())
+    store.close()
@@ -0,0 +1,632 @@
+"""
+Mock Banking Store
+Indexed in-memory data store backing the Mock Banking API
+
+Keeps three indexes in sync on every mutation:
+- account_number -> (user_id, account)
+- user_id -> accounts
+- user_id -> transactions sorted by timestamp (and per category)
+- user_id -> month -> spent/received totals per category and per counterparty
+
+The spending rollup is updated on every inserted transaction, so aggregate
+queries cost O(months x groups) rather than O(transactions).
+
+Money movement goes through an append-only ledger. Writers take per-account
+(and per-user) locks in sorted order, so concurrent transfers on different
+accounts never block each other and cannot deadlock.
+
+BankingStore lists what the API needs from a store; mock_banking_sqlite.py
+implements it over a SQLite file shared by every worker.
+"""
+
+import base64
+import threading
+import time
+import uuid
+from bisect import bisect_left, bisect_right
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any, Callable, Optional, Protocol
+
+
+class LedgerError(Exception):
+    """
+    A write was rejected; status_code/detail map straight onto the HTTP error
+    and code (e.g. "insufficient_funds") onto its X-Error-Code header
+    """
+
+    def __init__(self, status_code: int, detail: str, code: str = "rejected"):
+        super().__init__(detail)
+        self.status_code = status_code
+        self.detail = detail
+        self.code = code
+
+
+def new_transaction_id(prefix: str = "TXN") -> str:
+    """Random 80-bit id: unique across requests, threads and worker processes"""
+    return f"{prefix}{uuid.uuid4().hex[:20].upper()}"
+
+
+def credit_leg_id(txn_id: str) -> str:
+    """Id of a transfer's credit leg: the payer's reference plus a suffix, so every ledger row is unique"""
+    return f"{txn_id}-CR"
+
+
+def require_amount_due(biller: str, amount_due: float, amount: float) -> None:
+    """Bills are paid in full; LedgerError unless amount is the bill's amount due"""
+    if round(amount, 2) != round(amount_due, 2):
+        raise LedgerError(
+            400, f"Amount due for {biller} is ₹{amount_due}", "amount_mismatch"
+        )
+
+
+def encode_cursor(txn: dict) -> str:
+    """Opaque page cursor: the (timestamp, id) of the last transaction returned"""
+    return base64.urlsafe_b64encode(f"{txn['timestamp']}|{txn['id']}".encode()).decode()
+
+
+def decode_cursor(cursor: str) -> tuple[str, str]:
+    """Inverse of encode_cursor; ValueError when the cursor is malformed"""
+    try:
+        timestamp, txn_id = (
+            base64.urlsafe_b64decode(cursor.encode()).decode().split("|", 1)
+        )
+    except Exception as e:
+        raise ValueError(f"Invalid cursor: {cursor!r}") from e
+    return timestamp, txn_id
+
+
+SPENDING_GROUPS = ("category", "month", "counterparty")
+
+# "to Anjali Verma", "from Rahul Sharma", "BESCOM bill payment"
+_COUNTERPARTY_PREFIXES = ("to ", "from ")
+_COUNTERPARTY_SUFFIXES = (" bill payment",)
+
+
+def counterparty_of(txn: dict) -> str:
+    """Who the money went to or came from, as far as the description says"""
+    if txn.get("counterparty"):
+        return txn["counterparty"]
+    description = txn.get("description", "")
+    for prefix in _COUNTERPARTY_PREFIXES:
+        if description.startswith(prefix):
+            return description[len(prefix) :]
+    for suffix in _COUNTERPARTY_SUFFIXES:
+        if description.endswith(suffix):
+            return description[: -len(suffix)]
+    return description
+
+
+def _insert_sorted(times: list[str], txns: list[dict], txn: dict) -> None:
+    i = bisect_right(times, txn["timestamp"])
+    times.insert(i, txn["timestamp"])
+    txns.insert(i, txn)
+
+
+class BankingStore(Protocol):
+    """The store interface mock_banking_api serves from"""
+
+    def __contains__(self, user_id: str) -> bool: ...
+
+    def get_user(self, user_id: str) -> Optional[dict]: ...
+
+    def find_account(self, account_number: str) -> Optional[tuple[str, dict]]: ...
+
+    def transactions_page(
+        self,
+        user_id: str,
+        limit: int = 10,
+        start: Optional[str] = None,
+        end: Optional[str] = None,
+        category: Optional[str] = None,
+        cursor: Optional[str] = None,
+    ) -> tuple[list[dict], Optional[str]]: ...
+
+    def spending_summary(
+        self,
+        user_id: str,
+        group_by: str = "category",
+        start_month: Optional[str] = None,
+        end_month: Optional[str] = None,
+    ) -> list[dict]: ...
+
+    def transfer(
+        self,
+        from_account: str,
+        to_contact: str,
+        amount: float,
+        idempotency_key: Optional[str] = None,
+    ) -> dict: ...
+
+    def pay_bill(
+        self,
+        account_number: str,
+        biller: str,
+        amount: float,
+        idempotency_key: Optional[str] = None,
+    ) -> dict: ...
+
+    def ledger_stats(self) -> dict[str, Any]: ...
+
+
+class InMemoryBankingStore:
+    def __init__(self):
+        self._users: dict[str, dict] = {}
+        self._accounts_by_number: dict[str, tuple[str, dict]] = {}
+        # Parallel lists per user, ascending by timestamp (ISO-8601 strings sort chronologically)
+        self._txn_times: dict[str, list[str]] = {}
+        self._txns: dict[str, list[dict]] = {}
+        # Same layout per (user_id, category), so category filters stay binary searches
+        self._category_times: dict[tuple[str, str], list[str]] = {}
+        self._category_txns: dict[tuple[str, str], list[dict]] = {}
+        # user_id -> "YYYY-MM" -> (group, key) -> [spent, received, count]
+        self._spending: dict[str, dict[str, dict[tuple[str, str], list[float]]]] = {}
+        self._ledger: list[dict] = []
+        self._idempotency: dict[str, tuple[Any, dict]] = {}
+        self._locks: dict[str, threading.Lock] = {}
+        self._lock_stats = {"acquisitions": 0, "contended": 0, "wait_seconds": 0.0}
+
+    @classmethod
+    def from_users(cls, users: dict[str, dict]) -> "InMemoryBankingStore":
+        """Build a store from {user_id: user} dicts in the USERS layout"""
+        store = cls()
+        store.load(users.items())
+        return store
+
+    def load(self, users: Iterable[tuple[str, dict]]) -> int:
+        """Bulk-load (user_id, user) pairs. Returns the number of users loaded."""
+        count = 0
+        for user_id, user in users:
+            self.add_user(user_id, user)
+            count += 1
+        return count
+
+    def __len__(self) -> int:
+        return len(self._users)
+
+    def __contains__(self, user_id: str) -> bool:
+        return user_id in self._users
+
+    # Users
+
+    def add_user(self, user_id: str, user: dict) -> None:
+        """Insert a user with its accounts and transactions, indexing both"""
+        if user_id in self._users:
+            raise ValueError(f"User {user_id} already exists")
+        record = {
+            k: v for k, v in user.items() if k not in ("accounts", "transactions")
+        }
+        record["accounts"] = []
+        # Own copies: paying a bill must not mark the caller's seed data paid
+        record["bills"] = [dict(bill) for bill in user.get("bills", [])]
+        self._users[user_id] = record
+        for account in user.get("accounts", []):
+            self.add_account(user_id, dict(account))
+        # Bulk path: sort once instead of inserting one by one
+        txns = sorted(
+            (dict(t) for t in user.get("transactions", [])),
+            key=lambda t: t["timestamp"],
+        )
+        self._txns[user_id] = txns
+        self._txn_times[user_id] = [t["timestamp"] for t in txns]
+        self._spending[user_id] = {}
+        for txn in txns:
+            self._roll_up(user_id, txn)
+            key = (user_id, txn.get("category"))
+            self._category_txns.setdefault(key, []).append(txn)
+            self._category_times.setdefault(key, []).append(txn["timestamp"])
+
+    def get_user(self, user_id: str) -> Optional[dict]:
+        return self._users.get(user_id)
+
+    # Accounts
+
+    def add_account(self, user_id: str, account: dict) -> None:
+        number = account["account_number"]
+        if number in self._accounts_by_number:
+            raise ValueError(f"Account {number} already exists")
+        self._users[user_id]["accounts"].append(account)
+        self._accounts_by_number[number] = (user_id, account)
+
+    def find_account(self, account_number: str) -> Optional[tuple[str, dict]]:
+        """O(1) lookup of (user_id, account) by account number"""
+        return self._accounts_by_number.get(account_number)
+
+    def get_accounts(self, user_id: str) -> list[dict]:
+        return self._users[user_id]["accounts"]
+
+    # Transactions
+
+    def add_transaction(self, user_id: str, txn: dict) -> None:
+        """Insert a transaction, keeping the per-user and per-category time indexes sorted"""
+        _insert_sorted(self._txn_times[user_id], self._txns[user_id], txn)
+        key = (user_id, txn.get("category"))
+        _insert_sorted(
+            self._category_times.setdefault(key, []),
+            self._category_txns.setdefault(key, []),
+            txn,
+        )
+        self._roll_up(user_id, txn)
+
+    def _roll_up(self, user_id: str, txn: dict) -> None:
+        """Add one transaction to its month's category and counterparty totals"""
+        month = self._spending[user_id].setdefault(txn["timestamp"][:7], {})
+        amount = txn["amount"]
+        for key in (
+            ("category", txn.get("category") or "other"),
+            ("counterparty", counterparty_of(txn)),
+        ):
+            totals = month.setdefault(key, [0.0, 0.0, 0])
+            if amount < 0:
+                totals[0] -= amount
+            else:
+                totals[1] += amount
+            totals[2] += 1
+
+    def spending_summary(
+        self,
+        user_id: str,
+        group_by: str = "category",
+        start_month: Optional[str] = None,
+        end_month: Optional[str] = None,
+    ) -> list[dict]:
+        """
+        Spent/received totals per category, month or counterparty over the
+        months start_month..end_month ("YYYY-MM", inclusive), read from the rollup.
+        Groups are ordered by amount spent (months chronologically).
+        """
+        if group_by not in SPENDING_GROUPS:
+            raise ValueError(f"group_by must be one of {', '.join(SPENDING_GROUPS)}")
+        groups: dict[str, list[float]] = {}
+        for month, totals in self._spending[user_id].items():
+            if (start_month is not None and month < start_month) or (
+                end_month is not None and month > end_month
+            ):
+                continue
+            # Month totals are the category totals of that month summed up
+            dimension = "category" if group_by == "month" else group_by
+            for (kind, key), (spent, received, count) in totals.items():
+                if kind != dimension:
+                    continue
+                merged = groups.setdefault(
+                    month if group_by == "month" else key, [0.0, 0.0, 0]
+                )
+                merged[0] += spent
+                merged[1] += received
+                merged[2] += count
+        order = (
+            sorted(groups)
+            if group_by == "month"
+            else sorted(groups, key=lambda k: -groups[k][0])
+        )
+        return [
+            {
+                group_by: key,
+                "spent": round(groups[key][0], 2),
+                "received": round(groups[key][1], 2),
+                "count": groups[key][2],
+            }
+            for key in order
+        ]
+
+    def recent_transactions(self, user_id: str, limit: int = 10) -> list[dict]:
+        """Newest-first transactions for a user"""
+        txns = self._txns[user_id]
+        if limit <= 0:
+            return []
+        return txns[: -limit - 1 : -1] if limit < len(txns) else txns[::-1]
+
+    def transactions_between(
+        self, user_id: str, start: Optional[str] = None, end: Optional[str] = None
+    ) -> list[dict]:
+        """Oldest-first transactions with start <= timestamp < end, via binary search"""
+        times = self._txn_times[user_id]
+        lo = 0 if start is None else bisect_left(times, start)
+        hi = len(times) if end is None else bisect_left(times, end)
+        return self._txns[user_id][lo:hi]
+
+    def transactions_page(
+        self,
+        user_id: str,
+        limit: int = 10,
+        start: Optional[str] = None,
+        end: Optional[str] = None,
+        category: Optional[str] = None,
+        cursor: Optional[str] = None,
+    ) -> tuple[list[dict], Optional[str]]:
+        """
+        Newest-first page of transactions with start <= timestamp < end, optionally
+        in one category, plus the cursor for the next page (None on the last page).
+
+        The cursor is the position of the last item returned rather than an
+        offset, so transactions posted between pages never shift or repeat items.
+        Cost is O(log n + limit) whatever the history length.
+        """
+        if category is None:
+            times, txns = self._txn_times[user_id], self._txns[user_id]
+        else:
+            key = (user_id, category)
+            times, txns = (
+                self._category_times.get(key, []),
+                self._category_txns.get(key, []),
+            )
+        lo = 0 if start is None else bisect_left(times, start)
+        hi = len(times) if end is None else bisect_left(times, end)
+        if cursor is not None:
+            timestamp, txn_id = decode_cursor(cursor)
+            after = min(hi, bisect_right(times, timestamp))
+            before = max(lo, bisect_left(times, timestamp))
+            # Resume just below the cursor item; ties on timestamp are resolved by id
+            hi = next(
+                (
+                    i
+                    for i in range(after - 1, before - 1, -1)
+                    if txns[i]["id"] == txn_id
+                ),
+                before,
+            )
+        if limit <= 0 or hi <= lo:
+            return [], None
+        first = max(lo, hi - limit)
+        page = txns[first:hi][::-1]
+        return page, encode_cursor(page[-1]) if first > lo else None
+
+    def find_contact(self, user_id: str, name: str) -> Optional[dict]:
+        """Match a saved contact by full name or first name, ignoring case"""
+        wanted = name.strip().casefold()
+        for contact in self._users[user_id]["contacts"]:
+            full = contact["name"].casefold()
+            if wanted == full or wanted == full.split()[0]:
+                return contact
+        return None
+
+    # Ledger
+
+    @contextmanager
+    def _locked(self, keys: Iterable[str]) -> Iterator[None]:
+        """Hold the locks for keys, acquired in sorted order to avoid deadlocks"""
+        held = []
+        try:
+            for key in sorted(set(keys)):
+                # setdefault is atomic, so two threads never get different locks
+                lock = self._locks.setdefault(key, threading.Lock())
+                self._lock_stats["acquisitions"] += 1
+                if not lock.acquire(blocking=False):
+                    started = time.perf_counter()
+                    lock.acquire()
+                    self._lock_stats["contended"] += 1
+                    self._lock_stats["wait_seconds"] += time.perf_counter() - started
+                held.append(lock)
+            yield
+        finally:
+            for lock in reversed(held):
+                lock.release()
+
+    def _idempotent(
+        self, key: Optional[str], fingerprint: Any, operation: Callable[[], dict]
+    ) -> dict:
+        """Run operation once per idempotency key; retries get the original result"""
+        if key is None:
+            return operation()
+        with self._locked([f"idempotency:{key}"]):
+            previous = self._idempotency.get(key)
+            if previous is not None:
+                if previous[0] != fingerprint:
+                    raise LedgerError(
+                        422,
+                        "Idempotency key was already used for a different request",
+                        "idempotency_conflict",
+                    )
+                return previous[1]
+            result = operation()
+            self._idempotency[key] = (fingerprint, result)
+            return result
+
+    def _post(
+        self,
+        user_id: str,
+        account: dict,
+        amount: float,
+        txn: dict,
+        idempotency_key: Optional[str],
+    ) -> None:
+        """Apply one signed amount to an account; caller must hold its locks"""
+        account["balance"] = round(account["balance"] + amount, 2)
+        self._ledger.append(
+            {
+                "transaction_id": txn["id"],
+                "account_number": account["account_number"],
+                "amount": amount,
+                "balance_after": account["balance"],
+                "timestamp": txn["timestamp"],
+                "idempotency_key": idempotency_key,
+            }
+        )
+        self.add_transaction(user_id, txn)
+
+    def transfer(
+        self,
+        from_account: str,
+        to_contact: str,
+        amount: float,
+        idempotency_key: Optional[str] = None,
+    ) -> dict:
+        """Debit from_account and credit the contact (when it is one of our accounts)"""
+        return self._idempotent(
+            idempotency_key,
+            ("transfer", from_account, to_contact, amount),
+            lambda: self._transfer(from_account, to_contact, amount, idempotency_key),
+        )
+
+    def _transfer(
+        self,
+        from_account: str,
+        to_contact: str,
+        amount: float,
+        idempotency_key: Optional[str],
+    ) -> dict:
+        if amount <= 0:
+            raise LedgerError(400, "Amount must be positive", "invalid_amount")
+        found = self.find_account(from_account)
+        if found is None:
+            raise LedgerError(404, "Account not found", "account_not_found")
+        user_id, account = found
+        contact = self.find_contact(user_id, to_contact)
+        if contact is None:
+            raise LedgerError(404, "Contact not found", "contact_not_found")
+        payee = self.find_account(contact["account"])
+
+        keys = [f"account:{from_account}", f"user:{user_id}"]
+        if payee is not None:
+            keys += [f"account:{contact['account']}", f"user:{payee[0]}"]
+        with self._locked(keys):
+            if account["balance"] < amount:
+                raise LedgerError(400, "Insufficient balance", "insufficient_funds")
+            txn_id = new_transaction_id("TXN")
+            timestamp = datetime.now().isoformat()
+            self._post(
+                user_id,
+                account,
+                -amount,
+                {
+                    "id": txn_id,
+                    "amount": -amount,
+                    "type": "transfer",
+                    "description": f"to {contact['name']}",
+                    "timestamp": timestamp,
+                    "category": "transfer",
+                },
+                idempotency_key,
+            )
+            if payee is not None:
+                self._post(
+                    payee[0],
+                    payee[1],
+                    amount,
+                    {
+                        "id": credit_leg_id(txn_id),
+                        "amount": amount,
+                        "type": "credit",
+                        "description": f"from {self._users[user_id]['name']}",
+                        "timestamp": timestamp,
+                        "category": "transfer",
+                    },
+                    idempotency_key,
+                )
+            balance = account["balance"]
+
+        return {
+            "status": "success",
+            "transaction_id": txn_id,
+            "message": f"Successfully transferred ₹{amount} to {contact['name']}",
+            "from_account": from_account,
+            "amount": amount,
+            "balance": balance,
+            "timestamp": timestamp,
+        }
+
+    def pay_bill(
+        self,
+        account_number: str,
+        biller: str,
+        amount: float,
+        idempotency_key: Optional[str] = None,
+    ) -> dict:
+        """Debit the account and mark the user's pending bill as paid"""
+        return self._idempotent(
+            idempotency_key,
+            ("pay_bill", account_number, biller, amount),
+            lambda: self._pay_bill(account_number, biller, amount, idempotency_key),
+        )
+
+    def _pay_bill(
+        self,
+        account_number: str,
+        biller: str,
+        amount: float,
+        idempotency_key: Optional[str],
+    ) -> dict:
+        if amount <= 0:
+            raise LedgerError(400, "Amount must be positive", "invalid_amount")
+        found = self.find_account(account_number)
+        if found is None:
+            raise LedgerError(404, "Account not found", "account_not_found")
+        user_id, account = found
+
+        with self._locked([f"account:{account_number}", f"user:{user_id}"]):
+            bill = next(
+                (
+                    b
+                    for b in self._users[user_id]["bills"]
+                    if b["biller"].casefold() == biller.strip().casefold()
+                    and b["status"] == "pending"
+                ),
+                None,
+            )
+            if bill is None:
+                raise LedgerError(
+                    404, "No pending bill for this biller", "bill_not_found"
+                )
+            require_amount_due(bill["biller"], bill["amount"], amount)
+            if account["balance"] < amount:
+                raise LedgerError(400, "Insufficient balance", "insufficient_funds")
+            txn_id = new_transaction_id("BILL")
+            timestamp = datetime.now().isoformat()
+            self._post(
+                user_id,
+                account,
+                -amount,
+                {
+                    "id": txn_id,
+                    "amount": -amount,
+                    "type": "bill_payment",
+                    "description": f"{bill['biller']} bill payment",
+                    "timestamp": timestamp,
+                    "category": "utilities",
+                },
+                idempotency_key,
+            )
+            bill["status"] = "paid"
+            bill["paid_on"] = timestamp
+            bill["transaction_id"] = txn_id
+            balance = account["balance"]
+
+        return {
+            "status": "success",
+            "transaction_id": txn_id,
+            "message": f"Successfully paid ₹{amount} to {bill['biller']}",
+            "biller": bill["biller"],
+            "amount": amount,
+            "balance": balance,
+            "timestamp": timestamp,
+        }
+
+    def ledger_entries(self, account_number: Optional[str] = None) -> list[dict]:
+        """Append-only ledger, optionally for one account"""
+        if account_number is None:
+            return list(self._ledger)
+        return [e for e in self._ledger if e["account_number"] == account_number]
+
+    # Stats
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "users": len(self._users),
+            "accounts": len(self._accounts_by_number),
+            "transactions": sum(len(t) for t in self._txns.values()),
+        }
+
+    def ledger_stats(self) -> dict[str, Any]:
+        """Write volume and lock contention, for throughput-vs-contention tests"""
+        acquisitions = self._lock_stats["acquisitions"]
+        return {
+            "ledger_entries": len(self._ledger),
+            "idempotency_keys": len(self._idempotency),
+            "lock_acquisitions": acquisitions,
+            "lock_contended": self._lock_stats["contended"],
+            "contention_ratio": round(self._lock_stats["contended"] / acquisitions, 4)
+            if acquisitions
+            else 0.0,
+            "lock_wait_ms": round(self._lock_stats["wait_seconds"] * 1000, 3),
+        }
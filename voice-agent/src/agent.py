@@ -6,19 +6,41 @@ Reference: https://docs.sarvam.ai/api-reference-docs/cookbook/integration/build-
 
 import logging
 import os
-import re
+import time
+from collections.abc import AsyncIterable, AsyncIterator
+from datetime import date
+from typing import Optional
 
 from dotenv import load_dotenv
+from livekit import rtc
 from livekit.agents import (
+    NOT_GIVEN,
     Agent,
     AgentSession,
     JobContext,
+    JobExecutorType,
+    JobProcess,
+    MetricsCollectedEvent,
+    ModelSettings,
+    StopResponse,
     WorkerOptions,
     cli,
+    llm,
+    metrics,
     vad,
 )
-from livekit.plugins import groq, sarvam, google, silero
+from livekit.plugins import google, groq, sarvam, silero
+from livekit.plugins.turn_detector.multilingual import MultilingualModel
+
 from banking_api import BankingAPIClient
+from banking_tools import BankingTools
+from context_budget import ContextBudget
+from intent_router import render_balance, render_bills, render_loans, route_intent
+from language_detection import detect_language
+from sanitizer import ResponseSanitizer, StreamingSanitizer, sanitize_stream
+from speech_pool import SpeechModelPool
+from tts_cache import TTSAudioCache, phrase_key, speak_cached
+from turn_tracing import TurnTracer, configure_otlp_export, flush_traces
 
 # Set up logging (following Sarvam AI best practices)
 logger = logging.getLogger("voice-agent")
@@ -28,62 +50,115 @@ logger.setLevel(logging.INFO)
 load_dotenv()
 load_dotenv(".env.local")  # Also load .env.local for LiveKit credentials
 
-# Initialize Banking API Client
-banking_api = BankingAPIClient(base_url=os.getenv("BANKING_API_URL", "http://localhost:8000"))
+# Process-wide Banking API connection pool. Never used directly for user calls:
+# each session gets its own client via banking_pool.session() so callers sharing
+# this worker keep separate identities.
+banking_pool = BankingAPIClient(
+    base_url=os.getenv("BANKING_API_URL", "http://localhost:8000"),
+    reference_ttl=float(os.getenv("BANKING_REFERENCE_TTL", "300")),
+)
+
+# "thread" runs several concurrent rooms inside one worker process (each job
+# thread has its own event loop and therefore its own pool from banking_pool);
+# "process" (LiveKit default) isolates every call in its own process
+JOB_EXECUTOR_TYPE = os.getenv("JOB_EXECUTOR_TYPE", "process").lower()
 
 # Model selection - set in .env.local: LLM_PROVIDER=gemini or groq
 LLM_PROVIDER = os.getenv("LLM_PROVIDER", "groq").lower()
 
-def sanitize_response(text: str) -> str:
-    """
-    Remove all technical details, function calls, and tool mentions from LLM responses.
-    This ensures users only see natural language, not internal implementation details.
-    """
-    if not text:
-        return text
+STT_MODEL = "saarika:v2.5"
+TTS_MODEL = "bulbul:v2"
+TTS_SPEAKER = "manisha"
+
+# Process-wide Sarvam STT/TTS instances keyed by language. Locking the
+# conversation language swaps in a pooled instance instead of building one.
+speech_pool = SpeechModelPool(
+    stt_factory=lambda language: sarvam.STT(language=language, model=STT_MODEL),
+    tts_factory=lambda language: sarvam.TTS(
+        target_language_code=language, model=TTS_MODEL, speaker=TTS_SPEAKER
+    ),
+)
 
-    # Pattern 1: Remove "Tool: function_name Parameters: {...}" style mentions
-    text = re.sub(r'Tool:\s*\w+\s+Parameters:\s*\{[^}]*\}', '', text, flags=re.IGNORECASE)
+# Synthesized audio for phrases that recur across calls. Set TTS_CACHE_DIR to
+# keep phrases on disk across restarts and share them between worker processes.
+tts_cache = TTSAudioCache(
+    memory_bytes=int(os.getenv("TTS_CACHE_MEMORY_MB", "64")) * 1024 * 1024,
+    disk_dir=os.getenv("TTS_CACHE_DIR") or None,
+    disk_bytes=int(os.getenv("TTS_CACHE_DISK_MB", "512")) * 1024 * 1024,
+)
+
+# Strips exactly the tools the LLM can call from what gets spoken
+response_sanitizer = ResponseSanitizer(BankingTools.tool_names())
 
-    # Pattern 2: Remove standalone "Tool:" or "Function:" mentions
-    text = re.sub(r'\b(Tool|Function|API|called with|calling|Parameters?):\s*[^\n.]*', '', text, flags=re.IGNORECASE)
+# Transcripts routed with at least this confidence are answered without the LLM
+FAST_PATH_MIN_CONFIDENCE = float(os.getenv("FAST_PATH_MIN_CONFIDENCE", "0.9"))
 
-    # Pattern 3: Remove JSON-like structures that might be exposed
-    text = re.sub(r'\{["\']?\w+["\']?\s*:\s*[^}]{0,100}\}', '', text)
+# Languages whose STT/TTS connections are opened as soon as a call starts
+SPEECH_PREWARM_LANGUAGES = [
+    lang.strip()
+    for lang in os.getenv("SPEECH_PREWARM_LANGUAGES", "en-IN,hi-IN").split(",")
+    if lang.strip()
+]
 
-    # Pattern 4: Remove common function names
-    function_names = ['get_banking_data', 'transfer_funds', 'pay_bill', 'check_balance']
-    for func_name in function_names:
-        text = re.sub(rf'\b{func_name}\b', '', text, flags=re.IGNORECASE)
+# Per-turn prompt budget. Older turns are summarized and earlier tool outputs
+# cut down so time-to-first-token stays flat as a call gets longer.
+CONTEXT_MAX_TOKENS = int(os.getenv("CONTEXT_MAX_TOKENS", "2000"))
+CONTEXT_KEEP_TURNS = int(os.getenv("CONTEXT_KEEP_TURNS", "4"))
 
-    # Pattern 5: Remove any remaining technical markers
-    technical_markers = [
-        r'data_type\s*=',
-        r'account_number\s*=',
-        r'called with',
-        r'executing',
-        r'running tool',
-        r'using function'
-    ]
-    for marker in technical_markers:
-        text = re.sub(marker, '', text, flags=re.IGNORECASE)
+# Per-turn stage tracing. Spans go to an OTLP/HTTP collector when its endpoint
+# is set (e.g. http://localhost:4318); stage histograms are served on
+# :PROMETHEUS_PORT/metrics (set PROMETHEUS_MULTIPROC_DIR to include job processes)
+OTLP_ENDPOINT = os.getenv("OTEL_EXPORTER_OTLP_ENDPOINT")
+PROMETHEUS_PORT = os.getenv("PROMETHEUS_PORT")
 
-    # Clean up extra whitespace and punctuation that may result from removals
-    text = re.sub(r'\s+([.,!?])', r'\1', text)  # Remove space before punctuation
-    text = re.sub(r'\s{2,}', ' ', text)  # Multiple spaces to single space
-    text = re.sub(r'^\s+|\s+$', '', text)  # Trim leading/trailing whitespace
+# Few-shot examples, sent only until the call has turns of its own
+EXAMPLE_CONVERSATIONS = """
+Example conversation flows:
+
+Balance check:
+User: "What's my balance?" or "मेरा बैलेंस बताइए"
+You: "Could you provide your account number?" (in their language)
+User: "4421"
+You: Fetch balance and respond "Your account 4421 has 27,940 rupees"
 
-    # Remove empty sentences (just punctuation)
-    text = re.sub(r'[.!?]\s*[.!?]+', '.', text)  # Multiple punctuation to single
+Send money:
+User: "Send 500 to Anjali" or "अंजली को 500 भेजो"
+You: "Alright, transfer 500 rupees to Anjali Verma. Is that correct?" (in their language)
+User: "Yes"
+You: "Please enter your PIN" (in their language)
+User: (types PIN - user never speaks PIN, they type it silently)
+You: If PIN is "1234" - confirm "PIN is correct" and process transfer "Transaction successful. 500 rupees sent to Anjali"
+     If PIN is wrong - say "PIN incorrect. Please try again"
+     If wrong 3 times - say "Three wrong attempts. Account blocked"
 
-    logger.debug(f"Sanitized text: {text}")
-    return text
+Loan inquiry:
+User: "What are the loan interest rates?" or "लोन की ब्याज दर क्या है?"
+You: Fetch loan data and respond "Personal loan is 10.5% per year, home loan is 8.25% per year, car loan is 9% per year"
+"""
 
 
 class VoiceAgent(Agent):
-    def __init__(self) -> None:
-        # Select LLM based on environment variable
-        if LLM_PROVIDER == "gemini":
+    def __init__(
+        self,
+        banking_api: BankingAPIClient,
+        speech: SpeechModelPool,
+        vad_model: Optional[vad.VAD],
+        tts_cache: TTSAudioCache,
+        llm_model: Optional[llm.LLM] = None,
+    ) -> None:
+        # Session-scoped client: carries this caller's identity only
+        self.banking_api = banking_api
+        # Stage timings of each turn; entrypoint attaches it to the session's events
+        self.tracer = TurnTracer()
+        # Typed LLM tools over this session's client; resolves identity once per account
+        self.banking_tools = BankingTools(banking_api, self.tracer)
+        self.speech = speech
+        self.tts_cache = tts_cache
+
+        # Select LLM based on environment variable (llm_model overrides it, e.g. in load tests)
+        if llm_model is not None:
+            llm_instance = llm_model
+        elif LLM_PROVIDER == "gemini":
             llm_instance = google.LLM(
                 model="gemini-2.5-flash",  # Latest Gemini 2.5 Flash model
                 # Gemini 2.5 Flash: Enhanced multilingual understanding, improved for banking conversations
@@ -99,10 +174,15 @@ class VoiceAgent(Agent):
         self.detected_language = "en-IN"
         self.current_language_name = "English"
         self.conversation_language_locked = False  # Lock language after first detection
+        self.context_budget = ContextBudget(
+            max_tokens=CONTEXT_MAX_TOKENS,
+            keep_turns=CONTEXT_KEEP_TURNS,
+            examples=EXAMPLE_CONVERSATIONS,
+        )
 
         super().__init__(
             # Your agent's personality and instructions
-            instructions="""You are VaaniPay, a helpful voice banking assistant for Indian users.
+            instructions=f"""You are VaaniPay, a helpful voice banking assistant for Indian users.
 
 IMPORTANT RULES:
 1. Wait for user to speak first - never greet or introduce yourself
@@ -114,224 +194,190 @@ IMPORTANT RULES:
 Available banking functions:
 - Check account balance
 - View recent transactions
+- Total spending by category, month or payee
 - Pay bills
 - Send money to contacts
 - Get loan information
 
-Example conversation flows:
-
-Balance check:
-User: "What's my balance?" or "मेरा बैलेंस बताइए"
-You: "Could you provide your account number?" (in their language)
-User: "4421"
-You: Fetch balance and respond "Your account 4421 has 27,940 rupees"
-
-Send money:
-User: "Send 500 to Anjali" or "अंजली को 500 भेजो"
-You: "Alright, transfer 500 rupees to Anjali Verma. Is that correct?" (in their language)
-User: "Yes"
-You: "Please enter your PIN" (in their language)
-User: (types PIN - user never speaks PIN, they type it silently)
-You: If PIN is "1234" - confirm "PIN is correct" and process transfer "Transaction successful. 500 rupees sent to Anjali"
-     If PIN is wrong - say "PIN incorrect. Please try again"
-     If wrong 3 times - say "Three wrong attempts. Account blocked"
-
-Loan inquiry:
-User: "What are the loan interest rates?" or "लोन की ब्याज दर क्या है?"
-You: Fetch loan data and respond "Personal loan is 10.5% per year, home loan is 8.25% per year, car loan is 9% per year"
-""",
+Today's date is {date.today().isoformat()}. Use it for questions like "this month" or "last month".
+"""
+            + EXAMPLE_CONVERSATIONS,
             # Saarika STT - Converts speech to text
-            stt=sarvam.STT(
-                language="unknown",  # Auto-detect language
-                model="saarika:v2.5"
-            ),
+            stt=speech.stt(
+                "unknown"
+            ),  # Auto-detect language until the first turn locks it
             # LLM - The "brain" that processes and generates responses
             llm=llm_instance,  # Gemini or Groq based on LLM_PROVIDER
+            tools=self.banking_tools.function_tools(),
             # Bulbul TTS - Converts text to speech
-            # Note: We'll update TTS language dynamically based on detected user language
-            # Starting with en-IN (English) as default, but will switch based on conversation
-            tts=sarvam.TTS(
-                target_language_code="en-IN",  # Default to English, will be updated dynamically
-                model="bulbul:v2",
-                speaker="manisha"
-            ),
-            # Silero VAD - Optimized settings for better first-speech detection
-            vad=silero.VAD.load(
-                min_speech_duration=0.1,  # Detect speech after 100ms (faster response)
-                min_silence_duration=0.5,  # Wait 500ms of silence before ending turn
-                prefix_padding_duration=0.2,  # Include 200ms before speech starts
-                max_buffered_speech=30.0  # Buffer up to 30s of speech
-            ),
+            # Starting with en-IN (English) as default; switch_language() swaps in
+            # the pooled instance for the detected language
+            tts=speech.tts("en-IN"),
+            # Silero VAD - loaded once per worker process in prewarm()
+            vad=vad_model,
+        )
+
+    async def _lock_language(self, text: str) -> None:
+        """Lock the conversation language from the first transcript (no-op afterwards)"""
+        if self.conversation_language_locked:
+            return
+
+        # One pass over the transcript; mixed-script input goes to the dominant script
+        detection = detect_language(text)
+        new_lang = detection.language
+        logger.debug(
+            f"Detected {new_lang} with confidence {detection.confidence:.2f} from {detection.counts}"
+        )
+
+        # On first user message, lock the language for the entire conversation
+        self.detected_language = new_lang
+        self.current_language_name = detection.language_name
+        self.conversation_language_locked = True
+        logger.info(
+            f"Language LOCKED to: {new_lang} ({self.current_language_name}) for entire conversation"
         )
-    
-    async def get_banking_data(self, data_type: str, **kwargs) -> str:
+
+        self.tracer.language = new_lang
+        with self.tracer.stage("language_lock"):
+            # Use the detected language for TTS, and for STT accuracy instead of "unknown"
+            self.switch_language(new_lang)
+            # Pinned once in the instructions rather than repeated in every message
+            await self.update_instructions(
+                f"{self.instructions}\n\nRespond in {self.current_language_name} only."
+            )
+
+    def switch_language(self, language: str) -> None:
+        """Hot-swap STT and TTS to the pooled instances for language"""
+        started = time.perf_counter()
+        stt_instance = self.speech.stt(language)
+        tts_instance = self.speech.tts(language)
+        if hasattr(self, "update_options"):
+            # livekit-agents >= 1.4 swaps the models in the running pipeline
+            self.update_options(stt=stt_instance, tts=tts_instance)
+        else:
+            # Agent.stt / Agent.tts are read-only properties; the activity reads
+            # them when it next synthesizes or restarts recognition
+            self._stt = stt_instance
+            self._tts = tts_instance
+        logger.info(
+            f"Switched speech models to {language} in {(time.perf_counter() - started) * 1000:.2f} ms"
+        )
+
+    async def llm_node(
+        self,
+        chat_ctx: llm.ChatContext,
+        tools: list[llm.FunctionTool],
+        model_settings: ModelSettings,
+    ) -> AsyncIterator[llm.ChatChunk]:
+        """Send the LLM a budgeted copy of the conversation and log its token count"""
+        fitted, turn = self.context_budget.fit(chat_ctx)
+        logger.info(
+            f"LLM context: {turn.tokens_after} tokens (from {turn.tokens_before}), "
+            f"instructions {turn.instruction_tokens}, tool outputs {turn.tool_tokens}, "
+            f"{turn.summarized_turns} turns summarized"
+        )
+        chunks = Agent.default.llm_node(self, fitted, tools, model_settings)
+        async for chunk in self.tracer.time_to_first(
+            "llm_first_token", chunks, prompt_tokens=turn.tokens_after
+        ):
+            yield chunk
+
+    async def tts_node(
+        self, text: AsyncIterable[str], model_settings: ModelSettings
+    ) -> AsyncIterator[rtc.AudioFrame]:
         """
-        Fetch banking data from API and format for LLM.
-        
-        Args:
-            data_type: Type of data to fetch (accounts, balance, transactions, bills, loans, etc.)
-            **kwargs: Additional parameters like account_number, limit, etc.
-        
-        Returns:
-            Formatted string with the requested data
+        Strip tool calls from the LLM stream clause by clause and speak the reply
+        as one streamed synthesis, so Bulbul starts on the first clause while the
+        rest is still generating. Phrases found in the TTS cache are spliced in
+        without synthesis.
         """
+        language = self.detected_language
+        sanitizing = StreamingSanitizer(response_sanitizer)
+        # tts_first_byte runs from the first clean clause, not from the LLM's first token
+        first_clause_at: list[float] = []
+
+        async def clauses() -> AsyncIterator[str]:
+            async for phrase in sanitize_stream(text, stream=sanitizing):
+                if not first_clause_at:
+                    first_clause_at.append(time.perf_counter())
+                yield phrase
+
+        audio = speak_cached(
+            clauses(),
+            self.tts_cache,
+            key_of=lambda phrase: phrase_key(language, TTS_SPEAKER, TTS_MODEL, phrase),
+            synthesize=lambda phrases: Agent.default.tts_node(
+                self, phrases, model_settings
+            ),
+        )
+        first_frame = True
         try:
-            if data_type == "loans":
-                loans = await banking_api.get_loans()
-                if loans:
-                    # Format loans with explicit fixed rates
-                    formatted = []
-                    for loan in loans:
-                        formatted.append(
-                            f"{loan['type']}: Fixed rate {loan['interest_rate']}% per year, "
-                            f"maximum amount ₹{loan['max_amount']:,}, "
-                            f"tenure {loan['min_tenure']} to {loan['max_tenure']} {loan['unit']}"
-                        )
-                    return "\n".join(formatted)
-            
-            elif data_type == "accounts":
-                # Try to get user from account number if provided
-                account_number = kwargs.get("account_number")
-                if account_number:
-                    user_data = await banking_api.get_user_by_account(account_number)
-                    if user_data:
-                        logger.info(f"Found user {user_data['user_id']} for account {account_number}")
-                
-                # If no user_id set, we can't get accounts - return helpful message
-                if banking_api.user_id is None:
-                    return "Please provide an account number so I can identify your accounts."
-                
-                accounts = await banking_api.get_accounts()
-                if accounts:
-                    return "\n".join([
-                        f"- {acc['account_number']} ({acc['account_type']}): ₹{acc['balance']:,.0f}"
-                        for acc in accounts
-                    ])
-            
-            elif data_type == "balance":
-                account = kwargs.get("account_number")
-                # If account number is provided, find the user first
-                if account:
-                    user_data = await banking_api.get_user_by_account(account)
-                    if user_data:
-                        logger.info(f"Found user {user_data['user_id']} for account {account}")
-                
-                balance_data = await banking_api.get_balance(account)
-                if balance_data:
-                    return f"Account {balance_data['account_number']}: ₹{balance_data['balance']:,.0f}"
-            
-            elif data_type == "transactions":
-                account_number = kwargs.get("account_number")
-                if account_number:
-                    user_data = await banking_api.get_user_by_account(account_number)
-                    if user_data:
-                        logger.info(f"Found user {user_data['user_id']} for account {account_number}")
-                
-                transactions = await banking_api.get_transactions(limit=10)
-                if transactions:
-                    formatted = []
-                    for txn in transactions:
-                        amount = f"₹{txn['amount']:,.0f}"
-                        formatted.append(f"{txn['date']}: {amount} - {txn['description']}")
-                    return "\n".join(formatted)
-            
-            elif data_type == "bills":
-                account_number = kwargs.get("account_number")
-                if account_number:
-                    user_data = await banking_api.get_user_by_account(account_number)
-                    if user_data:
-                        logger.info(f"Found user {user_data['user_id']} for account {account_number}")
-                
-                bills = await banking_api.get_bills()
-                if bills:
-                    return "\n".join([
-                        f"{bill['biller']}: ₹{bill['amount']:,.0f} (due: {bill['due_date']})"
-                        for bill in bills if bill['status'] == 'pending'
-                    ])
-            
-            elif data_type == "contacts":
-                contacts = await banking_api.get_contacts()
-                if contacts:
-                    return "\n".join([f"- {c['name']}" for c in contacts])
-            
-            return "API data temporarily unavailable, using fallback data"
-            
+            async for frame in audio:
+                if first_frame:
+                    first_frame = False
+                    self.tracer.record(
+                        "tts_first_byte", time.perf_counter() - first_clause_at[0]
+                    )
+                yield frame
+        finally:
+            self.tracer.record("sanitizer", sanitizing.seconds)
+
+    async def on_user_turn_completed(
+        self, turn_ctx: llm.ChatContext, new_message: llm.ChatMessage
+    ) -> None:
+        """Answer simple lookups straight from the banking API, skipping the LLM round-trip"""
+        # The first committed turn locks the conversation language
+        await self._lock_language(new_message.text_content or "")
+        with self.tracer.stage("fast_path"):
+            answer = await self._fast_path_answer(new_message.text_content or "")
+        if answer is None:
+            return
+        self.tracer.path = "fast_path"
+        # say() adds the answer to the chat context, so the LLM can follow up on it
+        self.session.say(answer)
+        raise StopResponse()
+
+    async def _fast_path_answer(self, text: str) -> Optional[str]:
+        """Templated answer for a high-confidence routed intent, or None to use the LLM"""
+        intent = route_intent(text)
+        if intent is None or intent.confidence < FAST_PATH_MIN_CONFIDENCE:
+            return None
+        language = (
+            self.detected_language
+            if self.conversation_language_locked
+            else intent.language
+        )
+        account_number = intent.slots.get("account_number")
+        try:
+            if intent.name == "loans":
+                loans = await self.banking_api.get_loans()
+                if not loans:
+                    return None
+                answer = render_loans(language, loans)
+                # Rates are the same for every caller, so the readout may be cached
+                self.tts_cache.mark_reference(answer)
+                return answer
+
+            if not await self.banking_tools.identify(account_number):
+                # The LLM asks for the account number in the caller's words
+                return None
+            profile = await self.banking_api.get_profile()
+            if profile is None:
+                return None
+            if intent.name == "balance":
+                if account_number is None and len(profile.accounts) == 1:
+                    account_number = profile.accounts[0]["account_number"]
+                account = (
+                    profile.find_account(account_number) if account_number else None
+                )
+                return render_balance(language, account) if account else None
+            if intent.name == "bills":
+                return render_bills(language, profile.bills)
         except Exception as e:
-            logger.error(f"Error fetching {data_type}: {e}")
-            return "Using fallback data due to API error"
-    
-    async def on_user_speech_committed(self, message):
-        """
-        Called when user's speech is transcribed.
-        Detect language and lock it for the entire conversation, update TTS accordingly.
-        """
-        # Language code mapping from detected text
-        text = message.content if hasattr(message, 'content') else str(message)
-
-        # Language name mapping for LLM instructions
-        language_names = {
-            "hi-IN": "Hindi",
-            "te-IN": "Telugu",
-            "gu-IN": "Gujarati",
-            "ta-IN": "Tamil",
-            "kn-IN": "Kannada",
-            "ml-IN": "Malayalam",
-            "bn-IN": "Bengali",
-            "pa-IN": "Punjabi",
-            "od-IN": "Odia",
-            "en-IN": "English"
-        }
-
-        # Simple language detection based on script
-        if any('\u0900' <= char <= '\u097F' for char in text):  # Devanagari (Hindi)
-            new_lang = "hi-IN"
-        elif any('\u0C00' <= char <= '\u0C7F' for char in text):  # Telugu
-            new_lang = "te-IN"
-        elif any('\u0A80' <= char <= '\u0AFF' for char in text):  # Gujarati
-            new_lang = "gu-IN"
-        elif any('\u0B80' <= char <= '\u0BFF' for char in text):  # Tamil
-            new_lang = "ta-IN"
-        elif any('\u0C80' <= char <= '\u0CFF' for char in text):  # Kannada
-            new_lang = "kn-IN"
-        elif any('\u0D00' <= char <= '\u0D7F' for char in text):  # Malayalam
-            new_lang = "ml-IN"
-        elif any('\u0980' <= char <= '\u09FF' for char in text):  # Bengali
-            new_lang = "bn-IN"
-        elif any('\u0A00' <= char <= '\u0A7F' for char in text):  # Punjabi
-            new_lang = "pa-IN"
-        elif any('\u0B00' <= char <= '\u0B7F' for char in text):  # Odia
-            new_lang = "od-IN"
-        else:  # English or Roman script
-            new_lang = "en-IN"
-
-        # On first user message, lock the language for the entire conversation
-        if not self.conversation_language_locked:
-            self.detected_language = new_lang
-            self.current_language_name = language_names.get(new_lang, "English")
-            self.conversation_language_locked = True
-            logger.info(f"Language LOCKED to: {new_lang} ({self.current_language_name}) for entire conversation")
-            
-            # Update the TTS instance
-            self.tts = sarvam.TTS(
-                target_language_code=new_lang,
-                model="bulbul:v2",
-                speaker="manisha"
+            logger.warning(
+                f"Fast path for {intent.name} failed, falling back to LLM: {e}"
             )
-            
-            # Update the STT to use the detected language for better accuracy
-            self.stt = sarvam.STT(
-                language=new_lang,  # Set specific language instead of "unknown"
-                model="saarika:v2.5"
-            )
-        
-        # Prepend language reminder to message content if language is locked
-        if self.conversation_language_locked and hasattr(message, 'content'):
-            # Add language enforcement to the message
-            original_content = message.content
-            message.content = f"[IMPORTANT: Respond in {self.current_language_name} only] {original_content}"
-            logger.debug(f"Prepended language reminder to message: {self.current_language_name}")
-
-        return await super().on_user_speech_committed(message)
+        return None
 
     async def on_enter(self):
         """Called when user joins - prime the VAD and wait for user to speak first"""
@@ -341,6 +387,31 @@ You: Fetch loan data and respond "Personal loan is 10.5% per year, home loan is
         pass
 
 
+def prewarm(proc: JobProcess) -> None:
+    """
+    Load heavy models once per worker process, before any job is assigned.
+    Every session the process hosts shares them instead of reloading per call.
+    """
+    started = time.perf_counter()
+    # Silero VAD - Optimized settings for better first-speech detection
+    proc.userdata["vad"] = silero.VAD.load(
+        min_speech_duration=0.1,  # Detect speech after 100ms (faster response)
+        min_silence_duration=0.5,  # Wait 500ms of silence before ending turn
+        prefix_padding_duration=0.2,  # Include 200ms before speech starts
+        max_buffered_speech=30.0,  # Buffer up to 30s of speech
+    )
+    # The turn detector's model is loaded once per worker by LiveKit's inference
+    # runner (registered by the import above); sessions only create a light handle
+    # Sarvam STT/TTS for the likely languages (and the auto-detecting STT every
+    # call starts with), adopted by this process's job loop instead of built per call
+    speech_pool.build(["unknown"], kinds=("stt",))
+    speech_pool.build(SPEECH_PREWARM_LANGUAGES)
+    if OTLP_ENDPOINT:
+        configure_otlp_export(OTLP_ENDPOINT)
+    proc.userdata["prewarm_ms"] = (time.perf_counter() - started) * 1000
+    logger.info(f"Worker process prewarmed in {proc.userdata['prewarm_ms']:.0f} ms")
+
+
 async def entrypoint(ctx: JobContext):
     """
     Main entry point - LiveKit calls this when a user connects
@@ -349,15 +420,45 @@ async def entrypoint(ctx: JobContext):
     """
     try:
         logger.info(f"User connected to room: {ctx.room.name}")
-        
+        started = time.perf_counter()
+
         # CRITICAL: Accept the job first to prevent timeout
         await ctx.connect()
-        
+
+        # Per-call banking client sharing the worker's connection pool.
+        # Closing the last session on this event loop also closes its pool.
+        banking_api = banking_pool.session()
+        ctx.add_shutdown_callback(banking_api.aclose)
+
+        # Open Sarvam connections for the likely languages before the caller speaks
+        # (the instances themselves were built in prewarm())
+        speech_pool.prewarm(SPEECH_PREWARM_LANGUAGES)
+        ctx.add_shutdown_callback(speech_pool.aclose)
+
         # Create and start the agent session
-        session = AgentSession()
-        await session.start(
-            agent=VoiceAgent(),
-            room=ctx.room
+        session = AgentSession(turn_detection=MultilingualModel())
+
+        @session.on("metrics_collected")
+        def _on_metrics_collected(ev: MetricsCollectedEvent):
+            # Provider-reported prompt size next to latency, to tie token savings to TTFT
+            if isinstance(ev.metrics, metrics.LLMMetrics):
+                logger.info(
+                    f"LLM turn: {ev.metrics.prompt_tokens} prompt tokens "
+                    f"({ev.metrics.prompt_cached_tokens} cached), TTFT {ev.metrics.ttft * 1000:.0f} ms"
+                )
+
+        agent = VoiceAgent(
+            banking_api, speech_pool, ctx.proc.userdata["vad"], tts_cache
+        )
+        agent.tracer.call_id = ctx.room.name
+        agent.tracer.observe(session)
+        if OTLP_ENDPOINT:
+            ctx.add_shutdown_callback(flush_traces)
+
+        await session.start(agent=agent, room=ctx.room)
+        logger.info(
+            f"Session ready in {(time.perf_counter() - started) * 1000:.0f} ms "
+            f"(process prewarm took {ctx.proc.userdata.get('prewarm_ms', 0):.0f} ms, paid once per worker process)"
         )
     except Exception as e:
         logger.error(f"Error in entrypoint: {e}")
@@ -366,6 +467,11 @@ async def entrypoint(ctx: JobContext):
 
 if __name__ == "__main__":
     # Run the agent - no agent_name to enable auto-dispatch
-    cli.run_app(WorkerOptions(
-        entrypoint_fnc=entrypoint
-    ))
+    cli.run_app(
+        WorkerOptions(
+            entrypoint_fnc=entrypoint,
+            prewarm_fnc=prewarm,
+            job_executor_type=JobExecutorType(JOB_EXECUTOR_TYPE),
+            prometheus_port=int(PROMETHEUS_PORT) if PROMETHEUS_PORT else NOT_GIVEN,
+        )
+    )
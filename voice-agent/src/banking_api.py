@@ -3,204 +3,920 @@ Banking API Client
 Handles all communication with the Mock Banking API
 """
 
-import httpx
+import asyncio
+import copy
 import logging
-from typing import Optional, Dict, List
+import random
+import threading
+import time
+import uuid
+import weakref
+from collections.abc import AsyncIterator, Sequence
+from dataclasses import dataclass, field
+from typing import Any, Optional
+
+import httpx
+
+from resilience import CircuitBreaker, LatencyTracker
+from ttl_cache import AsyncTTLCache
 
 logger = logging.getLogger("banking-api-client")
 
+# HTTP/2 comes from `h2`, installed with the httpx[http2] dependency. In an
+# environment without it we fall back to HTTP/1.1 keep-alive, which still
+# reuses connections.
+try:
+    import h2  # noqa: F401
+
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+# Reads happen inside a live voice turn, so they fail fast. Money-moving writes
+# get more headroom so a slow backend doesn't make us abandon a debit mid-flight.
+DEFAULT_TIMEOUT = httpx.Timeout(5.0, connect=2.0)
+ENDPOINT_TIMEOUTS: dict[str, httpx.Timeout] = {
+    "health": httpx.Timeout(2.0, connect=1.0),
+    "transfer": httpx.Timeout(15.0, connect=2.0),
+    "pay_bill": httpx.Timeout(15.0, connect=2.0),
+}
+
+# Every endpoint is safe to retry: reads are idempotent and writes carry an
+# Idempotency-Key the server deduplicates on
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+
+# Resources prefetch_profile() asks /api/batch for
+PROFILE_FIELDS = ("accounts", "bills", "transactions", "contacts", "credit_limit")
+
+DEFAULT_LIMITS = httpx.Limits(
+    max_connections=100,
+    max_keepalive_connections=20,
+    keepalive_expiry=30.0,
+)
+
+
+class PaymentRejectedError(Exception):
+    """
+    The bank answered and refused a transfer or bill payment; no money moved.
+
+    `code` is the server's X-Error-Code: invalid_pin, insufficient_funds,
+    invalid_amount, amount_mismatch, account_not_found, contact_not_found,
+    bill_not_found or idempotency_conflict ("rejected" when it sent none).
+    """
+
+    def __init__(self, code: str, detail: str, status_code: int):
+        super().__init__(f"{code}: {detail}")
+        self.code = code
+        self.detail = detail
+        self.status_code = status_code
+
+
+class PaymentOutcomeUnknownError(Exception):
+    """
+    No definite answer from the bank after every retry (timeout, connection
+    error, 5xx, open circuit); the debit may or may not have been applied.
+    Re-submit the same action with `idempotency_key` to learn the outcome
+    without moving money twice.
+    """
+
+    def __init__(self, idempotency_key: str, reason: str):
+        super().__init__(
+            f"Outcome unknown (idempotency key {idempotency_key}): {reason}"
+        )
+        self.idempotency_key = idempotency_key
+        self.reason = reason
+
+
+# Fallback rejection codes for servers that do not send X-Error-Code
+_REJECTION_CODES = {401: "invalid_pin", 404: "not_found", 422: "idempotency_conflict"}
+
+
+@dataclass
+class PoolStats:
+    """Counters describing how the shared connection pool is being used"""
+
+    requests: int = 0
+    connections_opened: int = 0
+    total_queue_time: float = 0.0
+    max_queue_time: float = 0.0
+    retries: int = 0
+    hedges: int = 0
+    hedge_wins: int = 0
+
+    @property
+    def reuse_ratio(self) -> float:
+        """Fraction of requests that were served on an already-open connection"""
+        if self.requests == 0:
+            return 0.0
+        return max(0.0, 1.0 - self.connections_opened / self.requests)
+
+    @property
+    def avg_queue_time(self) -> float:
+        """Average seconds a request waited for a free connection"""
+        if self.requests == 0:
+            return 0.0
+        return self.total_queue_time / self.requests
+
+
+@dataclass
+class ProfileSnapshot:
+    """Everything about one caller, fetched in a single concurrent burst"""
+
+    user_id: str
+    accounts: list[dict] = field(default_factory=list)
+    bills: list[dict] = field(default_factory=list)
+    transactions: list[dict] = field(default_factory=list)
+    contacts: list[dict] = field(default_factory=list)
+    credit_limit: Optional[dict] = None
+    fetched_at: float = field(default_factory=time.monotonic)
+
+    def find_account(self, account_number: str) -> Optional[dict]:
+        """Return the caller's account with this number, if it was fetched"""
+        for account in self.accounts:
+            if account["account_number"] == account_number:
+                return account
+        return None
+
+
+class _RequestTrace:
+    """httpcore trace hook measuring how long a request waited for a connection"""
+
+    def __init__(self, stats: PoolStats):
+        self._stats = stats
+        self._started = time.perf_counter()
+        self._connect_started: Optional[float] = None
+        self._connect_time = 0.0
+
+    async def __call__(self, event_name: str, info: dict[str, Any]) -> None:
+        now = time.perf_counter()
+        if event_name == "connection.connect_tcp.started":
+            self._connect_started = now
+        elif event_name in (
+            "connection.connect_tcp.complete",
+            "connection.start_tls.complete",
+        ):
+            if event_name == "connection.connect_tcp.complete":
+                self._stats.connections_opened += 1
+            if self._connect_started is not None:
+                self._connect_time = now - self._connect_started
+        elif event_name.endswith("send_request_headers.started"):
+            # Time spent before the first byte goes out, minus any handshake,
+            # is time spent queued behind other requests for a pool slot
+            queued = max(0.0, now - self._started - self._connect_time)
+            self._stats.total_queue_time += queued
+            self._stats.max_queue_time = max(self._stats.max_queue_time, queued)
+
+
 class BankingAPIClient:
-    def __init__(self, base_url: str = "http://localhost:8000"):
+    """
+    Async client for the banking backend.
+
+    Owns one long-lived httpx connection pool (HTTP/2 when available) per event
+    loop that is reused by every call. Use it as an async context manager, or
+    call aclose() when the worker process shuts down.
+
+    Caller identity (user_id) is per instance. Call session() once per voice
+    session to get a client with its own identity on top of the shared pool,
+    so concurrent calls in one worker never see each other's user_id.
+    """
+
+    def __init__(
+        self,
+        base_url: str = "http://localhost:8000",
+        *,
+        http2: bool = True,
+        limits: Optional[httpx.Limits] = None,
+        timeouts: Optional[dict[str, httpx.Timeout]] = None,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+        reference_ttl: float = 300.0,
+        reference_stale_ttl: float = 60.0,
+        max_retries: int = 2,
+        retry_backoff: float = 0.1,
+        retry_backoff_max: float = 1.0,
+        breaker_failure_threshold: int = 5,
+        breaker_reset_timeout: float = 10.0,
+        hedge_percentile: Optional[float] = 95.0,
+    ):
         self.base_url = base_url
-        self.user_id: Optional[str] = None  # User ID must be set via get_user_by_account or set_user_id
-    
+        self.user_id: Optional[str] = (
+            None  # User ID must be set via get_user_by_account or set_user_id
+        )
+        if http2 and not HTTP2_AVAILABLE:
+            logger.warning("h2 is not installed, falling back to HTTP/1.1 keep-alive")
+        self._http2 = http2 and HTTP2_AVAILABLE
+        self._limits = limits or DEFAULT_LIMITS
+        self._timeouts = {**ENDPOINT_TIMEOUTS, **(timeouts or {})}
+        self._transport = transport
+        self._max_retries = max_retries
+        self._retry_backoff = retry_backoff
+        self._retry_backoff_max = retry_backoff_max
+        # Breakers and latency windows are per endpoint and shared by all sessions,
+        # so one caller's failures protect every other caller on this worker
+        self._breaker_failure_threshold = breaker_failure_threshold
+        self._breaker_reset_timeout = breaker_reset_timeout
+        self._breakers: dict[str, CircuitBreaker] = {}
+        self._latency: dict[str, LatencyTracker] = {}
+        self._hedge_percentile = hedge_percentile
+        # Sockets are bound to the event loop that opened them. LiveKit's thread
+        # executor gives every job its own loop, so keep one pool per loop.
+        self._pools: weakref.WeakKeyDictionary[
+            asyncio.AbstractEventLoop, httpx.AsyncClient
+        ] = weakref.WeakKeyDictionary()
+        self._loop_sessions: weakref.WeakKeyDictionary[
+            asyncio.AbstractEventLoop, int
+        ] = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+        self._stats = PoolStats()
+        # Loan products and interest rates are the same for every caller, so one
+        # cache is shared by the pool owner and all of its sessions
+        self._reference_cache = AsyncTTLCache(
+            ttl=reference_ttl, stale_ttl=reference_stale_ttl
+        )
+        self._pool_owner: BankingAPIClient = self
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._session_closed = False
+        self.snapshot: Optional[ProfileSnapshot] = None
+        # Survives invalidation so a degraded backend can still be answered from memory
+        self.last_snapshot: Optional[ProfileSnapshot] = None
+        self._prefetch_task: Optional[asyncio.Task] = None
+
+    def session(self) -> "BankingAPIClient":
+        """
+        Create a client with its own caller identity that shares this client's pool.
+
+        Must be called from the event loop the session will run on. Closing the
+        last session on a loop closes that loop's pool.
+        """
+        owner = self._pool_owner
+        loop = asyncio.get_running_loop()
+        # Shallow copy shares config, stats and the pool owner; only identity is reset
+        client = copy.copy(owner)
+        client.user_id = None
+        client._loop = loop
+        client._session_closed = False
+        client.snapshot = None
+        client.last_snapshot = None
+        client._prefetch_task = None
+        with owner._lock:
+            owner._loop_sessions[loop] = owner._loop_sessions.get(loop, 0) + 1
+        return client
+
+    @property
+    def active_sessions(self) -> int:
+        """Number of session clients currently open on this pool, across all loops"""
+        owner = self._pool_owner
+        with owner._lock:
+            return sum(owner._loop_sessions.values())
+
+    def _client(self) -> httpx.AsyncClient:
+        """Return the pooled HTTP client for the running loop, opening it on first use"""
+        owner = self._pool_owner
+        loop = asyncio.get_running_loop()
+        http = owner._pools.get(loop)
+        if http is None or http.is_closed:
+            http = httpx.AsyncClient(
+                base_url=owner.base_url,
+                http2=owner._http2,
+                limits=owner._limits,
+                timeout=DEFAULT_TIMEOUT,
+                transport=owner._transport,
+            )
+            owner._pools[loop] = http
+        return http
+
+    async def __aenter__(self) -> "BankingAPIClient":
+        self._client()
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        """
+        Close the running loop's connection pool. A later call transparently reopens it.
+
+        On a session client this ends the session, and only closes the pool once
+        no other session on the same loop is still using it.
+        """
+        self.invalidate_profile()
+        owner = self._pool_owner
+        if owner is not self:
+            if self._session_closed:
+                return
+            self._session_closed = True
+            with owner._lock:
+                remaining = owner._loop_sessions.get(self._loop, 1) - 1
+                owner._loop_sessions[self._loop] = remaining
+            logger.info(f"Banking API session for user {self.user_id} closed")
+            if remaining > 0:
+                return
+        http = owner._pools.pop(asyncio.get_running_loop(), None)
+        if http is not None and not http.is_closed:
+            await http.aclose()
+            logger.info(f"Banking API connection pool closed: {self.pool_stats()}")
+
+    def pool_stats(self) -> dict[str, Any]:
+        """Snapshot of connection pool usage"""
+        open_connections = 0
+        for http in list(self._pool_owner._pools.values()):
+            if not http.is_closed:
+                pool = getattr(http._transport, "_pool", None)
+                open_connections += len(getattr(pool, "connections", []))
+        return {
+            "open_connections": open_connections,
+            "requests": self._stats.requests,
+            "connections_opened": self._stats.connections_opened,
+            "reuse_ratio": round(self._stats.reuse_ratio, 3),
+            "avg_queue_time_ms": round(self._stats.avg_queue_time * 1000, 3),
+            "max_queue_time_ms": round(self._stats.max_queue_time * 1000, 3),
+            "retries": self._stats.retries,
+            "hedges": self._stats.hedges,
+            "hedge_wins": self._stats.hedge_wins,
+            "http2": self._http2,
+            "active_sessions": self.active_sessions,
+        }
+
+    def reference_cache_stats(self) -> dict[str, Any]:
+        """Hit/miss metrics for the shared loans and interest-rates cache"""
+        return self._reference_cache.metrics()
+
+    def invalidate_reference_data(self, key: Optional[str] = None) -> None:
+        """Force loans/interest rates ("loans", "interest_rates", or both) to be refetched"""
+        self._reference_cache.invalidate(key)
+
+    def _breaker(self, endpoint: str) -> CircuitBreaker:
+        owner = self._pool_owner
+        breaker = owner._breakers.get(endpoint)
+        if breaker is None:
+            breaker = owner._breakers.setdefault(
+                endpoint,
+                CircuitBreaker(
+                    endpoint,
+                    failure_threshold=owner._breaker_failure_threshold,
+                    reset_timeout=owner._breaker_reset_timeout,
+                ),
+            )
+        return breaker
+
+    def _latency_tracker(self, endpoint: str) -> LatencyTracker:
+        return self._pool_owner._latency.setdefault(endpoint, LatencyTracker())
+
+    def endpoint_healthy(self, endpoint: str) -> bool:
+        """False while an endpoint's circuit is open or its last request failed"""
+        return self._breaker(endpoint).healthy
+
+    def circuit_stats(self) -> dict[str, dict[str, Any]]:
+        """Breaker state per endpoint"""
+        return {
+            name: breaker.metrics()
+            for name, breaker in self._pool_owner._breakers.items()
+        }
+
+    async def _send(
+        self, method: str, path: str, endpoint: str, **kwargs
+    ) -> httpx.Response:
+        """Send one request over the shared pool using the endpoint's timeout"""
+        breaker = self._breaker(endpoint)
+        breaker.allow()
+        self._stats.requests += 1
+        started = time.perf_counter()
+        try:
+            response = await self._client().request(
+                method,
+                path,
+                timeout=self._timeouts.get(endpoint, DEFAULT_TIMEOUT),
+                extensions={"trace": _RequestTrace(self._stats)},
+                **kwargs,
+            )
+        except httpx.TransportError:
+            breaker.record_failure()
+            raise
+        if response.status_code >= 500:
+            breaker.record_failure()
+        else:
+            breaker.record_success()
+            self._latency_tracker(endpoint).record(time.perf_counter() - started)
+        return response
+
+    async def _send_hedged(
+        self, method: str, path: str, endpoint: str, **kwargs
+    ) -> httpx.Response:
+        """
+        Send an idempotent GET; if it is slower than the endpoint's recent p95,
+        race a second copy and take whichever answers first.
+        """
+        hedge_after = None
+        if self._hedge_percentile is not None and self._breaker(endpoint).healthy:
+            hedge_after = self._latency_tracker(endpoint).percentile(
+                self._hedge_percentile
+            )
+        if hedge_after is None:
+            return await self._send(method, path, endpoint, **kwargs)
+
+        primary = asyncio.ensure_future(self._send(method, path, endpoint, **kwargs))
+        pending = {primary}
+        try:
+            done, pending = await asyncio.wait(pending, timeout=hedge_after)
+            if not done:
+                self._stats.hedges += 1
+                pending.add(
+                    asyncio.ensure_future(self._send(method, path, endpoint, **kwargs))
+                )
+            error: Optional[BaseException] = None
+            while done or pending:
+                for task in done:
+                    if task.exception() is None:
+                        if task is not primary:
+                            self._stats.hedge_wins += 1
+                        return task.result()
+                    error = task.exception()
+                if not pending:
+                    break
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+            raise error
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def _request(
+        self,
+        method: str,
+        path: str,
+        endpoint: str,
+        *,
+        retries: Optional[int] = None,
+        **kwargs,
+    ) -> httpx.Response:
+        """
+        Send a request, retrying transport errors and retryable status codes.
+
+        Backoff is exponential with full jitter so retries from many sessions
+        don't arrive at a struggling backend in lockstep.
+        """
+        retries = self._max_retries if retries is None else retries
+        attempt = 0
+        while True:
+            send = self._send_hedged if method == "GET" else self._send
+            try:
+                response = await send(method, path, endpoint, **kwargs)
+                if (
+                    response.status_code not in RETRYABLE_STATUS_CODES
+                    or attempt >= retries
+                ):
+                    return response
+                reason = f"HTTP {response.status_code}"
+            except httpx.TransportError as e:
+                if attempt >= retries:
+                    raise
+                reason = repr(e)
+            delay = random.uniform(
+                0, min(self._retry_backoff_max, self._retry_backoff * 2**attempt)
+            )
+            attempt += 1
+            self._stats.retries += 1
+            logger.warning(
+                f"Retrying {method} {path} ({reason}), attempt {attempt}/{retries} in {delay * 1000:.0f}ms"
+            )
+            await asyncio.sleep(delay)
+
+    @staticmethod
+    def new_idempotency_key() -> str:
+        """Key for one money-moving action; reuse it when retrying that same action"""
+        return uuid.uuid4().hex
+
     def set_user_id(self, user_id: str) -> None:
         """Set the user_id for this client instance"""
+        if user_id != self.user_id:
+            self.invalidate_profile()
+            self.last_snapshot = None
         self.user_id = user_id
         logger.info(f"User ID set to: {user_id}")
-    
-    async def get_user_by_account(self, account_number: str) -> Optional[Dict]:
+
+    async def prefetch_profile(self) -> ProfileSnapshot:
+        """Fetch accounts, bills, transactions, contacts and credit limit in one batch request"""
+        self._require_user_id()
+        user_id = self.user_id
+        started = time.perf_counter()
+        batch = await self.fetch_many(PROFILE_FIELDS)
+        if batch is not None:
+            accounts, bills, transactions, contacts, credit_limit = (
+                batch[field] for field in PROFILE_FIELDS
+            )
+        else:
+            # Backend without /api/batch, or the batch call failed: one request per resource
+            (
+                accounts,
+                bills,
+                transactions,
+                contacts,
+                credit_limit,
+            ) = await asyncio.gather(
+                self.get_accounts(),
+                self.get_bills(),
+                self.get_transactions(limit=10),
+                self.get_contacts(),
+                self.get_credit_limit(),
+            )
+        snapshot = ProfileSnapshot(
+            user_id=user_id,
+            accounts=accounts,
+            bills=bills,
+            transactions=transactions,
+            contacts=contacts,
+            credit_limit=credit_limit,
+        )
+        # Caller may have switched identity while we were fetching
+        if self.user_id == user_id:
+            self.snapshot = snapshot
+            self.last_snapshot = snapshot
+        logger.info(
+            f"Prefetched profile for {user_id} in {(time.perf_counter() - started) * 1000:.0f}ms"
+        )
+        return snapshot
+
+    def start_prefetch(self) -> Optional[asyncio.Task]:
+        """Kick off prefetch_profile() in the background for the identified caller"""
+        if self.user_id is None:
+            return None
+        if self.snapshot is not None and self.snapshot.user_id == self.user_id:
+            return self._prefetch_task
+        if self._prefetch_task is None or self._prefetch_task.done():
+            self._prefetch_task = asyncio.create_task(self.prefetch_profile())
+        return self._prefetch_task
+
+    async def get_profile(self) -> Optional[ProfileSnapshot]:
+        """Return the caller's snapshot, waiting for an in-flight prefetch if needed"""
+        task = self._prefetch_task
+        if task is not None:
+            # wait() rather than await: a cancelled prefetch must not cancel the caller
+            await asyncio.wait({task})
+            if not task.cancelled() and task.exception() is not None:
+                logger.error(f"Profile prefetch failed: {task.exception()}")
+        if self.snapshot is not None and self.snapshot.user_id == self.user_id:
+            return self.snapshot
+        return None
+
+    def invalidate_profile(self) -> None:
+        """Drop the snapshot, e.g. after a write changed balances or bills"""
+        self.snapshot = None
+        if self._prefetch_task is not None and not self._prefetch_task.done():
+            self._prefetch_task.cancel()
+        self._prefetch_task = None
+
+    async def get_user_by_account(self, account_number: str) -> Optional[dict]:
         """Find user_id by account number and update client user_id"""
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(f"{self.base_url}/api/accounts/{account_number}/user")
-                if response.status_code == 200:
-                    user_data = response.json()
-                    self.user_id = user_data["user_id"]  # Update user_id
-                    logger.info(f"Detected user {self.user_id} from account {account_number}")
-                    return user_data
-                return None
+            response = await self._request(
+                "GET", f"/api/accounts/{account_number}/user", "user_by_account"
+            )
+            if response.status_code == 200:
+                user_data = response.json()
+                if user_data["user_id"] != self.user_id:
+                    self.invalidate_profile()
+                    self.last_snapshot = None
+                self.user_id = user_data["user_id"]  # Update user_id
+                logger.info(
+                    f"Detected user {self.user_id} from account {account_number}"
+                )
+                return user_data
+            return None
         except Exception as e:
             logger.error(f"Error finding user by account: {e}")
             return None
-    
+
+    async def fetch_many(
+        self, fields: Sequence[str], account_number: Optional[str] = None
+    ) -> Optional[dict[str, Any]]:
+        """
+        Several resources for the caller in one round-trip via /api/batch, e.g.
+        fetch_many(["accounts", "bills"]). With account_number the caller is
+        identified in the same request (as get_user_by_account would).
+        Returns {field: data} or None on failure.
+        """
+        params = {"fields": ",".join(fields)}
+        if account_number is not None:
+            params["account_number"] = account_number
+        else:
+            self._require_user_id()
+            params["user_id"] = self.user_id
+        try:
+            response = await self._request("GET", "/api/batch", "batch", params=params)
+            if response.status_code != 200:
+                return None
+            batch = response.json()
+            if account_number is not None:
+                if batch["user_id"] != self.user_id:
+                    self.invalidate_profile()
+                    self.last_snapshot = None
+                self.user_id = batch["user_id"]
+            return batch
+        except Exception as e:
+            logger.error(f"Error fetching {', '.join(fields)}: {e}")
+            return None
+
     def _require_user_id(self) -> None:
         """Raise error if user_id is not set"""
         if self.user_id is None:
-            raise ValueError("user_id must be set before making user-specific API calls. Call get_user_by_account() or set_user_id() first.")
-        
-    async def get_accounts(self) -> List[Dict]:
+            raise ValueError(
+                "user_id must be set before making user-specific API calls. Call get_user_by_account() or set_user_id() first."
+            )
+
+    async def get_accounts(self) -> list[dict]:
         """Get all accounts for user"""
         self._require_user_id()
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(f"{self.base_url}/api/users/{self.user_id}/accounts")
-                if response.status_code == 200:
-                    return response.json()["accounts"]
-                return []
+            response = await self._request(
+                "GET", f"/api/users/{self.user_id}/accounts", "accounts"
+            )
+            if response.status_code == 200:
+                return response.json()["accounts"]
+            return []
         except Exception as e:
             logger.error(f"Error getting accounts: {e}")
             return []
-    
-    async def get_balance(self, account_number: str) -> Optional[Dict]:
+
+    async def get_balance(self, account_number: str) -> Optional[dict]:
         """Get balance for specific account. Auto-detects user if not set."""
         # Auto-detect user from account if not already set
         if self.user_id is None:
             await self.get_user_by_account(account_number)
-        
+
         try:
-            async with httpx.AsyncClient() as client:
-                # user_id is optional for balance endpoint, but we include it if available
-                params = {}
-                if self.user_id:
-                    params["user_id"] = self.user_id
-                response = await client.get(
-                    f"{self.base_url}/api/accounts/{account_number}/balance",
-                    params=params
-                )
-                if response.status_code == 200:
-                    return response.json()
-                return None
+            # user_id is optional for balance endpoint, but we include it if available
+            params = {}
+            if self.user_id:
+                params["user_id"] = self.user_id
+            response = await self._request(
+                "GET",
+                f"/api/accounts/{account_number}/balance",
+                "balance",
+                params=params,
+            )
+            if response.status_code == 200:
+                return response.json()
+            return None
         except Exception as e:
             logger.error(f"Error getting balance: {e}")
             return None
-    
-    async def get_transactions(self, limit: int = 10) -> List[Dict]:
-        """Get recent transactions"""
+
+    async def get_transactions(
+        self,
+        limit: int = 10,
+        start: Optional[str] = None,
+        end: Optional[str] = None,
+        category: Optional[str] = None,
+    ) -> list[dict]:
+        """Get the most recent transactions, optionally filtered by date range (ISO dates, end exclusive) and category"""
         self._require_user_id()
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(
-                    f"{self.base_url}/api/users/{self.user_id}/transactions",
-                    params={"limit": limit}
-                )
-                if response.status_code == 200:
-                    return response.json()["transactions"]
-                return []
+            transactions, _ = await self._transactions_page(limit, start, end, category)
+            return transactions
         except Exception as e:
             logger.error(f"Error getting transactions: {e}")
             return []
-    
-    async def get_bills(self) -> List[Dict]:
+
+    async def iter_transactions(
+        self,
+        start: Optional[str] = None,
+        end: Optional[str] = None,
+        category: Optional[str] = None,
+        page_size: int = 50,
+    ) -> AsyncIterator[dict]:
+        """
+        Every matching transaction, newest first, fetched one page at a time by
+        following the server's cursors, so long histories are never held in memory
+        """
+        self._require_user_id()
+        cursor = None
+        while True:
+            try:
+                page, cursor = await self._transactions_page(
+                    page_size, start, end, category, cursor
+                )
+            except Exception as e:
+                logger.error(f"Error paging transactions: {e}")
+                return
+            for txn in page:
+                yield txn
+            if cursor is None:
+                return
+
+    async def _transactions_page(
+        self,
+        limit: int,
+        start: Optional[str],
+        end: Optional[str],
+        category: Optional[str],
+        cursor: Optional[str] = None,
+    ) -> tuple[list[dict], Optional[str]]:
+        params = {
+            "limit": limit,
+            "start": start,
+            "end": end,
+            "category": category,
+            "cursor": cursor,
+        }
+        response = await self._request(
+            "GET",
+            f"/api/users/{self.user_id}/transactions",
+            "transactions",
+            params={k: v for k, v in params.items() if v is not None},
+        )
+        response.raise_for_status()
+        body = response.json()
+        return body["transactions"], body.get("next_cursor")
+
+    async def get_bills(self) -> list[dict]:
         """Get pending bills"""
         self._require_user_id()
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(f"{self.base_url}/api/users/{self.user_id}/bills")
-                if response.status_code == 200:
-                    return response.json()["bills"]
-                return []
+            response = await self._request(
+                "GET", f"/api/users/{self.user_id}/bills", "bills"
+            )
+            if response.status_code == 200:
+                return response.json()["bills"]
+            return []
         except Exception as e:
             logger.error(f"Error getting bills: {e}")
             return []
-    
-    async def get_contacts(self) -> List[Dict]:
+
+    async def get_contacts(self) -> list[dict]:
         """Get saved contacts"""
         self._require_user_id()
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(f"{self.base_url}/api/users/{self.user_id}/contacts")
-                if response.status_code == 200:
-                    return response.json()["contacts"]
-                return []
+            response = await self._request(
+                "GET", f"/api/users/{self.user_id}/contacts", "contacts"
+            )
+            if response.status_code == 200:
+                return response.json()["contacts"]
+            return []
         except Exception as e:
             logger.error(f"Error getting contacts: {e}")
             return []
-    
-    async def get_loans(self) -> List[Dict]:
-        """Get available loan products"""
+
+    async def get_loans(self) -> list[dict]:
+        """Get available loan products (served from the shared reference cache)"""
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(f"{self.base_url}/api/loans")
-                if response.status_code == 200:
-                    return response.json()["loan_products"]
-                return []
+            return await self._reference_cache.get_or_fetch("loans", self._fetch_loans)
         except Exception as e:
             logger.error(f"Error getting loans: {e}")
-            return []
-    
-    async def get_credit_limit(self) -> Optional[Dict]:
+            # Degraded: an expired catalogue beats no answer
+            return self._reference_cache.peek("loans") or []
+
+    async def get_credit_limit(self) -> Optional[dict]:
         """Get credit limit information"""
         self._require_user_id()
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(f"{self.base_url}/api/users/{self.user_id}/credit-limit")
-                if response.status_code == 200:
-                    return response.json()
-                return None
+            response = await self._request(
+                "GET", f"/api/users/{self.user_id}/credit-limit", "credit_limit"
+            )
+            if response.status_code == 200:
+                return response.json()
+            return None
         except Exception as e:
             logger.error(f"Error getting credit limit: {e}")
             return None
-    
-    async def get_interest_rates(self) -> Optional[Dict]:
-        """Get current interest rates"""
+
+    async def get_spending(
+        self,
+        group_by: str = "category",
+        start_month: Optional[str] = None,
+        end_month: Optional[str] = None,
+    ) -> Optional[dict]:
+        """Spending totals by category, month or counterparty over months (YYYY-MM, inclusive)"""
+        self._require_user_id()
+        params = {
+            "group_by": group_by,
+            "start_month": start_month,
+            "end_month": end_month,
+        }
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(f"{self.base_url}/api/interest-rates")
-                if response.status_code == 200:
-                    return response.json()["interest_rates"]
-                return None
+            response = await self._request(
+                "GET",
+                f"/api/users/{self.user_id}/spending",
+                "spending",
+                params={k: v for k, v in params.items() if v is not None},
+            )
+            if response.status_code == 200:
+                return response.json()
+            return None
         except Exception as e:
-            logger.error(f"Error getting interest rates: {e}")
+            logger.error(f"Error getting spending: {e}")
             return None
-    
-    async def transfer_money(self, from_account: str, to_contact: str, amount: float, pin: str) -> Optional[Dict]:
-        """Transfer money to contact"""
+
+    async def get_interest_rates(self) -> Optional[dict]:
+        """Get current interest rates (served from the shared reference cache)"""
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    f"{self.base_url}/api/transfer",
-                    json={
-                        "from_account": from_account,
-                        "to_contact": to_contact,
-                        "amount": amount,
-                        "pin": pin
-                    }
-                )
-                if response.status_code == 200:
-                    return response.json()
-                return None
+            return await self._reference_cache.get_or_fetch(
+                "interest_rates", self._fetch_interest_rates
+            )
         except Exception as e:
-            logger.error(f"Error transferring money: {e}")
-            return None
-    
-    async def pay_bill(self, account: str, biller: str, amount: float, pin: str) -> Optional[Dict]:
-        """Pay a bill"""
+            logger.error(f"Error getting interest rates: {e}")
+            return self._reference_cache.peek("interest_rates")
+
+    async def _fetch_loans(self) -> list[dict]:
+        # Raises on failure so errors are never cached
+        response = await self._request("GET", "/api/loans", "loans")
+        response.raise_for_status()
+        return response.json()["loan_products"]
+
+    async def _fetch_interest_rates(self) -> dict:
+        response = await self._request("GET", "/api/interest-rates", "interest_rates")
+        response.raise_for_status()
+        return response.json()["interest_rates"]
+
+    async def transfer_money(
+        self,
+        from_account: str,
+        to_contact: str,
+        amount: float,
+        pin: str,
+        idempotency_key: Optional[str] = None,
+    ) -> dict:
+        """
+        Transfer money to contact.
+
+        Raises PaymentRejectedError when the bank refuses it and PaymentOutcomeUnknownError
+        when it never answered; pass that exception's idempotency_key back in to
+        re-submit safely (the server applies each key at most once).
+        """
+        return await self._submit_payment(
+            "/api/transfer",
+            "transfer",
+            idempotency_key,
+            {
+                "from_account": from_account,
+                "to_contact": to_contact,
+                "amount": amount,
+                "pin": pin,
+            },
+        )
+
+    async def pay_bill(
+        self,
+        account: str,
+        biller: str,
+        amount: float,
+        pin: str,
+        idempotency_key: Optional[str] = None,
+    ) -> dict:
+        """Pay a bill. Raises and re-submits like transfer_money()."""
+        return await self._submit_payment(
+            "/api/pay-bill",
+            "pay_bill",
+            idempotency_key,
+            {"account": account, "biller": biller, "amount": amount, "pin": pin},
+        )
+
+    async def _submit_payment(
+        self, path: str, endpoint: str, idempotency_key: Optional[str], payload: dict
+    ) -> dict:
+        idempotency_key = idempotency_key or self.new_idempotency_key()
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    f"{self.base_url}/api/pay-bill",
-                    json={
-                        "account": account,
-                        "biller": biller,
-                        "amount": amount,
-                        "pin": pin
-                    }
-                )
-                if response.status_code == 200:
-                    return response.json()
-                return None
+            response = await self._request(
+                "POST",
+                path,
+                endpoint,
+                headers={"Idempotency-Key": idempotency_key},
+                json=payload,
+            )
         except Exception as e:
-            logger.error(f"Error paying bill: {e}")
-            return None
-    
+            # Transport errors after the last retry and open circuits alike:
+            # the request may have reached the bank
+            logger.error(
+                f"No answer for {endpoint} (idempotency key {idempotency_key}): {e!r}"
+            )
+            raise PaymentOutcomeUnknownError(idempotency_key, repr(e)) from e
+
+        if response.status_code == 200:
+            self.invalidate_profile()
+            return response.json()
+        if 400 <= response.status_code < 500 and response.status_code != 429:
+            try:
+                detail = str(response.json().get("detail", ""))
+            except ValueError:
+                detail = response.text
+            code = response.headers.get("X-Error-Code") or _REJECTION_CODES.get(
+                response.status_code, "rejected"
+            )
+            logger.warning(
+                f"{endpoint} rejected ({response.status_code} {code}): {detail}"
+            )
+            raise PaymentRejectedError(code, detail, response.status_code)
+        logger.error(
+            f"{endpoint} failed with HTTP {response.status_code} (idempotency key {idempotency_key})"
+        )
+        raise PaymentOutcomeUnknownError(
+            idempotency_key, f"HTTP {response.status_code}"
+        )
+
     async def check_api_health(self) -> bool:
         """Check if API is reachable"""
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(f"{self.base_url}/")
-                return response.status_code == 200
+            response = await self._request("GET", "/", "health", retries=0)
+            return response.status_code == 200
         except Exception as e:
             logger.error(f"API health check failed: {e}")
             return False
-
@@ -0,0 +1,654 @@
+"""
+Banking Tools
+Typed LLM function tools over one session's BankingAPIClient
+
+Each banking capability is a declared `function_tool` with its own schema. The
+registry resolves the caller's identity once per account number, shares a
+single in-flight call between identical tool invocations, and is the source
+of the tool names the response sanitizer strips from spoken replies. Results
+are returned as compact pipe-separated tables to keep prompt tokens low.
+Transfer and bill-payment targets are resolved against the caller's saved
+contacts and pending bills (any script, misspellings, "papa" for "Father")
+before any money moves.
+"""
+
+import asyncio
+import logging
+import time
+from collections.abc import Awaitable
+from typing import Any, Callable, Optional
+
+from livekit.agents import function_tool, llm
+
+from banking_api import (
+    BankingAPIClient,
+    PaymentOutcomeUnknownError,
+    PaymentRejectedError,
+)
+from context_budget import compact_table
+from name_index import NameIndex
+from turn_tracing import TurnTracer
+
+logger = logging.getLogger("banking-tools")
+
+
+def format_loans(loans: list[dict]) -> str:
+    # Loan rates are fixed; the column name says so
+    return compact_table(
+        ("type", "fixed_rate_pct_per_year", "max_inr", "tenure"),
+        (
+            (
+                loan["type"],
+                loan["interest_rate"],
+                loan["max_amount"],
+                f"{loan['min_tenure']}-{loan['max_tenure']} {loan['unit']}",
+            )
+            for loan in loans
+        ),
+    )
+
+
+def format_accounts(accounts: list[dict]) -> str:
+    return compact_table(
+        ("account", "type", "balance_inr"),
+        (
+            (acc["account_number"], acc["account_type"], f"{acc['balance']:.0f}")
+            for acc in accounts
+        ),
+    )
+
+
+def format_balance(balance_data: dict) -> str:
+    return f"Account {balance_data['account_number']}: ₹{balance_data['balance']:,.0f}"
+
+
+def format_transactions(transactions: list[dict]) -> str:
+    # Negative amounts are debits
+    return compact_table(
+        ("date", "inr", "description"),
+        (
+            (txn["timestamp"][:10], f"{txn['amount']:.0f}", txn["description"])
+            for txn in transactions
+        ),
+    )
+
+
+def format_transaction_search(
+    transactions: list[dict], matching: int, spent: float, received: float
+) -> str:
+    """Totals over every match, then the newest rows"""
+    totals = compact_table(
+        ("matching", "spent_inr", "received_inr"),
+        [(matching, f"{spent:.0f}", f"{received:.0f}")],
+    )
+    rows = format_transactions(transactions)
+    if matching > len(transactions):
+        rows += f"\n(+{matching - len(transactions)} older matches)"
+    return f"{totals}\n{rows}"
+
+
+def format_bills(bills: list[dict]) -> str:
+    return compact_table(
+        ("biller", "inr", "due"),
+        (
+            (bill["biller"], f"{bill['amount']:.0f}", bill["due_date"])
+            for bill in bills
+            if bill["status"] == "pending"
+        ),
+    )
+
+
+def format_contacts(contacts: list[dict]) -> str:
+    return ", ".join(c["name"] for c in contacts)
+
+
+def format_credit_limit(credit: dict) -> str:
+    return (
+        f"Credit limit ₹{credit['credit_limit']:,.0f}, used ₹{credit['credit_utilized']:,.0f}, "
+        f"available ₹{credit['credit_available']:,.0f}"
+    )
+
+
+def format_spending(spending: dict) -> str:
+    group_by = spending["group_by"]
+    table = compact_table(
+        (group_by, "spent_inr", "received_inr", "count"),
+        (
+            (g[group_by], f"{g['spent']:.0f}", f"{g['received']:.0f}", g["count"])
+            for g in spending["groups"]
+        ),
+    )
+    return (
+        f"{table}\ntotal|{spending['total_spent']:.0f}|{spending['total_received']:.0f}|"
+        if table
+        else ""
+    )
+
+
+def format_interest_rates(rates: dict) -> str:
+    return "\n".join(f"{name}: {rate}%" for name, rate in rates.items())
+
+
+# Data types that can be answered from a ProfileSnapshot in degraded mode
+PROFILE_FORMATTERS = {
+    "accounts": format_accounts,
+    "balance": format_balance,
+    "transactions": format_transactions,
+    "bills": format_bills,
+    "contacts": format_contacts,
+}
+
+# Newest matching rows listed for a filtered transaction search; totals cover all matches
+MAX_TRANSACTION_ROWS = 20
+
+IDENTIFY_PROMPT = "Please provide an account number so I can identify your accounts."
+
+# Replies for PaymentRejectedError codes; {moved} is "sent" or "debited"
+PAYMENT_REJECTIONS = {
+    "invalid_pin": "The PIN is incorrect. No money was {moved}. Ask the caller to enter their PIN again.",
+    "insufficient_funds": "The account does not have enough balance. No money was {moved}.",
+    "invalid_amount": "The amount must be more than zero. No money was {moved}.",
+    "amount_mismatch": "The amount does not match the bill's amount due. No money was {moved}.",
+    "account_not_found": "That account number was not found. No money was {moved}.",
+    "contact_not_found": "That contact is not saved. No money was {moved}.",
+    "bill_not_found": "There is no pending bill for that biller. No money was {moved}.",
+}
+
+UNCONFIRMED_PAYMENT = (
+    "The bank has not confirmed this {what} (reference {reference}), so it may or may not have gone through. "
+    "Do not say it failed. Tell the caller you are checking, then call this tool again with the same details: "
+    "it re-checks under the same reference and can never pay twice."
+)
+
+
+class BankingTools:
+    """LLM function tools bound to one caller's session client"""
+
+    def __init__(
+        self, banking_api: BankingAPIClient, tracer: Optional[TurnTracer] = None
+    ):
+        self.banking_api = banking_api
+        # Every banking call is timed as a "tool:<data type>" stage of the turn
+        self.tracer = tracer or TurnTracer()
+        # account_number -> user_id it resolved to, so each account is looked up once
+        self._identified: dict[str, str] = {}
+        self._inflight: dict[tuple[Any, ...], asyncio.Task] = {}
+        # Payment action -> idempotency key of an attempt the bank never answered
+        self._unconfirmed: dict[tuple[Any, ...], str] = {}
+        # "contacts"/"bills" -> (source list, index over it), rebuilt when the profile is refreshed
+        self._name_indexes: dict[str, tuple[list[dict], NameIndex]] = {}
+
+    @classmethod
+    def tool_names(cls) -> tuple[str, ...]:
+        """Names of every declared tool, e.g. for ResponseSanitizer"""
+        return tuple(
+            name for name, member in vars(cls).items() if llm.is_function_tool(member)
+        )
+
+    def function_tools(self) -> list[Any]:
+        """Bound tools to pass to Agent(tools=...)"""
+        return llm.find_function_tools(self)
+
+    async def _once(
+        self, key: tuple[Any, ...], factory: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        """Run factory once for concurrent identical calls; later callers share the result"""
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.create_task(factory())
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        else:
+            logger.debug(f"Joining in-flight call {key}")
+        # wait() rather than await: one cancelled caller must not cancel the shared call
+        with self.tracer.stage(f"tool:{key[0]}"):
+            await asyncio.wait({task})
+        return task.result()
+
+    async def identify(self, account_number: Optional[str]) -> bool:
+        """Resolve the caller from an account number (once per account); True once known"""
+        api = self.banking_api
+        known = self._identified.get(account_number) if account_number else None
+        if account_number and (known is None or known != api.user_id):
+            user = await self._once(
+                ("identify", account_number),
+                lambda: api.get_user_by_account(account_number),
+            )
+            if user:
+                self._identified[account_number] = user["user_id"]
+        if api.user_id is None:
+            return False
+        # Fan out for accounts, bills, transactions, contacts and credit limit so
+        # follow-up questions are answered from memory (no-op while fresh)
+        api.start_prefetch()
+        return True
+
+    async def _lookup(
+        self,
+        data_type: str,
+        account_number: Optional[str],
+        load: Callable[[], Awaitable[Optional[str]]],
+        needs_identity: bool = True,
+        arguments: tuple[Any, ...] = (),
+    ) -> str:
+        """Shared path of the read tools: identify, load, degrade gracefully"""
+
+        async def run() -> str:
+            try:
+                if needs_identity and not await self.identify(account_number):
+                    return IDENTIFY_PROMPT
+                formatted = await load()
+                if formatted is not None:
+                    return formatted
+                return self.degraded_answer(data_type, account_number)
+            except Exception as e:
+                logger.error(f"Error fetching {data_type}: {e}")
+                return self.degraded_answer(
+                    data_type, account_number, "Using fallback data due to API error"
+                )
+
+        return await self._once((data_type, account_number, *arguments), run)
+
+    def degraded_answer(
+        self,
+        data_type: str,
+        account_number: Optional[str],
+        fallback: str = "API data temporarily unavailable, using fallback data",
+    ) -> str:
+        """
+        Answer from the caller's last known profile while the backend is failing.
+        Only used when the endpoint's circuit is open or its last call failed, so a
+        genuinely empty result is never replaced with stale data.
+        """
+        snapshot = self.banking_api.last_snapshot
+        if (
+            snapshot is None
+            or data_type not in PROFILE_FORMATTERS
+            or self.banking_api.endpoint_healthy(data_type)
+        ):
+            return fallback
+        if data_type == "balance":
+            account = snapshot.find_account(account_number) if account_number else None
+            formatted = format_balance(account) if account else ""
+        else:
+            formatted = PROFILE_FORMATTERS[data_type](getattr(snapshot, data_type))
+        if not formatted:
+            return fallback
+        age_minutes = int((time.monotonic() - snapshot.fetched_at) // 60)
+        logger.warning(
+            f"Banking backend degraded, answering {data_type} from {age_minutes} min old snapshot"
+        )
+        return f"(Live data unavailable; last updated {age_minutes} minutes ago)\n{formatted}"
+
+    async def _name_index(self, data_type: str) -> NameIndex:
+        """Index over the caller's contacts or pending bills, from the prefetched profile when it has them"""
+        profile = await self.banking_api.get_profile()
+        if data_type == "contacts":
+            entries = (
+                profile.contacts
+                if profile and profile.contacts
+                else await self.banking_api.get_contacts()
+            )
+        else:
+            entries = (
+                profile.bills
+                if profile and profile.bills
+                else await self.banking_api.get_bills()
+            )
+        cached = self._name_indexes.get(data_type)
+        if cached is None or cached[0] is not entries:
+            if data_type == "contacts":
+                index = NameIndex((contact["name"], contact) for contact in entries)
+            else:
+                index = NameIndex(
+                    (bill["biller"], bill)
+                    for bill in entries
+                    if bill["status"] == "pending"
+                )
+            cached = self._name_indexes[data_type] = (entries, index)
+        return cached[1]
+
+    async def _resolve_name(
+        self, data_type: str, spoken: str
+    ) -> tuple[Optional[str], str]:
+        """
+        (saved name, "") for what the caller said, or (None, reply) when no saved
+        name or more than one matches. Passes the name through unchanged when
+        the caller is unknown or their contacts/bills cannot be fetched.
+        """
+        if self.banking_api.user_id is None:
+            return spoken, ""
+        label = "saved contact" if data_type == "contacts" else "pending bill"
+        try:
+            with self.tracer.stage("name_resolution"):
+                index = await self._name_index(data_type)
+                match = index.resolve(spoken)
+                candidates = index.search(spoken) if match is None else []
+        except Exception as e:
+            logger.error(f"Error resolving {label} {spoken!r}: {e}")
+            return spoken, ""
+        if len(index) == 0:
+            return spoken, ""
+        if match is not None:
+            if match.name != spoken:
+                logger.info(
+                    f"Resolved {label} {spoken!r} to {match.name!r} ({match.score})"
+                )
+            return match.name, ""
+        if candidates:
+            names = " or ".join(c.name for c in candidates)
+            return (
+                None,
+                f"More than one {label} matches {spoken}: {names}. Ask the caller which one.",
+            )
+        return (
+            None,
+            f"No {label} matches {spoken}. The caller has: {', '.join(index.names())}.",
+        )
+
+    # Read tools
+
+    @function_tool
+    async def get_accounts(self, account_number: str) -> str:
+        """
+        List all of the caller's accounts with their balances.
+
+        Args:
+            account_number: Any account number the caller has given
+        """
+
+        async def load() -> Optional[str]:
+            profile = await self.banking_api.get_profile()
+            accounts = (
+                profile.accounts
+                if profile and profile.accounts
+                else await self.banking_api.get_accounts()
+            )
+            return format_accounts(accounts) if accounts else None
+
+        return await self._lookup("accounts", account_number, load)
+
+    @function_tool
+    async def get_balance(self, account_number: str) -> str:
+        """
+        Get the current balance of one account.
+
+        Args:
+            account_number: The account number to check
+        """
+
+        async def load() -> Optional[str]:
+            # Accounts in the prefetched profile already carry balances
+            profile = await self.banking_api.get_profile()
+            balance_data = profile.find_account(account_number) if profile else None
+            if balance_data is None:
+                balance_data = await self.banking_api.get_balance(account_number)
+            return format_balance(balance_data) if balance_data else None
+
+        return await self._lookup("balance", account_number, load)
+
+    @function_tool
+    async def get_transactions(
+        self,
+        account_number: str,
+        category: Optional[str] = None,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+    ) -> str:
+        """
+        Get the caller's recent transactions, or search their full history. With
+        any filter, returns the number of matches and total spent and received,
+        then the newest matches.
+
+        Args:
+            account_number: Any account number the caller has given
+            category: Only this category: groceries, dining, utilities, mobile, transfer, entertainment, education, income or refund
+            start_date: Earliest date to include, YYYY-MM-DD
+            end_date: First date to exclude, YYYY-MM-DD (e.g. the 1st of the next month)
+        """
+        if category is None and start_date is None and end_date is None:
+
+            async def load() -> Optional[str]:
+                profile = await self.banking_api.get_profile()
+                transactions = (
+                    profile.transactions
+                    if profile and profile.transactions
+                    else await self.banking_api.get_transactions(limit=10)
+                )
+                return format_transactions(transactions) if transactions else None
+
+            return await self._lookup("transactions", account_number, load)
+
+        async def search() -> Optional[str]:
+            rows: list[dict] = []
+            matching, spent, received = 0, 0.0, 0.0
+            # Streams page by page; only the rows we list are kept
+            async for txn in self.banking_api.iter_transactions(
+                start_date, end_date, category and category.lower()
+            ):
+                matching += 1
+                if txn["amount"] < 0:
+                    spent -= txn["amount"]
+                else:
+                    received += txn["amount"]
+                if len(rows) < MAX_TRANSACTION_ROWS:
+                    rows.append(txn)
+            if matching == 0:
+                return (
+                    "No matching transactions."
+                    if self.banking_api.endpoint_healthy("transactions")
+                    else None
+                )
+            return format_transaction_search(rows, matching, spent, received)
+
+        return await self._lookup(
+            "transaction_search",
+            account_number,
+            search,
+            arguments=(category, start_date, end_date),
+        )
+
+    @function_tool
+    async def get_bills(self, account_number: str) -> str:
+        """
+        Get the caller's pending bills with amounts and due dates.
+
+        Args:
+            account_number: Any account number the caller has given
+        """
+
+        async def load() -> Optional[str]:
+            profile = await self.banking_api.get_profile()
+            bills = (
+                profile.bills
+                if profile and profile.bills
+                else await self.banking_api.get_bills()
+            )
+            if not bills and not self.banking_api.endpoint_healthy("bills"):
+                return None
+            return format_bills(bills) or "No pending bills."
+
+        return await self._lookup("bills", account_number, load)
+
+    @function_tool
+    async def get_contacts(self, account_number: str) -> str:
+        """
+        Get the caller's saved contacts they can send money to.
+
+        Args:
+            account_number: Any account number the caller has given
+        """
+
+        async def load() -> Optional[str]:
+            profile = await self.banking_api.get_profile()
+            contacts = (
+                profile.contacts
+                if profile and profile.contacts
+                else await self.banking_api.get_contacts()
+            )
+            if not contacts and not self.banking_api.endpoint_healthy("contacts"):
+                return None
+            return format_contacts(contacts) or "No saved contacts."
+
+        return await self._lookup("contacts", account_number, load)
+
+    @function_tool
+    async def get_credit_limit(self, account_number: str) -> str:
+        """
+        Get the caller's credit limit, amount used and amount available.
+
+        Args:
+            account_number: Any account number the caller has given
+        """
+
+        async def load() -> Optional[str]:
+            profile = await self.banking_api.get_profile()
+            credit = (
+                profile.credit_limit
+                if profile and profile.credit_limit
+                else await self.banking_api.get_credit_limit()
+            )
+            return format_credit_limit(credit) if credit else None
+
+        return await self._lookup("credit_limit", account_number, load)
+
+    @function_tool
+    async def get_spending(
+        self,
+        account_number: str,
+        group_by: str = "category",
+        start_month: Optional[str] = None,
+        end_month: Optional[str] = None,
+    ) -> str:
+        """
+        Get how much the caller spent and received, already totalled. Use this for
+        questions like "how much did I spend on utilities this month".
+
+        Args:
+            account_number: Any account number the caller has given
+            group_by: "category", "month" or "counterparty" (who the money went to)
+            start_month: First month to include, YYYY-MM
+            end_month: Last month to include, YYYY-MM
+        """
+
+        async def load() -> Optional[str]:
+            spending = await self.banking_api.get_spending(
+                group_by, start_month, end_month
+            )
+            if spending is None:
+                return None
+            return format_spending(spending) or "No transactions in this period."
+
+        return await self._lookup(
+            "spending",
+            account_number,
+            load,
+            arguments=(group_by, start_month, end_month),
+        )
+
+    @function_tool
+    async def get_loans(self) -> str:
+        """Get the bank's loan products with fixed interest rates, amounts and tenures."""
+
+        async def load() -> Optional[str]:
+            loans = await self.banking_api.get_loans()
+            return format_loans(loans) if loans else None
+
+        return await self._lookup("loans", None, load, needs_identity=False)
+
+    @function_tool
+    async def get_interest_rates(self) -> str:
+        """Get the bank's current deposit and loan interest rates."""
+
+        async def load() -> Optional[str]:
+            rates = await self.banking_api.get_interest_rates()
+            return format_interest_rates(rates) if rates else None
+
+        return await self._lookup("interest_rates", None, load, needs_identity=False)
+
+    async def _submit_payment(
+        self,
+        action: tuple[Any, ...],
+        submit: Callable[[Optional[str]], Awaitable[dict]],
+    ) -> str:
+        """
+        Run a money-moving call and say what actually happened. An attempt the
+        bank never answered keeps its idempotency key, so repeating the same
+        action re-checks it instead of paying again.
+        """
+        what, moved = (
+            ("transfer", "sent")
+            if action[0] == "transfer_money"
+            else ("bill payment", "debited")
+        )
+        try:
+            result = await self._once(
+                action, lambda: submit(self._unconfirmed.get(action))
+            )
+        except PaymentOutcomeUnknownError as e:
+            self._unconfirmed[action] = e.idempotency_key
+            return UNCONFIRMED_PAYMENT.format(
+                what=what, reference=e.idempotency_key[:8]
+            )
+        except PaymentRejectedError as e:
+            self._unconfirmed.pop(action, None)
+            reply = PAYMENT_REJECTIONS.get(e.code)
+            if reply is None:
+                return (
+                    f"The bank declined the {what}: {e.detail}. No money was {moved}."
+                )
+            return reply.format(moved=moved)
+        self._unconfirmed.pop(action, None)
+        return f"{result['message']}. Transaction ID {result['transaction_id']}."
+
+    # Write tools. Only call these after the caller confirmed and entered their PIN.
+
+    @function_tool
+    async def transfer_money(
+        self, from_account: str, to_contact: str, amount: float, pin: str
+    ) -> str:
+        """
+        Send money to one of the caller's saved contacts.
+
+        Args:
+            from_account: Account number to debit
+            to_contact: Contact name as the caller said it, in any script (e.g. "Anjali", "अंजली", "papa")
+            amount: Amount in rupees
+            pin: The PIN the caller typed
+        """
+        await self.identify(from_account)
+        to_contact, clarification = await self._resolve_name("contacts", to_contact)
+        if to_contact is None:
+            return f"{clarification} No money was sent."
+        action = ("transfer_money", from_account, to_contact, amount)
+        return await self._submit_payment(
+            action,
+            lambda key: self.banking_api.transfer_money(
+                from_account, to_contact, amount, pin, key
+            ),
+        )
+
+    @function_tool
+    async def pay_bill(
+        self, account_number: str, biller: str, amount: float, pin: str
+    ) -> str:
+        """
+        Pay one of the caller's pending bills.
+
+        Args:
+            account_number: Account number to debit
+            biller: Biller name as the caller said it, in any script (e.g. "BESCOM", "बिजली")
+            amount: Amount in rupees
+            pin: The PIN the caller typed
+        """
+        await self.identify(account_number)
+        biller, clarification = await self._resolve_name("bills", biller)
+        if biller is None:
+            return f"{clarification} No money was debited."
+        action = ("pay_bill", account_number, biller, amount)
+        return await self._submit_payment(
+            action,
+            lambda key: self.banking_api.pay_bill(
+                account_number, biller, amount, pin, key
+            ),
+        )
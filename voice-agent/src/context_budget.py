@@ -0,0 +1,240 @@
+"""
+Context Budget
+Per-turn token accounting and trimming of the chat context sent to the LLM
+
+Prompt tokens drive time-to-first-token on Groq and Gemini, and a voice call
+keeps growing its history. Before every LLM call the context is rebuilt from
+the full history: the few-shot example conversations are dropped once the
+call has turns of its own, turns older than `keep_turns` are collapsed into
+a one-line-per-message summary, and if the result is still over `max_tokens`
+older tool outputs are cut down and more turns are summarized. The agent's
+own chat history is never modified.
+"""
+
+import math
+from collections.abc import Iterable, Sequence
+from dataclasses import asdict, dataclass
+from typing import Any, Optional
+
+from livekit.agents import llm
+
+SUMMARY_HEADER = "Earlier in this call:"
+_SPEAKERS = {"user": "Caller", "assistant": "You"}
+
+
+def estimate_tokens(text: Optional[str]) -> int:
+    """
+    Tokenizer-free estimate: ~4 ASCII characters per token, ~2 per character
+    of Indic script (BPE vocabularies split those much more finely).
+    """
+    if not text:
+        return 0
+    ascii_chars = len(text.encode("ascii", "ignore"))
+    return math.ceil(ascii_chars / 4 + (len(text) - ascii_chars) / 2)
+
+
+def compact_table(columns: Sequence[str], rows: Iterable[Sequence[Any]]) -> str:
+    """Pipe-separated header plus one line per row; the cheapest layout LLMs read reliably"""
+    lines = ["|".join(columns)]
+    lines.extend("|".join(str(value) for value in row) for row in rows)
+    return "\n".join(lines) if len(lines) > 1 else ""
+
+
+def _item_text(item: Any) -> str:
+    if item.type == "message":
+        return item.text_content or ""
+    if item.type == "function_call":
+        return f"{item.name}({item.arguments})"
+    if item.type == "function_call_output":
+        return item.output
+    return ""
+
+
+def _is_user_message(item: Any) -> bool:
+    return item.type == "message" and item.role == "user"
+
+
+def _is_instruction(item: Any) -> bool:
+    return item.type == "message" and item.role in ("system", "developer")
+
+
+@dataclass
+class TurnTokens:
+    """Estimated prompt tokens of one LLM call, before and after trimming"""
+
+    tokens_before: int
+    tokens_after: int
+    instruction_tokens: int
+    tool_tokens: int
+    summarized_turns: int
+
+    def as_dict(self) -> dict[str, int]:
+        return asdict(self)
+
+
+@dataclass
+class ContextBudgetStats:
+    """Running totals across the turns of one call"""
+
+    turns: int = 0
+    tokens_before: int = 0
+    tokens_after: int = 0
+    over_budget: int = 0
+
+    @property
+    def saved_ratio(self) -> float:
+        return 1 - self.tokens_after / self.tokens_before if self.tokens_before else 0.0
+
+
+class ContextBudget:
+    """
+    Fits a chat context into a per-turn token budget.
+
+    - `examples`: text inside the instructions (few-shot conversations) that is
+      removed once the call has more than `examples_turns` caller turns.
+    - `keep_turns`: most recent caller turns kept verbatim; older ones are summarized.
+    - `max_tool_tokens`: cap applied to tool outputs of earlier turns when over budget.
+    """
+
+    def __init__(
+        self,
+        max_tokens: int = 2000,
+        keep_turns: int = 4,
+        examples: str = "",
+        examples_turns: int = 2,
+        max_tool_tokens: int = 120,
+        summary_chars: int = 100,
+    ):
+        self.max_tokens = max_tokens
+        self.keep_turns = keep_turns
+        self.examples = examples
+        self.examples_turns = examples_turns
+        self.max_tool_tokens = max_tool_tokens
+        self.summary_chars = summary_chars
+        self.stats = ContextBudgetStats()
+
+    def fit(self, chat_ctx: llm.ChatContext) -> tuple[llm.ChatContext, TurnTokens]:
+        """Trimmed copy of chat_ctx and its token accounting"""
+        items = list(chat_ctx.items)
+        tokens_before = sum(estimate_tokens(_item_text(item)) for item in items)
+
+        instructions = [item for item in items if _is_instruction(item)]
+        history = [item for item in items if not _is_instruction(item)]
+        turn_starts = [i for i, item in enumerate(history) if _is_user_message(item)]
+        if self.examples and len(turn_starts) > self.examples_turns:
+            instructions = [self._without_examples(item) for item in instructions]
+        instruction_tokens = sum(
+            estimate_tokens(_item_text(item)) for item in instructions
+        )
+
+        keep = min(self.keep_turns, len(turn_starts))
+        trim_tools = False
+        while True:
+            cut = turn_starts[-keep] if keep else 0
+            recent = history[cut:]
+            if trim_tools:
+                recent = self._shrink_tool_outputs(recent)
+            fitted = instructions + self._summary(history[:cut]) + recent
+            tokens_after = sum(estimate_tokens(_item_text(item)) for item in fitted)
+            if tokens_after <= self.max_tokens or keep <= 1:
+                break
+            # Cheapest first: cut old tool outputs, then summarize one more turn
+            if trim_tools:
+                keep -= 1
+            trim_tools = True
+
+        self.stats.turns += 1
+        self.stats.tokens_before += tokens_before
+        self.stats.tokens_after += tokens_after
+        if tokens_after > self.max_tokens:
+            self.stats.over_budget += 1
+        turn = TurnTokens(
+            tokens_before=tokens_before,
+            tokens_after=tokens_after,
+            instruction_tokens=instruction_tokens,
+            tool_tokens=sum(
+                estimate_tokens(item.output)
+                for item in fitted
+                if item.type == "function_call_output"
+            ),
+            summarized_turns=len(turn_starts) - keep,
+        )
+        return llm.ChatContext(fitted), turn
+
+    def _without_examples(self, item: Any) -> Any:
+        text = item.text_content or ""
+        if self.examples not in text:
+            return item
+        return item.model_copy(
+            update={"content": [text.replace(self.examples, "").rstrip()]}
+        )
+
+    def _summary(self, items: list[Any]) -> list[Any]:
+        """One system message with a line per earlier caller/agent message"""
+        lines = []
+        for item in items:
+            speaker = (
+                _SPEAKERS.get(getattr(item, "role", None))
+                if item.type == "message"
+                else None
+            )
+            text = " ".join((item.text_content or "").split()) if speaker else ""
+            if not text:
+                # Tool calls are dropped; the reply that used them is kept
+                continue
+            if len(text) > self.summary_chars:
+                text = text[: self.summary_chars].rstrip() + "..."
+            lines.append(f"{speaker}: {text}")
+        # Long calls keep only the most recent lines, within a quarter of the budget
+        kept, used = [], estimate_tokens(SUMMARY_HEADER)
+        for line in reversed(lines):
+            used += estimate_tokens(line)
+            if used > self.max_tokens // 4:
+                break
+            kept.append(line)
+        if not kept:
+            return []
+        return [
+            llm.ChatMessage(
+                role="system", content=["\n".join([SUMMARY_HEADER, *kept[::-1]])]
+            )
+        ]
+
+    def _shrink_tool_outputs(self, items: list[Any]) -> list[Any]:
+        """Cap tool outputs of earlier turns; the current turn's are left whole"""
+        last_turn = max(
+            (i for i, item in enumerate(items) if _is_user_message(item)), default=0
+        )
+        shrunk = []
+        for i, item in enumerate(items):
+            if i < last_turn and item.type == "function_call_output":
+                output = self._truncate(item.output)
+                if output != item.output:
+                    item = item.model_copy(update={"output": output})
+            shrunk.append(item)
+        return shrunk
+
+    def _truncate(self, output: str) -> str:
+        lines = output.splitlines()
+        kept, used = [], 0
+        for line in lines:
+            used += estimate_tokens(line)
+            if used > self.max_tool_tokens and kept:
+                break
+            kept.append(line)
+        if len(kept) == len(lines):
+            return output
+        return "\n".join([*kept, f"(+{len(lines) - len(kept)} more rows)"])
+
+    def metrics(self) -> dict[str, Any]:
+        """Snapshot of token totals for this call"""
+        turns = self.stats.turns
+        return {
+            "turns": turns,
+            "avg_tokens_before": round(self.stats.tokens_before / turns)
+            if turns
+            else 0,
+            "avg_tokens_after": round(self.stats.tokens_after / turns) if turns else 0,
+            "saved_ratio": round(self.stats.saved_ratio, 3),
+            "over_budget": self.stats.over_budget,
+        }
@@ -0,0 +1,341 @@
+"""
+Intent Router
+Deterministic fast path for the most frequent read-only requests (balance,
+pending bills, loan rates) in the ten languages the agent supports
+
+Runs on the STT transcript before the LLM. A single compiled keyword grammar
+finds the intent, a number grammar (ASCII and Indic digits) finds the account
+number, and answers are rendered from per-language templates. Anything that
+is ambiguous, mentions an action (pay, send, transfer) or is long and
+conversational returns None so the LLM handles it.
+"""
+
+import re
+from dataclasses import dataclass, field
+from typing import Optional
+
+from language_detection import detect_language
+
+# Keywords per intent. ASCII entries (English and romanized Hindi) match whole
+# words; Indic entries are stems matched as substrings so inflections still hit.
+INTENT_KEYWORDS: dict[str, list[str]] = {
+    "balance": [
+        "balance",
+        "बैलेंस",
+        "शेष राशि",
+        "బ్యాలెన్స్",
+        "నిల్వ",
+        "இருப்பு",
+        "பேலன்ஸ்",
+        "ಬ್ಯಾಲೆನ್ಸ್",
+        "ಶಿಲ್ಕು",
+        "ബാലൻസ്",
+        "ബാക്കി തുക",
+        "ব্যালেন্স",
+        "ব্যালান্স",
+        "બેલેન્સ",
+        "બૅલેન્સ",
+        "ਬੈਲੈਂਸ",
+        "ਬੈਲੇਂਸ",
+        "ବାଲାନ୍ସ",
+        "ବ୍ୟାଲେନ୍ସ",
+    ],
+    "bills": [
+        "bill",
+        "bills",
+        "dues",
+        "बिल",
+        "బిల్లు",
+        "బిల్",
+        "பில்",
+        "ಬಿಲ್",
+        "ബിൽ",
+        "বিল",
+        "બિલ",
+        "ਬਿੱਲ",
+        "ਬਿਲ",
+        "ବିଲ",
+    ],
+    # A loan word is required: "interest rate" alone is as likely to be about
+    # a fixed deposit or savings account, which the loan template would misstate
+    "loans": [
+        "loan",
+        "loans",
+        "लोन",
+        "ऋण",
+        "లోన్",
+        "రుణ",
+        "கடன்",
+        "லோன்",
+        "ಸಾಲ",
+        "ಲೋನ್",
+        "ലോൺ",
+        "വായ്പ",
+        "লোন",
+        "ঋণ",
+        "લોન",
+        "ધિરાણ",
+        "ਲੋਨ",
+        "ਕਰਜ਼",
+        "ଲୋନ",
+        "ଋଣ",
+    ],
+}
+
+# Words that pull a matched request away from its template: spending and
+# history ("how much did I spend on bills last month") or deposits ("FD
+# interest"). Each one found halves the confidence.
+COMPETING_SIGNALS = [
+    "spend",
+    "spent",
+    "spending",
+    "expense",
+    "expenses",
+    "month",
+    "months",
+    "last",
+    "history",
+    "deposit",
+    "deposits",
+    "fd",
+    "fixed",
+    "recurring",
+    "rd",
+    "kharch",
+    "mahine",
+    "खर्च",
+    "महीने",
+    "महीना",
+    "पिछले",
+    "जमा",
+    "एफडी",
+    "सावधि",
+    "ఖర్చు",
+    "నెల",
+    "డిపాజిట్",
+    "செலவ",
+    "மாத",
+    "வைப்பு",
+    "டெபாசிட்",
+    "ಖರ್ಚು",
+    "ತಿಂಗಳ",
+    "ಠೇವಣಿ",
+    "ചെലവ",
+    "മാസ",
+    "നിക്ഷേപ",
+    "খরচ",
+    "মাস",
+    "জমা",
+    "ખર્ચ",
+    "મહિન",
+    "થાપણ",
+    "ਖਰਚ",
+    "ਮਹੀਨ",
+    "ਜਮ੍ਹਾ",
+    "ଖର୍ଚ୍ଚ",
+    "ମାସ",
+    "ଜମା",
+]
+
+# Actions, questions about causes and negations need the LLM
+DISQUALIFIERS = [
+    "pay",
+    "send",
+    "transfer",
+    "why",
+    "not",
+    "apply",
+    "change",
+    "cancel",
+    "bhej",
+    "bhejo",
+    "bharo",
+    "bharna",
+    "भेज",
+    "भुगतान",
+    "ट्रांसफर",
+    "क्यों",
+    "नहीं",
+    "చెల్లించ",
+    "పంప",
+    "ఎందుకు",
+    "செலுத்த",
+    "அனுப்ப",
+    "ஏன்",
+    "ಪಾವತಿ",
+    "ಕಳುಹಿಸ",
+    "ಏಕೆ",
+    "അടയ്ക്ക",
+    "അയയ്ക്ക",
+    "എന്തുകൊണ്ട്",
+    "পাঠা",
+    "পরিশোধ",
+    "কেন",
+    "મોકલ",
+    "ચૂકવ",
+    "કેમ",
+    "ਭੇਜ",
+    "ਭੁਗਤਾਨ",
+    "ਕਿਉਂ",
+    "ପଠା",
+    "ପୈଠ",
+    "କାହିଁକି",
+]
+
+# Confidence of a single keyword hit in a short transcript; each further hit
+# of the same intent and an account number add SPECIFICITY_STEP
+BASE_CONFIDENCE = 0.85
+SPECIFICITY_STEP = 0.05
+# Transcripts longer than this are usually conversational, not a lookup;
+# every extra word costs LENGTH_PENALTY
+MAX_FAST_PATH_WORDS = 6
+LENGTH_PENALTY = 0.03
+
+# Indic digit blocks start at these codepoints (Devanagari ... Malayalam)
+_DIGIT_ZEROS = (0x0966, 0x09E6, 0x0A66, 0x0AE6, 0x0B66, 0x0BE6, 0x0C66, 0x0CE6, 0x0D66)
+_DIGITS = {zero + d: str(d) for zero in _DIGIT_ZEROS for d in range(10)}
+# STT often spells account numbers out digit by digit ("4 4 2 1")
+_SPACED_DIGITS = re.compile(r"(?<=\d)[\s-](?=\d)")
+_ACCOUNT_NUMBER = re.compile(r"(?<!\d)\d{4,12}(?!\d)")
+
+
+def _keyword_pattern(keyword: str) -> str:
+    escaped = re.escape(keyword)
+    return rf"\b{escaped}\b" if keyword.isascii() else escaped
+
+
+_INTENTS = re.compile(
+    "|".join(
+        f"(?P<{intent}>{'|'.join(_keyword_pattern(k) for k in keywords)})"
+        for intent, keywords in INTENT_KEYWORDS.items()
+    ),
+    re.IGNORECASE,
+)
+_DISQUALIFIER = re.compile(
+    "|".join(_keyword_pattern(k) for k in DISQUALIFIERS), re.IGNORECASE
+)
+_COMPETING = re.compile(
+    "|".join(_keyword_pattern(k) for k in COMPETING_SIGNALS), re.IGNORECASE
+)
+
+
+@dataclass
+class Intent:
+    """A routed request: intent name, extracted slots and routing confidence"""
+
+    name: str
+    language: str
+    confidence: float
+    slots: dict[str, str] = field(default_factory=dict)
+
+
+def extract_account_number(text: str) -> Optional[str]:
+    """First 4-12 digit number in text, accepting Indic digits and spaced-out digits"""
+    digits = _SPACED_DIGITS.sub("", text.translate(_DIGITS))
+    match = _ACCOUNT_NUMBER.search(digits)
+    return match.group() if match else None
+
+
+def route_intent(text: str) -> Optional[Intent]:
+    """Classify a transcript, or return None when only the LLM should answer it"""
+    if not text or _DISQUALIFIER.search(text):
+        return None
+    hits = [match.lastgroup for match in _INTENTS.finditer(text)]
+    if len(set(hits)) != 1:
+        return None
+
+    slots = {}
+    account_number = extract_account_number(text)
+    if account_number is not None:
+        slots["account_number"] = account_number
+    # Specific: repeated intent words, an account number. Less so: extra words, competing topics.
+    confidence = min(1.0, BASE_CONFIDENCE + SPECIFICITY_STEP * (len(hits) + len(slots)))
+    confidence -= LENGTH_PENALTY * max(0, len(text.split()) - MAX_FAST_PATH_WORDS)
+    confidence *= 0.5 ** len(_COMPETING.findall(text))
+    return Intent(
+        hits[0], detect_language(text).language, round(max(0.0, confidence), 3), slots
+    )
+
+
+# Answer templates
+
+RUPEES = {
+    "en-IN": "rupees",
+    "hi-IN": "रुपये",
+    "te-IN": "రూపాయలు",
+    "ta-IN": "ரூபாய்",
+    "kn-IN": "ರೂಪಾಯಿ",
+    "ml-IN": "രൂപ",
+    "bn-IN": "টাকা",
+    "gu-IN": "રૂપિયા",
+    "pa-IN": "ਰੁਪਏ",
+    "od-IN": "ଟଙ୍କା",
+}
+
+TEMPLATES: dict[str, dict[str, str]] = {
+    "balance": {
+        "en-IN": "Your account {account} has {balance} rupees.",
+        "hi-IN": "आपके खाते {account} में {balance} रुपये हैं।",
+        "te-IN": "మీ ఖాతా {account} లో {balance} రూపాయలు ఉన్నాయి.",
+        "ta-IN": "உங்கள் கணக்கு {account} இல் {balance} ரூபாய் உள்ளது.",
+        "kn-IN": "ನಿಮ್ಮ ಖಾತೆ {account} ನಲ್ಲಿ {balance} ರೂಪಾಯಿ ಇದೆ.",
+        "ml-IN": "നിങ്ങളുടെ അക്കൗണ്ട് {account} ൽ {balance} രൂപ ഉണ്ട്.",
+        "bn-IN": "আপনার অ্যাকাউন্ট {account} এ {balance} টাকা আছে।",
+        "gu-IN": "તમારા ખાતા {account} માં {balance} રૂપિયા છે.",
+        "pa-IN": "ਤੁਹਾਡੇ ਖਾਤੇ {account} ਵਿੱਚ {balance} ਰੁਪਏ ਹਨ।",
+        "od-IN": "ଆପଣଙ୍କ ଖାତା {account} ରେ {balance} ଟଙ୍କା ଅଛି।",
+    },
+    "bills": {
+        "en-IN": "Your pending bills are: {items}.",
+        "hi-IN": "आपके बकाया बिल: {items}।",
+        "te-IN": "మీ బకాయి బిల్లులు: {items}.",
+        "ta-IN": "உங்கள் நிலுவை கட்டணங்கள்: {items}.",
+        "kn-IN": "ನಿಮ್ಮ ಬಾಕಿ ಬಿಲ್‌ಗಳು: {items}.",
+        "ml-IN": "നിങ്ങളുടെ അടയ്ക്കാനുള്ള ബില്ലുകൾ: {items}.",
+        "bn-IN": "আপনার বকেয়া বিল: {items}।",
+        "gu-IN": "તમારા બાકી બિલ: {items}.",
+        "pa-IN": "ਤੁਹਾਡੇ ਬਕਾਇਆ ਬਿੱਲ: {items}।",
+        "od-IN": "ଆପଣଙ୍କ ବକେୟା ବିଲ୍: {items}।",
+    },
+    "loans": {
+        "en-IN": "Current annual loan interest rates: {items}.",
+        "hi-IN": "मौजूदा सालाना लोन ब्याज दरें: {items}।",
+        "te-IN": "ప్రస్తుత వార్షిక లోన్ వడ్డీ రేట్లు: {items}.",
+        "ta-IN": "தற்போதைய ஆண்டு கடன் வட்டி விகிதங்கள்: {items}.",
+        "kn-IN": "ಪ್ರಸ್ತುತ ವಾರ್ಷಿಕ ಸಾಲದ ಬಡ್ಡಿ ದರಗಳು: {items}.",
+        "ml-IN": "നിലവിലെ വാർഷിക ലോൺ പലിശ നിരക്കുകൾ: {items}.",
+        "bn-IN": "বর্তমান বার্ষিক লোনের সুদের হার: {items}।",
+        "gu-IN": "હાલના વાર્ષિક લોન વ્યાજ દરો: {items}.",
+        "pa-IN": "ਮੌਜੂਦਾ ਸਾਲਾਨਾ ਲੋਨ ਵਿਆਜ ਦਰਾਂ: {items}।",
+        "od-IN": "ବର୍ତ୍ତମାନର ବାର୍ଷିକ ଲୋନ୍ ସୁଧ ହାର: {items}।",
+    },
+}
+
+
+def _template(intent: str, language: str) -> str:
+    templates = TEMPLATES[intent]
+    return templates.get(language, templates["en-IN"])
+
+
+def render_balance(language: str, account: dict) -> str:
+    return _template("balance", language).format(
+        account=account["account_number"], balance=f"{account['balance']:,.0f}"
+    )
+
+
+def render_bills(language: str, bills: list[dict]) -> Optional[str]:
+    """Pending bills, or None when there are none (the LLM phrases that better)"""
+    rupees = RUPEES.get(language, RUPEES["en-IN"])
+    items = [
+        f"{bill['biller']} {bill['amount']:,.0f} {rupees}"
+        for bill in bills
+        if bill["status"] == "pending"
+    ]
+    if not items:
+        return None
+    return _template("bills", language).format(items=", ".join(items))
+
+
+def render_loans(language: str, loans: list[dict]) -> str:
+    items = ", ".join(f"{loan['type']} {loan['interest_rate']}%" for loan in loans)
+    return _template("loans", language).format(items=items)
@@ -0,0 +1,111 @@
+"""
+Language Detection
+Single-pass script classifier for committed user transcripts
+
+Counts every character once (collections.Counter runs in C), then maps only
+the distinct characters through a precomputed codepoint -> script table, so
+cost no longer grows with the number of scripts supported. Mixed input picks
+an Indic script over Latin once it is a small share of the letters: callers
+speaking Hindi still say "balance", "account" and "please", which are
+transcribed in Latin letters. Among Indic scripts the one with most letters wins.
+"""
+
+from collections import Counter
+from dataclasses import dataclass, field
+
+# (script, first codepoint, last codepoint, language code)
+SCRIPTS: list[tuple[str, int, int, str]] = [
+    ("devanagari", 0x0900, 0x097F, "hi-IN"),
+    ("bengali", 0x0980, 0x09FF, "bn-IN"),
+    ("gurmukhi", 0x0A00, 0x0A7F, "pa-IN"),
+    ("gujarati", 0x0A80, 0x0AFF, "gu-IN"),
+    ("odia", 0x0B00, 0x0B7F, "od-IN"),
+    ("tamil", 0x0B80, 0x0BFF, "ta-IN"),
+    ("telugu", 0x0C00, 0x0C7F, "te-IN"),
+    ("kannada", 0x0C80, 0x0CFF, "kn-IN"),
+    ("malayalam", 0x0D00, 0x0D7F, "ml-IN"),
+]
+LATIN = "latin"
+DEFAULT_LANGUAGE = "en-IN"
+# Share of letters an Indic script needs to win over Latin in mixed input
+MIN_INDIC_SHARE = 0.15
+
+LANGUAGE_NAMES = {
+    "hi-IN": "Hindi",
+    "te-IN": "Telugu",
+    "gu-IN": "Gujarati",
+    "ta-IN": "Tamil",
+    "kn-IN": "Kannada",
+    "ml-IN": "Malayalam",
+    "bn-IN": "Bengali",
+    "pa-IN": "Punjabi",
+    "od-IN": "Odia",
+    "en-IN": "English",
+}
+
+SCRIPT_LANGUAGES: dict[str, str] = {
+    script: language for script, _, _, language in SCRIPTS
+}
+SCRIPT_LANGUAGES[LATIN] = DEFAULT_LANGUAGE
+
+
+def _build_script_table() -> dict[str, str]:
+    table = {
+        chr(cp): script
+        for script, first, last, _ in SCRIPTS
+        for cp in range(first, last + 1)
+    }
+    # Indic danda punctuation lives in the Devanagari block but is shared by
+    # every script, so it must not count as Hindi
+    for danda in ("।", "॥"):
+        del table[danda]
+    for letter in "abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ":
+        table[letter] = LATIN
+    return table
+
+
+_SCRIPT_OF = _build_script_table()
+
+
+@dataclass
+class LanguageDetection:
+    """Result of classifying one transcript"""
+
+    language: str
+    script: str
+    counts: dict[str, int] = field(default_factory=dict)
+    scores: dict[str, float] = field(default_factory=dict)
+
+    @property
+    def confidence(self) -> float:
+        """Share of the transcript's letters written in the chosen script"""
+        return self.scores.get(self.script, 0.0)
+
+    @property
+    def language_name(self) -> str:
+        return LANGUAGE_NAMES.get(self.language, "English")
+
+
+def detect_language(text: str) -> LanguageDetection:
+    """Classify text by its Indic script, or Latin when no Indic script reaches MIN_INDIC_SHARE"""
+    counts: dict[str, int] = {}
+    for char, n in Counter(text).items():
+        script = _SCRIPT_OF.get(char)
+        if script is not None:
+            counts[script] = counts.get(script, 0) + n
+    if not counts:
+        return LanguageDetection(DEFAULT_LANGUAGE, LATIN)
+
+    total = sum(counts.values())
+    indic = [s for s in counts if s != LATIN and counts[s] / total >= MIN_INDIC_SHARE]
+    script = (
+        max(indic, key=counts.__getitem__)
+        if indic
+        else max(counts, key=counts.__getitem__)
+    )
+    return LanguageDetection(
+        language=SCRIPT_LANGUAGES[script],
+        script=script,
+        counts=counts,
+        scores={s: n / total for s, n in counts.items()},
+    )
@@ -0,0 +1,491 @@
+"""
+Name Index
+Resolves a spoken contact or biller name, in any supported script, to the
+caller's saved entry without an LLM round-trip
+
+Every name is reduced to the same phonetic key whatever script it was written
+in: Indic text is transliterated through one table shared by all nine scripts
+(their Unicode blocks keep the same layout), then spellings that sound alike
+are folded together (aspirates, sibilants, long vowels, doubled letters, a
+trailing schwa). "Anjali", "Anjalee" and "अंजली" share a key. Entries are
+matched on the whole name, on single words ("Anjali" for "Anjali Verma"), on
+relation and utility aliases ("papa" for "Father", "bijli" for
+"Electricity" or for a known electricity board such as "BESCOM"), on a
+consonant skeleton that ignores vowel spelling, and
+finally on character trigram overlap for near misses. Keys are computed once
+per entry, so a lookup over a caller's contacts takes microseconds.
+"""
+
+import re
+import unicodedata
+from collections.abc import Iterable
+from dataclasses import dataclass
+from typing import Generic, Optional, TypeVar
+
+from language_detection import SCRIPTS
+
+T = TypeVar("T")
+
+# Offsets within each Indic block (the layout follows Devanagari in all nine)
+_VOWELS = {
+    0x05: "a",
+    0x06: "aa",
+    0x07: "i",
+    0x08: "ii",
+    0x09: "u",
+    0x0A: "uu",
+    0x0B: "ri",
+    0x0C: "li",
+    0x0D: "e",
+    0x0E: "e",
+    0x0F: "e",
+    0x10: "ai",
+    0x11: "o",
+    0x12: "o",
+    0x13: "o",
+    0x14: "au",
+    0x60: "ri",
+    0x61: "li",
+}
+_CONSONANTS = {
+    0x15: "k",
+    0x16: "kh",
+    0x17: "g",
+    0x18: "gh",
+    0x19: "ng",
+    0x1A: "ch",
+    0x1B: "chh",
+    0x1C: "j",
+    0x1D: "jh",
+    0x1E: "ny",
+    0x1F: "t",
+    0x20: "th",
+    0x21: "d",
+    0x22: "dh",
+    0x23: "n",
+    0x24: "t",
+    0x25: "th",
+    0x26: "d",
+    0x27: "dh",
+    0x28: "n",
+    0x29: "n",
+    0x2A: "p",
+    0x2B: "ph",
+    0x2C: "b",
+    0x2D: "bh",
+    0x2E: "m",
+    0x2F: "y",
+    0x30: "r",
+    0x31: "r",
+    0x32: "l",
+    0x33: "l",
+    0x34: "zh",
+    0x35: "v",
+    0x36: "sh",
+    0x37: "sh",
+    0x38: "s",
+    0x39: "h",
+    # Nukta letters
+    0x58: "q",
+    0x59: "kh",
+    0x5A: "g",
+    0x5B: "z",
+    0x5C: "r",
+    0x5D: "rh",
+    0x5E: "f",
+    0x5F: "y",
+}
+_MATRAS = {
+    0x3E: "aa",
+    0x3F: "i",
+    0x40: "ii",
+    0x41: "u",
+    0x42: "uu",
+    0x43: "ri",
+    0x44: "rii",
+    0x45: "e",
+    0x46: "e",
+    0x47: "e",
+    0x48: "ai",
+    0x49: "o",
+    0x4A: "o",
+    0x4B: "o",
+    0x4C: "au",
+    0x62: "li",
+    0x63: "lii",
+}
+# Candrabindu, anusvara, visarga (Tamil aytham), Gurmukhi tippi
+_SIGNS = {0x01: "n", 0x02: "n", 0x03: "h", 0x70: "n"}
+# Dead consonants that carry no inherent vowel
+_FINALS = {
+    "bengali": {0x4E: "t"},
+    "malayalam": {0x7A: "n", 0x7B: "n", 0x7C: "r", 0x7D: "l", 0x7E: "l", 0x7F: "k"},
+}
+_VIRAMA, _NUKTA = 0x4D, 0x3C
+
+_VOWEL, _CONSONANT, _MATRA, _SIGN, _FINAL, _VIRAMA_SIGN, _NUKTA_SIGN = range(7)
+
+
+def _build_letter_table() -> dict[str, tuple[int, str]]:
+    table: dict[str, tuple[int, str]] = {}
+    for script, first, _, _ in SCRIPTS:
+        for kind, letters in (
+            (_VOWEL, _VOWELS),
+            (_CONSONANT, _CONSONANTS),
+            (_MATRA, _MATRAS),
+            (_SIGN, _SIGNS),
+            (_FINAL, _FINALS.get(script, {})),
+        ):
+            for offset, latin in letters.items():
+                if unicodedata.category(chr(first + offset)) != "Cn":
+                    table[chr(first + offset)] = (kind, latin)
+        table[chr(first + _VIRAMA)] = (_VIRAMA_SIGN, "")
+        table[chr(first + _NUKTA)] = (_NUKTA_SIGN, "")
+    return table
+
+
+_LETTERS = _build_letter_table()
+
+
+def transliterate(text: str) -> str:
+    """
+    Romanize Indic text (Latin passes through). Consonants carry an inherent
+    "a" unless a vowel sign or virama follows, dropped at the end of a word as
+    in Hindi: "अंजली" -> "anjalii", "रमेश" -> "ramesh".
+    """
+    out: list[str] = []
+    pending = False  # last consonant still owes its inherent vowel
+    for char in text:
+        kind, latin = _LETTERS.get(char, (None, char))
+        if kind == _NUKTA_SIGN:
+            continue
+        if pending:
+            pending = False
+            if kind in (_MATRA, _VIRAMA_SIGN):
+                out.append(latin)
+                continue
+            if kind is not None:
+                out.append("a")
+        if kind == _CONSONANT:
+            pending = True
+        if kind not in (_MATRA, _VIRAMA_SIGN):
+            out.append(latin)
+    return "".join(out)
+
+
+# Applied in order to a lowercase Latin word
+_FOLDS: list[tuple[re.Pattern, str]] = [
+    (re.compile(pattern), replacement)
+    for pattern, replacement in (
+        (r"[^a-z]", ""),
+        (r"zh", "l"),  # Tamil/Malayalam retroflex approximant
+        (r"chh?", "C"),  # palatal, kept apart from the "c" of "Bescom"
+        (r"ck|c|q", "k"),
+        (r"C", "c"),
+        (r"x", "ks"),
+        (r"z", "j"),
+        (r"ph|f", "f"),
+        (r"w", "v"),
+        (r"([kgcjtdbp])h", r"\1"),  # aspirates
+        (r"sh|s", "s"),
+        (r"ee|ii|ie", "i"),
+        (r"oo|uu", "u"),
+        (r"au|ou", "o"),
+        (r"aa", "a"),
+        (r"n(?=[pbm])", "m"),  # anusvara before a labial
+        (r"ny(?=[cj])|ng(?=[kg])", "n"),
+        (r"(.)\1+", r"\1"),
+        (r"(?<=..)a$", ""),  # trailing schwa: "Rama" ~ "राम"
+    )
+]
+_SKELETON_VOWELS = re.compile(r"[aeiouy]")
+_SKELETON_FOLDS = str.maketrans("v", "b")
+
+
+def phonetic_key(word: str) -> str:
+    """Spelling-insensitive key of one word in any supported script"""
+    latin = unicodedata.normalize("NFKD", transliterate(word).lower())
+    for pattern, replacement in _FOLDS:
+        latin = pattern.sub(replacement, latin)
+    return latin
+
+
+def _skeleton(key: str) -> str:
+    """
+    Consonants only, any leading vowel folded to "a" and v to b (Bengali and
+    Odia write both with one letter): "airtel" ~ "eyaratel", "sorav" ~ "sorab"
+    """
+    if not key:
+        return key
+    head = "a" if key[0] in "aeiouy" else key[0]
+    return (head + _SKELETON_VOWELS.sub("", key[1:])).translate(_SKELETON_FOLDS)
+
+
+def _trigrams(key: str) -> set[str]:
+    padded = f"^{key}$"
+    return {padded[i : i + 3] for i in range(len(padded) - 2)}
+
+
+def _dice(a: set[str], b: set[str]) -> float:
+    return 2 * len(a & b) / (len(a) + len(b)) if a and b else 0.0
+
+
+# Words dropped from what the caller said ("Ramesh ji", "Sneha garu")
+HONORIFICS = (
+    "ji",
+    "jee",
+    "जी",
+    "garu",
+    "gaaru",
+    "గారు",
+    "sir",
+    "madam",
+    "saab",
+    "sahab",
+    "avaru",
+    "ಅವರು",
+)
+
+# Saved name (lowercase) -> what callers say instead, in the supported languages
+ALIASES: dict[str, tuple[str, ...]] = {
+    "father": (
+        "dad",
+        "daddy",
+        "papa",
+        "पापा",
+        "pitaji",
+        "पिताजी",
+        "baba",
+        "बाबा",
+        "appa",
+        "அப்பா",
+        "nanna",
+        "నాన్న",
+        "ಅಪ್ಪ",
+        "achan",
+        "അച്ഛൻ",
+        "বাবা",
+        "પપ્પા",
+        "ਪਾਪਾ",
+        "ବାପା",
+    ),
+    "mother": (
+        "mom",
+        "mummy",
+        "मम्मी",
+        "maa",
+        "माँ",
+        "amma",
+        "அம்மா",
+        "అమ్మ",
+        "ಅಮ್ಮ",
+        "അമ്മ",
+        "মা",
+        "મમ્મી",
+        "ਮੰਮੀ",
+        "ମା",
+        "aai",
+        "ammi",
+    ),
+    "brother": (
+        "bhai",
+        "भाई",
+        "bhaiya",
+        "भैया",
+        "anna",
+        "அண்ணா",
+        "అన్నయ్య",
+        "ಅಣ್ಣ",
+        "chettan",
+        "ചേട്ടൻ",
+        "dada",
+        "দাদা",
+        "ભાઈ",
+        "ਭਰਾ",
+        "ଭାଇ",
+    ),
+    "sister": (
+        "didi",
+        "दीदी",
+        "behen",
+        "बहन",
+        "akka",
+        "அக்கா",
+        "అక్క",
+        "ಅಕ್ಕ",
+        "chechi",
+        "ചേച്ചി",
+        "দিদি",
+        "બહેન",
+        "ਭੈਣ",
+        "ଭଉଣୀ",
+    ),
+    "partner": ("wife", "husband", "patni", "पत्नी", "pati", "पति", "biwi", "बीवी"),
+    "electricity": (
+        "bijli",
+        "बिजली",
+        "current",
+        "करंट",
+        "power",
+        "light",
+        "மின்சாரம்",
+        "కరెంట్",
+        "ಕರೆಂಟ್",
+    ),
+    "water": ("paani", "पानी", "jal", "जल", "தண்ணீர்", "నీళ్ళు", "ನೀರು", "വെള്ളം"),
+    "gas": ("cylinder", "सिलेंडर", "lpg"),
+    "internet": ("broadband", "wifi", "ब्रॉडबैंड", "वाईफाई"),
+    "credit card": ("card", "कार्ड"),
+}
+
+# Known billers (lowercase) -> the ALIASES utility they are called by
+BILLER_UTILITIES: dict[str, str] = {
+    **dict.fromkeys(
+        (
+            "bescom",
+            "mescom",
+            "hescom",
+            "gescom",
+            "cesc",
+            "tangedco",
+            "msedcl",
+            "mahadiscom",
+            "bses",
+            "tata power",
+            "adani electricity",
+            "tsspdcl",
+            "apspdcl",
+            "kseb",
+            "uppcl",
+            "pspcl",
+            "wbsedcl",
+        ),
+        "electricity",
+    ),
+    **dict.fromkeys(("bwssb", "delhi jal board", "hmwssb", "cmwssb"), "water"),
+    **dict.fromkeys(("indane", "hp gas", "bharat gas", "mahanagar gas", "igl"), "gas"),
+    **dict.fromkeys(("act fibernet", "hathway", "excitel"), "internet"),
+}
+
+# Scores by how a name matched; trigram overlap scales below the lowest
+_FULL, _WORD, _ALIAS, _SKELETON, _FUZZY = 1.0, 0.95, 0.9, 0.85, 0.8
+# Below this nothing is a match; within AMBIGUITY_MARGIN of the best it is a tie
+MIN_SCORE = 0.55
+AMBIGUITY_MARGIN = 0.05
+
+
+@dataclass
+class NameMatch(Generic[T]):
+    """One indexed entry and how well it matched what the caller said"""
+
+    name: str
+    score: float
+    item: T
+
+
+@dataclass
+class _Entry(Generic[T]):
+    name: str
+    item: T
+    key: str
+    words: tuple[str, ...]
+    skeletons: tuple[str, ...]
+    grams: tuple[set[str], ...]
+
+
+_HONORIFIC_KEYS = frozenset(phonetic_key(word) for word in HONORIFICS)
+
+
+def _words(text: str) -> list[str]:
+    """Phonetic keys of the words in a name, honorifics dropped"""
+    keys = (phonetic_key(word) for word in re.split(r"[\s.,\-_/]+", text.strip()))
+    return [key for key in keys if key and key not in _HONORIFIC_KEYS]
+
+
+class NameIndex(Generic[T]):
+    """
+    Phonetic index over one caller's contacts or billers.
+
+    `search()` ranks every plausible entry; `resolve()` returns the best one only
+    when it is a confident, unambiguous match.
+    """
+
+    def __init__(self, entries: Iterable[tuple[str, T]] = ()):
+        self._entries: list[_Entry[T]] = []
+        # Whole-name, single-word and alias keys -> (entry, score)
+        self._exact: dict[str, list[tuple[_Entry[T], float]]] = {}
+        for name, item in entries:
+            self.add(name, item)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def names(self) -> list[str]:
+        return [entry.name for entry in self._entries]
+
+    def add(self, name: str, item: T) -> None:
+        words = tuple(_words(name))
+        key = " ".join(words)
+        entry = _Entry(
+            name=name,
+            item=item,
+            key=key,
+            words=words,
+            skeletons=(
+                " ".join(_skeleton(w) for w in words),
+                *tuple(_skeleton(w) for w in words),
+            ),
+            grams=(_trigrams(key), *tuple(_trigrams(w) for w in words)),
+        )
+        self._entries.append(entry)
+        self._exact.setdefault(key, []).append((entry, _FULL))
+        for word in words if len(words) > 1 else ():
+            self._exact.setdefault(word, []).append((entry, _WORD))
+        aliases = list(ALIASES.get(name.strip().lower(), ()))
+        utility = BILLER_UTILITIES.get(name.strip().lower())
+        if utility is not None:
+            aliases += [utility, *ALIASES[utility]]
+        for alias in aliases:
+            self._exact.setdefault(" ".join(_words(alias)), []).append((entry, _ALIAS))
+
+    def search(self, spoken: str, limit: int = 3) -> list[NameMatch[T]]:
+        """Entries matching what the caller said, best first"""
+        words = _words(spoken)
+        if not words:
+            return []
+        key = " ".join(words)
+        scores: dict[int, tuple[float, _Entry[T]]] = {}
+
+        def offer(entry: _Entry[T], score: float) -> None:
+            if score >= MIN_SCORE and score > scores.get(id(entry), (0.0,))[0]:
+                scores[id(entry)] = (score, entry)
+
+        for entry, score in self._exact.get(key, ()):
+            offer(entry, score)
+        skeleton = " ".join(_skeleton(w) for w in words)
+        grams = _trigrams(key)
+        for entry in self._entries:
+            if id(entry) in scores:
+                continue
+            if skeleton in entry.skeletons:
+                offer(entry, _SKELETON)
+            else:
+                offer(entry, _FUZZY * max(_dice(grams, g) for g in entry.grams))
+
+        ranked = sorted(scores.values(), key=lambda pair: -pair[0])[:limit]
+        return [
+            NameMatch(entry.name, round(score, 3), entry.item)
+            for score, entry in ranked
+        ]
+
+    def resolve(self, spoken: str) -> Optional[NameMatch[T]]:
+        """The best match, or None when nothing matches or two entries tie"""
+        matches = self.search(spoken, limit=2)
+        if not matches:
+            return None
+        if (
+            len(matches) == 2
+            and matches[1].score >= matches[0].score - AMBIGUITY_MARGIN
+        ):
+            return None
+        return matches[0]
@@ -0,0 +1,132 @@
+"""
+Resilience Primitives
+Circuit breaker and rolling latency tracker used by BankingAPIClient to fail
+fast and hedge slow requests when the banking backend degrades
+"""
+
+import logging
+import threading
+import time
+from collections import deque
+from typing import Any, Optional
+
+logger = logging.getLogger("resilience")
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of sending a request while an endpoint's circuit is open"""
+
+    def __init__(self, endpoint: str, retry_in: float):
+        super().__init__(f"Circuit open for {endpoint}, retry in {retry_in:.1f}s")
+        self.endpoint = endpoint
+        self.retry_in = retry_in
+
+
+class CircuitBreaker:
+    """
+    Per-endpoint circuit breaker.
+
+    closed    -> requests flow; `failure_threshold` consecutive failures open it
+    open      -> requests fail immediately for `reset_timeout` seconds
+    half_open -> exactly one probe request is let through; success closes the
+                 circuit, failure re-opens it
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self, name: str, failure_threshold: int = 5, reset_timeout: float = 10.0
+    ):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.consecutive_failures = 0
+        self.opened_count = 0
+        self.rejected_count = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self._probe_started = 0.0
+        self._lock = threading.Lock()
+
+    def allow(self) -> None:
+        """Raise CircuitOpenError unless a request may be sent now"""
+        with self._lock:
+            if self.state == self.CLOSED:
+                return
+            elapsed = time.monotonic() - self._opened_at
+            if self.state == self.OPEN and elapsed >= self.reset_timeout:
+                self.state = self.HALF_OPEN
+                self._probe_in_flight = False
+            # A probe that never reported back (e.g. cancelled) must not wedge the circuit
+            probe_stuck = (
+                self._probe_in_flight
+                and time.monotonic() - self._probe_started >= self.reset_timeout
+            )
+            if self.state == self.HALF_OPEN and (
+                not self._probe_in_flight or probe_stuck
+            ):
+                self._probe_in_flight = True
+                self._probe_started = time.monotonic()
+                logger.info(f"Circuit {self.name} half-open, sending probe")
+                return
+            self.rejected_count += 1
+            raise CircuitOpenError(self.name, max(0.0, self.reset_timeout - elapsed))
+
+    def record_success(self) -> None:
+        with self._lock:
+            if self.state != self.CLOSED:
+                logger.info(f"Circuit {self.name} closed")
+            self.state = self.CLOSED
+            self.consecutive_failures = 0
+            self._probe_in_flight = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.consecutive_failures += 1
+            if (
+                self.state == self.HALF_OPEN
+                or self.consecutive_failures >= self.failure_threshold
+            ):
+                if self.state != self.OPEN:
+                    self.opened_count += 1
+                    logger.warning(
+                        f"Circuit {self.name} opened after {self.consecutive_failures} consecutive failures"
+                    )
+                self.state = self.OPEN
+                self._opened_at = time.monotonic()
+                self._probe_in_flight = False
+
+    @property
+    def healthy(self) -> bool:
+        """Closed and the last request succeeded"""
+        return self.state == self.CLOSED and self.consecutive_failures == 0
+
+    def metrics(self) -> dict[str, Any]:
+        return {
+            "state": self.state,
+            "consecutive_failures": self.consecutive_failures,
+            "opened": self.opened_count,
+            "rejected": self.rejected_count,
+        }
+
+
+class LatencyTracker:
+    """Rolling window of recent latencies for percentile-based hedging"""
+
+    def __init__(self, window: int = 200, min_samples: int = 20):
+        self.min_samples = min_samples
+        self._samples: deque[float] = deque(maxlen=window)
+
+    def record(self, seconds: float) -> None:
+        self._samples.append(seconds)
+
+    def percentile(self, q: float) -> Optional[float]:
+        """q-th percentile (0-100) of the window, or None until enough samples exist"""
+        if len(self._samples) < self.min_samples:
+            return None
+        ordered = sorted(self._samples)
+        index = min(len(ordered) - 1, round(q / 100 * (len(ordered) - 1)))
+        return ordered[index]
@@ -0,0 +1,220 @@
+"""
+Response Sanitizer
+Strips tool calls, function names and other implementation details from LLM
+output before it reaches TTS. Runs on every sentence, so all patterns are
+compiled once into one combined removal alternation (skipped entirely when a
+cheap substring prefilter finds nothing to remove) and one combined
+whitespace/punctuation cleanup.
+
+StreamingSanitizer applies the same rules to LLM token deltas, releasing each
+clause as soon as it is complete so TTS can start speaking before the reply
+has finished generating.
+"""
+
+import logging
+import re
+import time
+from collections.abc import AsyncIterable, AsyncIterator, Iterable
+from typing import Optional
+
+logger = logging.getLogger("voice-agent")
+
+# For standalone sanitize_response(); the agent passes BankingTools.tool_names()
+DEFAULT_FUNCTION_NAMES = (
+    "get_banking_data",
+    "transfer_funds",
+    "pay_bill",
+    "check_balance",
+)
+
+TECHNICAL_MARKERS = (
+    r"data_type\s*=",
+    r"account_number\s*=",
+    r"called with",
+    r"executing",
+    r"running tool",
+    r"using function",
+)
+
+# Every removal pattern contains one of these (lower-cased). Most spoken
+# sentences contain none, so a few substring checks let them skip the regex.
+_TRIGGERS = (
+    "tool",
+    "function",
+    "api",
+    "call",
+    "parameter",
+    "{",
+    "data_type",
+    "account_number",
+    "executing",
+)
+
+# Order matters: at any position the first matching branch wins, mirroring
+# the order the individual passes used to run in
+_TOOL_CALL = r"Tool:\s*\w+\s+Parameters:\s*\{[^}]*\}"
+_LABELLED = r"\b(?:Tool|Function|API|called with|calling|Parameters?):\s*[^\n.]*"
+_JSON_FRAGMENT = r"\{[\"']?\w+[\"']?\s*:\s*[^}]{0,100}\}"
+
+# Remove whitespace before punctuation, collapse runs of terminal punctuation
+# to a single period, and collapse runs of whitespace to a single space
+# The leading lookahead lets the engine skip ordinary characters with one class test
+_CLEANUP = re.compile(
+    r"(?=[\s.!?])(?:(?P<drop>\s+(?=[.,!?]))|(?P<stop>[.!?](?:\s*[.!?])+)|(?P<space>\s{2,}))"
+)
+_CLEANUP_REPLACEMENTS = {"drop": "", "stop": ".", "space": " "}
+
+# A clause may be released once its terminator is followed by whitespace and
+# the first character of the next clause: by then no removal pattern or
+# punctuation cleanup can reach back across it. Labels (`calling: ...`) run
+# to the end of the sentence, so commas only split sentences without a colon.
+_SENTENCE_END = re.compile(r"[.!?।\n]+\s+(?=[^\s.,!?।])")
+_CLAUSE_END = re.compile(r"[.!?।\n,;]+\s+(?=[^\s.,!?।])")
+_BRACES = re.compile(r"\{[^}]*\}?")
+_LEADING_PUNCTUATION = re.compile(r"[\s.,!?।;]*")
+
+
+def _cleanup(match: "re.Match[str]") -> str:
+    return _CLEANUP_REPLACEMENTS[match.lastgroup]
+
+
+class ResponseSanitizer:
+    """Precompiled sanitizer; build one per tool registry and reuse it"""
+
+    def __init__(self, function_names: Optional[Iterable[str]] = None):
+        self.function_names = tuple(function_names or DEFAULT_FUNCTION_NAMES)
+        names = "|".join(
+            re.escape(name)
+            for name in sorted(self.function_names, key=len, reverse=True)
+        )
+        branches = [_TOOL_CALL, _LABELLED, _JSON_FRAGMENT]
+        if names:
+            branches.append(rf"\b(?:{names})\b")
+        branches.extend(TECHNICAL_MARKERS)
+        self._removal = re.compile(
+            "|".join(f"(?:{b})" for b in branches), re.IGNORECASE
+        )
+        self._triggers = _TRIGGERS + tuple(name.lower() for name in self.function_names)
+
+    def sanitize(self, text: str) -> str:
+        """
+        Remove all technical details, function calls, and tool mentions from LLM responses.
+        This ensures users only see natural language, not internal implementation details.
+        """
+        if not text:
+            return text
+        lowered = text.lower()
+        if any(trigger in lowered for trigger in self._triggers):
+            text = self._removal.sub("", text)
+        text = _CLEANUP.sub(_cleanup, text).strip()
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"Sanitized text: {text}")
+        return text
+
+
+class StreamingSanitizer:
+    """
+    Incremental sanitizer for LLM token streams.
+
+    push() takes each delta and returns whatever clean text is safe to speak
+    now; only the unfinished clause (and any unclosed `{...}`) is held back.
+    flush() releases the remainder once the stream ends.
+    """
+
+    def __init__(
+        self, sanitizer: Optional[ResponseSanitizer] = None, max_holdback: int = 300
+    ):
+        self.sanitizer = sanitizer or _default
+        # Give up waiting for a clause end (or a closing brace) past this many chars
+        self.max_holdback = max_holdback
+        self._buffer = ""
+        self._emitted = False
+        # Time spent in push() and flush(), i.e. what sanitizing added to the reply
+        self.seconds = 0.0
+
+    def push(self, delta: str) -> str:
+        """Add an LLM delta; return clean text ready for TTS (may be empty)"""
+        started = time.perf_counter()
+        self._buffer += delta
+        cut = self._safe_cut()
+        if cut == 0:
+            self.seconds += time.perf_counter() - started
+            return ""
+        ready, self._buffer = self._buffer[:cut], self._buffer[cut:]
+        clean = self._emit(ready)
+        self.seconds += time.perf_counter() - started
+        return clean
+
+    def flush(self) -> str:
+        """Release everything still held back at the end of the stream"""
+        started = time.perf_counter()
+        ready, self._buffer = self._buffer, ""
+        clean = self._emit(ready)
+        self.seconds += time.perf_counter() - started
+        return clean
+
+    def _safe_cut(self) -> int:
+        buffer = self._buffer
+        # Tool-call parameters and JSON fragments span clause boundaries, so
+        # never cut inside braces, and hold back a brace that is still open
+        braces = [m.span() for m in _BRACES.finditer(buffer)]
+        if braces and not buffer.endswith("}", 0, braces[-1][1]):
+            start = braces.pop()[0]
+            if len(buffer) - start <= self.max_holdback:
+                buffer = buffer[:start]
+
+        def inside_braces(position: int) -> bool:
+            return any(start < position < end for start, end in braces)
+
+        cut = 0
+        sentence_start = 0
+        for match in _SENTENCE_END.finditer(buffer):
+            if not inside_braces(match.start()):
+                sentence_start = cut = match.end()
+        if ":" not in buffer[sentence_start:]:
+            for match in _CLAUSE_END.finditer(buffer, sentence_start):
+                if not inside_braces(match.start()):
+                    cut = match.end()
+        if cut == 0 and len(buffer) > self.max_holdback:
+            cut = buffer.rfind(" ") + 1
+        return cut
+
+    def _emit(self, text: str) -> str:
+        # A removed label leaves its sentence's full stop behind (`calling: tool.`);
+        # in the whole text it merges with the previous one, here it is dropped
+        clean = self.sanitizer.sanitize(text)
+        if self._emitted:
+            clean = clean[_LEADING_PUNCTUATION.match(clean).end() :]
+        if not clean:
+            return ""
+        if self._emitted:
+            clean = " " + clean
+        self._emitted = True
+        return clean
+
+
+async def sanitize_stream(
+    text: AsyncIterable[str],
+    sanitizer: Optional[ResponseSanitizer] = None,
+    stream: Optional[StreamingSanitizer] = None,
+) -> AsyncIterator[str]:
+    """
+    Sanitize an async stream of LLM deltas, yielding clean clauses as they complete.
+    Pass `stream` to read its timing afterwards.
+    """
+    stream = stream or StreamingSanitizer(sanitizer)
+    async for delta in text:
+        chunk = stream.push(delta)
+        if chunk:
+            yield chunk
+    chunk = stream.flush()
+    if chunk:
+        yield chunk
+
+
+_default = ResponseSanitizer()
+
+
+def sanitize_response(text: str) -> str:
+    """Sanitize with the default function-name list"""
+    return _default.sanitize(text)
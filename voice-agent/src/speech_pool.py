@@ -0,0 +1,157 @@
+"""
+Speech Model Pool
+Per-worker cache of constructed STT/TTS instances keyed by language code, so
+locking a conversation's language swaps in an existing (already connected)
+instance instead of building new ones mid-turn
+
+Instances are kept per event loop: plugins bind their HTTP/WebSocket sessions
+to the loop they first run on, and the LiveKit thread executor gives every job
+its own loop.
+
+build() constructs instances before any loop exists, in the worker's
+prewarm_fnc. They wait unbound until the first loop asks for them and then
+belong to it. With the process executor every process hosts exactly one job on
+one loop, so each call starts with its models already built. With the thread
+executor only the process's first job adopts them; later jobs build their own.
+"""
+
+import asyncio
+import logging
+import sys
+import threading
+import time
+import weakref
+from collections.abc import Iterable
+from dataclasses import dataclass
+from typing import Any, Callable
+
+logger = logging.getLogger("speech-pool")
+
+
+@dataclass
+class SpeechPoolStats:
+    """Counters showing how often a language switch avoided construction"""
+
+    constructed: int = 0
+    reused: int = 0
+    construct_seconds: float = 0.0
+
+    @property
+    def reuse_ratio(self) -> float:
+        lookups = self.constructed + self.reused
+        return self.reused / lookups if lookups else 0.0
+
+
+class SpeechModelPool:
+    """
+    Lazily built, reused STT/TTS instances per (event loop, kind, language).
+
+    `stt_factory` and `tts_factory` take a language code and return a new
+    plugin instance; they only run on the first request for that language.
+    """
+
+    def __init__(
+        self, stt_factory: Callable[[str], Any], tts_factory: Callable[[str], Any]
+    ):
+        self._factories = {"stt": stt_factory, "tts": tts_factory}
+        self.stats = SpeechPoolStats()
+        self._models: weakref.WeakKeyDictionary[
+            asyncio.AbstractEventLoop, dict[tuple[str, str], Any]
+        ] = weakref.WeakKeyDictionary()
+        # Built by build() outside any loop, handed to the first loop that asks
+        self._unbound: dict[tuple[str, str], Any] = {}
+        self._lock = threading.Lock()
+
+    def stt(self, language: str) -> Any:
+        return self._get("stt", language)
+
+    def tts(self, language: str) -> Any:
+        return self._get("tts", language)
+
+    def _get(self, kind: str, language: str) -> Any:
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            models = self._models.get(loop)
+            if models is None:
+                # The first loop in this process adopts whatever build() prepared
+                models = self._models[loop] = self._unbound
+                self._unbound = {}
+            model = models.get((kind, language))
+            if model is not None:
+                self.stats.reused += 1
+                return model
+        model = self._construct(kind, language)
+        with self._lock:
+            # Another session on this loop may have built it meanwhile; keep the first
+            return self._models[loop].setdefault((kind, language), model)
+
+    def _construct(self, kind: str, language: str) -> Any:
+        started = time.perf_counter()
+        model = self._factories[kind](language)
+        elapsed = time.perf_counter() - started
+        with self._lock:
+            self.stats.constructed += 1
+            self.stats.construct_seconds += elapsed
+        logger.info(f"Constructed {kind} for {language} in {elapsed * 1000:.1f} ms")
+        return model
+
+    def build(
+        self, languages: Iterable[str], kinds: Iterable[str] = ("stt", "tts")
+    ) -> int:
+        """
+        Construct instances with no event loop running (in prewarm_fnc) for the
+        first loop to adopt. Returns how many were built.
+        """
+        if sys.version_info < (3, 10):
+            # Before 3.10 asyncio primitives bind to a loop when they are created
+            return 0
+        built = 0
+        for language in languages:
+            for kind in kinds:
+                with self._lock:
+                    if (kind, language) in self._unbound:
+                        continue
+                model = self._construct(kind, language)
+                with self._lock:
+                    self._unbound.setdefault((kind, language), model)
+                built += 1
+        return built
+
+    def prewarm(self, languages: Iterable[str]) -> None:
+        """Construct STT and TTS for languages on this loop and open their connections"""
+        for language in languages:
+            for model in (self.stt(language), self.tts(language)):
+                prewarm = getattr(model, "prewarm", None)
+                if prewarm is not None:
+                    try:
+                        prewarm()
+                    except Exception as e:
+                        # A cold connection is slower, not fatal
+                        logger.warning(
+                            f"Prewarming {type(model).__name__} for {language} failed: {e}"
+                        )
+
+    async def aclose(self) -> None:
+        """Close and forget the instances owned by the running loop"""
+        with self._lock:
+            models = self._models.pop(asyncio.get_running_loop(), {})
+        for model in models.values():
+            close = getattr(model, "aclose", None)
+            if close is not None:
+                try:
+                    await close()
+                except Exception as e:
+                    logger.warning(f"Error closing {type(model).__name__}: {e}")
+
+    def metrics(self) -> dict[str, Any]:
+        with self._lock:
+            cached = sum(len(models) for models in self._models.values()) + len(
+                self._unbound
+            )
+        return {
+            "cached": cached,
+            "constructed": self.stats.constructed,
+            "reused": self.stats.reused,
+            "reuse_ratio": round(self.stats.reuse_ratio, 3),
+            "construct_ms": round(self.stats.construct_seconds * 1000, 1),
+        }
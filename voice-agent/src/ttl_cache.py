@@ -0,0 +1,169 @@
+"""
+Async TTL Cache
+Process-wide cache for reference data that is the same for every caller
+(loan products, interest rates)
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from collections.abc import Awaitable
+from dataclasses import dataclass
+from typing import Any, Callable, Optional
+
+logger = logging.getLogger("ttl-cache")
+
+
+@dataclass
+class _Entry:
+    value: Any
+    fresh_until: float
+    stale_until: float
+
+
+@dataclass
+class CacheStats:
+    """Counters showing how much backend load the cache removes"""
+
+    hits: int = 0
+    stale_hits: int = 0
+    misses: int = 0
+    coalesced: int = 0
+    refreshes: int = 0
+    refresh_errors: int = 0
+    invalidations: int = 0
+
+    @property
+    def hit_ratio(self) -> float:
+        """Fraction of lookups answered without waiting on the backend"""
+        lookups = self.hits + self.stale_hits + self.misses + self.coalesced
+        if lookups == 0:
+            return 0.0
+        return (self.hits + self.stale_hits) / lookups
+
+
+class AsyncTTLCache:
+    """
+    TTL cache with single-flight loading and stale-while-revalidate.
+
+    - Within `ttl` seconds of loading, entries are served directly.
+    - For `stale_ttl` seconds after that, the stale value is served
+      immediately while one background task refreshes it.
+    - Concurrent misses for the same key share one backend call.
+
+    Safe to share across event loops (LiveKit thread executor); in-flight
+    loads are tracked per loop because tasks cannot be awaited across loops.
+    """
+
+    def __init__(self, ttl: float = 300.0, stale_ttl: float = 60.0):
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.stats = CacheStats()
+        self._entries: dict[str, _Entry] = {}
+        self._inflight: dict[tuple[asyncio.AbstractEventLoop, str], asyncio.Task] = {}
+        self._generation: dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    async def get_or_fetch(
+        self, key: str, fetcher: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        """Return the cached value for key, loading it with fetcher on a miss"""
+        now = time.monotonic()
+        entry = self._entries.get(key)
+        if entry is not None and now < entry.fresh_until:
+            self.stats.hits += 1
+            return entry.value
+        if entry is not None and now < entry.stale_until:
+            self.stats.stale_hits += 1
+            self._load(key, fetcher, background=True)
+            return entry.value
+
+        task, started = self._load(key, fetcher)
+        if started:
+            self.stats.misses += 1
+        else:
+            self.stats.coalesced += 1
+        # shield: one caller being cancelled must not cancel everyone's load
+        return await asyncio.shield(task)
+
+    def peek(self, key: str) -> Optional[Any]:
+        """Last loaded value for key regardless of age, for degraded-mode answers"""
+        entry = self._entries.get(key)
+        return entry.value if entry is not None else None
+
+    def invalidate(self, key: Optional[str] = None) -> None:
+        """Drop one key (or everything) so the next lookup goes to the backend"""
+        with self._lock:
+            keys = [key] if key is not None else list(self._entries)
+            for k in keys:
+                self._entries.pop(k, None)
+                # Loads already in flight must not write back the old value
+                self._generation[k] = self._generation.get(k, 0) + 1
+            self._inflight = {
+                (loop, k): task
+                for (loop, k), task in self._inflight.items()
+                if key is not None and k != key
+            }
+        self.stats.invalidations += 1
+
+    def _load(
+        self, key: str, fetcher: Callable[[], Awaitable[Any]], background: bool = False
+    ) -> tuple[asyncio.Task, bool]:
+        """Start (or join) the single in-flight load for key on this loop"""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            task = self._inflight.get((loop, key))
+            if task is not None:
+                return task, False
+            generation = self._generation.get(key, 0)
+            task = loop.create_task(self._fetch(key, fetcher, generation))
+            self._inflight[(loop, key)] = task
+        if background:
+            self.stats.refreshes += 1
+        task.add_done_callback(lambda t: self._on_done(loop, key, t, background))
+        return task, True
+
+    async def _fetch(
+        self, key: str, fetcher: Callable[[], Awaitable[Any]], generation: int
+    ) -> Any:
+        value = await fetcher()
+        now = time.monotonic()
+        with self._lock:
+            if self._generation.get(key, 0) == generation:
+                self._entries[key] = _Entry(
+                    value, now + self.ttl, now + self.ttl + self.stale_ttl
+                )
+        return value
+
+    def _on_done(
+        self,
+        loop: asyncio.AbstractEventLoop,
+        key: str,
+        task: asyncio.Task,
+        background: bool,
+    ) -> None:
+        with self._lock:
+            if self._inflight.get((loop, key)) is task:
+                del self._inflight[(loop, key)]
+        if task.cancelled():
+            return
+        error = task.exception()
+        if error is not None and background:
+            # Keep serving the stale value; the next lookup retries
+            self.stats.refresh_errors += 1
+            logger.warning(f"Background refresh of {key} failed: {error}")
+
+    def metrics(self) -> dict[str, Any]:
+        """Snapshot of cache counters"""
+        return {
+            "entries": len(self._entries),
+            "hits": self.stats.hits,
+            "stale_hits": self.stats.stale_hits,
+            "misses": self.stats.misses,
+            "coalesced": self.stats.coalesced,
+            "refreshes": self.stats.refreshes,
+            "refresh_errors": self.stats.refresh_errors,
+            "invalidations": self.stats.invalidations,
+            "hit_ratio": round(self.stats.hit_ratio, 3),
+        }
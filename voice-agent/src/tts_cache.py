@@ -0,0 +1,407 @@
+"""
+TTS Audio Cache
+Content-addressed cache of synthesized audio for phrases the agent repeats
+across calls ("Please enter your PIN", "Is that correct?")
+
+Keyed by (language, speaker, model, normalized text). Two bounded tiers: an
+in-memory LRU per worker process and an optional on-disk directory that
+survives restarts and is shared by every process on the host. A phrase is
+only stored once it has been requested `admit_after` times, and phrases with
+digits or currency (balances, amounts, account numbers) are never cached
+unless they come from text marked as reference data, identical for every
+caller (the loan-rate readout).
+
+speak_cached() plays a reply through the cache: uncached text streams through
+one synthesis and only cache hits are spliced in between.
+"""
+
+import asyncio
+import contextlib
+import hashlib
+import logging
+import os
+import re
+import struct
+import threading
+import unicodedata
+from collections import OrderedDict
+from collections.abc import AsyncIterable, AsyncIterator, Iterator
+from dataclasses import dataclass
+from typing import Any, Callable, Optional
+
+from livekit import rtc
+
+logger = logging.getLogger("tts-cache")
+
+# sample_rate, num_channels
+_HEADER = struct.Struct("<II")
+_WHITESPACE = re.compile(r"\s+")
+# Any digit (in any script) or currency marks a phrase as caller-specific
+CURRENCY_WORDS = [
+    "₹",
+    "rs",
+    "inr",
+    "rupee",
+    "rupees",
+    "रुपये",
+    "रुपए",
+    "रुपया",
+    "రూపాయ",
+    "ரூபாய்",
+    "ರೂಪಾಯ",
+    "രൂപ",
+    "টাকা",
+    "રૂપિય",
+    "ਰੁਪਏ",
+    "ଟଙ୍କା",
+]
+_CALLER_SPECIFIC = re.compile(
+    r"\d|"
+    + "|".join(
+        rf"\b{re.escape(w)}\b" if w.isascii() else re.escape(w) for w in CURRENCY_WORDS
+    ),
+    re.IGNORECASE,
+)
+
+
+# Reference texts remembered for cacheable(); a handful of readouts in practice
+MAX_REFERENCE_TEXTS = 64
+
+
+def normalize_phrase(text: str) -> str:
+    """Canonical form used for keys: NFC, collapsed whitespace, case-folded"""
+    return _WHITESPACE.sub(" ", unicodedata.normalize("NFC", text)).strip().casefold()
+
+
+def phrase_key(language: str, speaker: str, model: str, text: str) -> str:
+    """Content address of one synthesized phrase"""
+    raw = "\0".join((language, speaker, model, normalize_phrase(text)))
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+@dataclass
+class CachedAudio:
+    """One phrase of 16-bit PCM, stored contiguously and re-framed on playback"""
+
+    pcm: bytes
+    sample_rate: int
+    num_channels: int
+
+    @classmethod
+    def from_frames(cls, frames: list[rtc.AudioFrame]) -> "CachedAudio":
+        first = frames[0]
+        return cls(
+            b"".join(bytes(f.data) for f in frames),
+            first.sample_rate,
+            first.num_channels,
+        )
+
+    def frames(self, frame_ms: int = 20) -> Iterator[rtc.AudioFrame]:
+        samples = self.sample_rate * frame_ms // 1000
+        step = samples * self.num_channels * 2
+        for offset in range(0, len(self.pcm), step):
+            chunk = self.pcm[offset : offset + step]
+            yield rtc.AudioFrame(
+                data=chunk,
+                sample_rate=self.sample_rate,
+                num_channels=self.num_channels,
+                samples_per_channel=len(chunk) // (2 * self.num_channels),
+            )
+
+    def to_bytes(self) -> bytes:
+        return _HEADER.pack(self.sample_rate, self.num_channels) + self.pcm
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "CachedAudio":
+        sample_rate, num_channels = _HEADER.unpack_from(data)
+        return cls(data[_HEADER.size :], sample_rate, num_channels)
+
+
+@dataclass
+class TTSCacheStats:
+    """Counters showing how much synthesis the cache avoids"""
+
+    memory_hits: int = 0
+    disk_hits: int = 0
+    misses: int = 0
+    stores: int = 0
+    evictions: int = 0
+
+    @property
+    def hit_ratio(self) -> float:
+        lookups = self.memory_hits + self.disk_hits + self.misses
+        return (self.memory_hits + self.disk_hits) / lookups if lookups else 0.0
+
+
+class TTSAudioCache:
+    """
+    Two-tier phrase audio cache.
+
+    - Memory: LRU bounded by `memory_bytes` of PCM.
+    - Disk: `<disk_dir>/<key>.pcm`, bounded by `disk_bytes` (oldest first out).
+      Disabled when disk_dir is None.
+
+    Safe to share across event loops; disk I/O runs in a worker thread.
+    """
+
+    def __init__(
+        self,
+        memory_bytes: int = 64 * 1024 * 1024,
+        disk_dir: Optional[str] = None,
+        disk_bytes: int = 512 * 1024 * 1024,
+        admit_after: int = 2,
+        max_phrase_chars: int = 200,
+    ):
+        self.memory_bytes = memory_bytes
+        self.disk_dir = disk_dir
+        self.disk_bytes = disk_bytes
+        self.admit_after = admit_after
+        self.max_phrase_chars = max_phrase_chars
+        self.stats = TTSCacheStats()
+        self._memory: OrderedDict[str, CachedAudio] = OrderedDict()
+        self._memory_used = 0
+        self._disk: OrderedDict[str, int] = OrderedDict()
+        self._disk_used = 0
+        # Bounded count of misses per key, for the admission policy
+        self._seen: OrderedDict[str, int] = OrderedDict()
+        # Normalized text marked with mark_reference(), most recent last
+        self._reference: OrderedDict[str, None] = OrderedDict()
+        self._lock = threading.Lock()
+        if disk_dir is not None:
+            self._scan_disk()
+
+    def mark_reference(self, text: str) -> None:
+        """
+        Mark text as the same for every caller (rates, fees), so its phrases
+        are cacheable even though they contain digits or currency
+        """
+        reference = normalize_phrase(text)
+        with self._lock:
+            self._reference.pop(reference, None)
+            self._reference[reference] = None
+            if len(self._reference) > MAX_REFERENCE_TEXTS:
+                self._reference.popitem(last=False)
+
+    def cacheable(self, text: str) -> bool:
+        """
+        Short, and either free of digits and currency (amounts and balances
+        belong to one caller) or part of text marked with mark_reference()
+        """
+        if not 0 < len(text.strip()) <= self.max_phrase_chars:
+            return False
+        if not _CALLER_SPECIFIC.search(text):
+            return True
+        phrase = normalize_phrase(text)
+        with self._lock:
+            return any(phrase in reference for reference in self._reference)
+
+    def admits(self, key: str) -> bool:
+        """Whether put(key) would store the phrase now"""
+        with self._lock:
+            return (
+                self._seen.get(key, 0) >= self.admit_after and key not in self._memory
+            )
+
+    async def get(self, key: str) -> Optional[CachedAudio]:
+        """Cached audio for key, promoting disk hits into memory"""
+        with self._lock:
+            audio = self._memory.get(key)
+            if audio is not None:
+                self._memory.move_to_end(key)
+                self.stats.memory_hits += 1
+                return audio
+            on_disk = key in self._disk
+        if on_disk:
+            audio = await asyncio.to_thread(self._read_disk, key)
+            if audio is not None:
+                with self._lock:
+                    self.stats.disk_hits += 1
+                    self._store_memory(key, audio)
+                return audio
+        with self._lock:
+            self.stats.misses += 1
+            self._seen[key] = self._seen.pop(key, 0) + 1
+            if len(self._seen) > 10_000:
+                self._seen.popitem(last=False)
+        return None
+
+    async def put(self, key: str, frames: list[rtc.AudioFrame]) -> bool:
+        """Store a phrase's frames once it has been requested admit_after times"""
+        if not frames:
+            return False
+        with self._lock:
+            if self._seen.get(key, 0) < self.admit_after or key in self._memory:
+                return False
+            self._seen.pop(key, None)
+            audio = CachedAudio.from_frames(frames)
+            self._store_memory(key, audio)
+            self.stats.stores += 1
+        if self.disk_dir is not None:
+            await asyncio.to_thread(self._write_disk, key, audio)
+        return True
+
+    def _store_memory(self, key: str, audio: CachedAudio) -> None:
+        """Insert into the LRU; caller must hold the lock"""
+        size = len(audio.pcm)
+        if size > self.memory_bytes:
+            return
+        previous = self._memory.pop(key, None)
+        if previous is not None:
+            self._memory_used -= len(previous.pcm)
+        self._memory[key] = audio
+        self._memory_used += size
+        while self._memory_used > self.memory_bytes:
+            _, evicted = self._memory.popitem(last=False)
+            self._memory_used -= len(evicted.pcm)
+            self.stats.evictions += 1
+
+    # Disk tier
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.disk_dir, f"{key}.pcm")
+
+    def _scan_disk(self) -> None:
+        os.makedirs(self.disk_dir, exist_ok=True)
+        entries = []
+        for entry in os.scandir(self.disk_dir):
+            if entry.name.endswith(".pcm"):
+                stat = entry.stat()
+                entries.append((stat.st_mtime, entry.name[:-4], stat.st_size))
+        for _, key, size in sorted(entries):
+            self._disk[key] = size
+            self._disk_used += size
+
+    def _read_disk(self, key: str) -> Optional[CachedAudio]:
+        try:
+            with open(self._path(key), "rb") as f:
+                return CachedAudio.from_bytes(f.read())
+        except (OSError, struct.error) as e:
+            # Evicted by another process, or a partial file from a crash
+            logger.debug(f"Dropping unreadable cache entry {key}: {e}")
+            with self._lock:
+                self._disk_used -= self._disk.pop(key, 0)
+            return None
+
+    def _write_disk(self, key: str, audio: CachedAudio) -> None:
+        data = audio.to_bytes()
+        if len(data) > self.disk_bytes:
+            return
+        path = self._path(key)
+        tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp, "wb") as f:
+                f.write(data)
+            # Atomic, so readers never see a half-written phrase
+            os.replace(tmp, path)
+        except OSError as e:
+            logger.warning(f"Could not write TTS cache entry: {e}")
+            return
+        with self._lock:
+            self._disk_used += len(data) - self._disk.pop(key, 0)
+            self._disk[key] = len(data)
+            evicted = []
+            while self._disk_used > self.disk_bytes:
+                old_key, size = self._disk.popitem(last=False)
+                self._disk_used -= size
+                evicted.append(old_key)
+        for old_key in evicted:
+            with contextlib.suppress(OSError):
+                os.remove(self._path(old_key))
+
+    def metrics(self) -> dict[str, Any]:
+        """Snapshot of cache counters"""
+        with self._lock:
+            return {
+                "memory_entries": len(self._memory),
+                "memory_mb": round(self._memory_used / 1024 / 1024, 2),
+                "disk_entries": len(self._disk),
+                "disk_mb": round(self._disk_used / 1024 / 1024, 2),
+                "memory_hits": self.stats.memory_hits,
+                "disk_hits": self.stats.disk_hits,
+                "misses": self.stats.misses,
+                "stores": self.stats.stores,
+                "evictions": self.stats.evictions,
+                "hit_ratio": round(self.stats.hit_ratio, 3),
+            }
+
+
+async def _single(text: str) -> AsyncIterator[str]:
+    yield text
+
+
+async def _run_text(run: "asyncio.Queue[Optional[str]]") -> AsyncIterator[str]:
+    """Phrases queued for one streamed synthesis, until the None that closes it"""
+    while True:
+        phrase = await run.get()
+        if phrase is None:
+            return
+        yield phrase if phrase[-1:].isspace() else f"{phrase} "
+
+
+async def speak_cached(
+    phrases: AsyncIterable[str],
+    cache: TTSAudioCache,
+    key_of: Callable[[str], str],
+    synthesize: Callable[[AsyncIterable[str]], AsyncIterable[rtc.AudioFrame]],
+) -> AsyncIterator[rtc.AudioFrame]:
+    """
+    Audio for a reply arriving as clean phrases, in order.
+
+    Consecutive uncached phrases go through one streamed synthesis, fed while
+    it plays, so the reply keeps its prosody and opens one TTS stream rather
+    than one per clause. A cache hit closes the current stream and is played
+    in place; a phrase the cache is about to admit is synthesized on its own
+    so its audio can be stored.
+    """
+    segments: asyncio.Queue[Optional[tuple]] = asyncio.Queue()
+
+    async def plan() -> None:
+        run: Optional[asyncio.Queue[Optional[str]]] = None
+        try:
+            async for phrase in phrases:
+                key = key_of(phrase) if cache.cacheable(phrase) else None
+                cached = await cache.get(key) if key is not None else None
+                if cached is None and (key is None or not cache.admits(key)):
+                    if run is None:
+                        run = asyncio.Queue()
+                        segments.put_nowait(("stream", run))
+                    run.put_nowait(phrase)
+                    continue
+                if run is not None:
+                    run.put_nowait(None)
+                    run = None
+                segments.put_nowait(
+                    ("cached", cached)
+                    if cached is not None
+                    else ("capture", (phrase, key))
+                )
+        finally:
+            if run is not None:
+                run.put_nowait(None)
+            segments.put_nowait(None)
+
+    planner = asyncio.create_task(plan())
+    try:
+        while True:
+            segment = await segments.get()
+            if segment is None:
+                break
+            kind, value = segment
+            if kind == "stream":
+                async for frame in synthesize(_run_text(value)):
+                    yield frame
+            elif kind == "cached":
+                for frame in value.frames():
+                    yield frame
+            else:
+                phrase, key = value
+                frames = []
+                async for frame in synthesize(_single(phrase)):
+                    frames.append(frame)
+                    yield frame
+                # Only reached when the phrase was synthesized completely (not interrupted)
+                await cache.put(key, frames)
+        # Surface errors from the phrase stream
+        await planner
+    finally:
+        planner.cancel()
@@ -0,0 +1,242 @@
+"""
+Turn Tracing
+Per-turn spans and latency histograms for every stage between the caller
+finishing a sentence and the agent's first audio
+
+A turn opens when VAD (or the STT, without VAD) reports the end of the
+caller's speech and closes when the agent starts speaking. Stages measured
+while it is open (STT final, end-of-utterance decision, language lock, fast
+path, LLM first token, banking tool calls, sanitizer, TTS first byte) become
+child spans of the turn and observations in Prometheus histograms labelled by
+stage and language. Spans go to whatever OpenTelemetry tracer provider is
+installed (see configure_otlp_export); histograms are served on the worker's
+/metrics endpoint when WorkerOptions.prometheus_port is set.
+"""
+
+import asyncio
+import logging
+import time
+from collections.abc import AsyncIterable, AsyncIterator, Iterator
+from contextlib import contextmanager
+from typing import Any, Optional, TypeVar
+
+from livekit.agents import metrics, telemetry
+from opentelemetry import trace
+from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+from opentelemetry.sdk.resources import SERVICE_NAME, Resource
+from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace.export import BatchSpanProcessor
+from prometheus_client import Histogram
+
+logger = logging.getLogger("voice-agent")
+
+T = TypeVar("T")
+
+# Sub-second resolution where voice latency is decided, coarse above it
+_BUCKETS = (
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.2,
+    0.3,
+    0.5,
+    0.75,
+    1.0,
+    1.5,
+    2.0,
+    3.0,
+    5.0,
+    10.0,
+)
+
+STAGE_SECONDS = Histogram(
+    "vaanipay_turn_stage_seconds",
+    "Duration of one stage of a conversational turn",
+    ["stage", "language"],
+    buckets=_BUCKETS,
+)
+TURN_SECONDS = Histogram(
+    "vaanipay_turn_latency_seconds",
+    "End of the caller's speech to the agent's first audio",
+    ["language", "path"],
+    buckets=_BUCKETS,
+)
+
+_tracer = trace.get_tracer("vaanipay")
+
+
+def configure_otlp_export(
+    endpoint: str, service_name: str = "vaanipay-agent"
+) -> TracerProvider:
+    """
+    Export spans over OTLP/HTTP to a local collector (e.g. http://localhost:4318),
+    LiveKit's own session spans included. Call once per process.
+    """
+    provider = TracerProvider(resource=Resource.create({SERVICE_NAME: service_name}))
+    provider.add_span_processor(
+        BatchSpanProcessor(
+            OTLPSpanExporter(endpoint=f"{endpoint.rstrip('/')}/v1/traces")
+        )
+    )
+    trace.set_tracer_provider(provider)
+    telemetry.set_tracer_provider(provider)
+    return provider
+
+
+async def flush_traces() -> None:
+    """Push buffered spans out before a job process exits"""
+    provider = trace.get_tracer_provider()
+    force_flush = getattr(provider, "force_flush", None)
+    if force_flush is not None:
+        await asyncio.to_thread(force_flush)
+
+
+def _ns(seconds: float) -> int:
+    return int(seconds * 1_000_000_000)
+
+
+class TurnTracer:
+    """
+    Spans and stage timings for the turns of one call.
+
+    `observe(session)` opens and closes turns from the session's events;
+    `stage()`, `record()` and `time_to_first()` time the stages in between.
+    `language` labels everything recorded after it is set.
+    """
+
+    def __init__(self, call_id: str = "", tracer: Optional[trace.Tracer] = None):
+        self.call_id = call_id
+        self.language = "unknown"
+        # "fast_path" when the turn was answered without the LLM
+        self.path = "llm"
+        self.turns = 0
+        self._tracer = tracer or _tracer
+        self._turn: Optional[trace.Span] = None
+        # Parent for stages; kept after the turn closes so stages that finish
+        # later (the sanitizer, once the reply has been spoken) stay in its trace
+        self._context: Optional[Any] = None
+        self._turn_started_ns = 0
+        self._stages: list[tuple[str, float]] = []
+
+    def observe(self, session: Any) -> None:
+        """Open a turn at the caller's end of speech and close it at the agent's first audio"""
+        session.on("user_state_changed", self._on_user_state_changed)
+        session.on("agent_state_changed", self._on_agent_state_changed)
+        session.on("metrics_collected", self._on_metrics_collected)
+
+    def begin_turn(self, started_at: Optional[float] = None) -> None:
+        """Start a turn at started_at (epoch seconds); an unanswered open turn is closed first"""
+        if self._turn is not None:
+            self.end_turn(answered=False)
+        self.turns += 1
+        self.path = "llm"
+        self._stages = []
+        self._turn_started_ns = (
+            _ns(started_at) if started_at is not None else time.time_ns()
+        )
+        self._turn = self._tracer.start_span(
+            "turn",
+            start_time=self._turn_started_ns,
+            attributes={"vaanipay.call_id": self.call_id, "vaanipay.turn": self.turns},
+        )
+        self._context = trace.set_span_in_context(self._turn)
+
+    def end_turn(
+        self, ended_at: Optional[float] = None, answered: bool = True
+    ) -> Optional[float]:
+        """Close the open turn; returns its latency in seconds when it was answered"""
+        if self._turn is None:
+            return None
+        ended_ns = _ns(ended_at) if ended_at is not None else time.time_ns()
+        seconds = max(0.0, (ended_ns - self._turn_started_ns) / 1_000_000_000)
+        self._turn.set_attributes(
+            {
+                "vaanipay.language": self.language,
+                "vaanipay.path": self.path,
+                "vaanipay.answered": answered,
+            }
+        )
+        self._turn.end(end_time=max(ended_ns, self._turn_started_ns))
+        self._turn = None
+        if not answered:
+            return None
+        TURN_SECONDS.labels(language=self.language, path=self.path).observe(seconds)
+        stages = ", ".join(
+            f"{stage} {elapsed * 1000:.0f}" for stage, elapsed in self._stages
+        )
+        logger.info(
+            f"Turn {self.turns} ({self.language}, {self.path}): {seconds * 1000:.0f} ms to first audio [{stages}]"
+        )
+        return seconds
+
+    def record(
+        self,
+        stage: str,
+        seconds: float,
+        started_ns: Optional[int] = None,
+        **attributes: Any,
+    ) -> None:
+        """Record a finished stage; started_ns defaults to `seconds` before now"""
+        seconds = max(0.0, seconds)
+        if started_ns is None:
+            started_ns = time.time_ns() - _ns(seconds)
+        STAGE_SECONDS.labels(stage=stage, language=self.language).observe(seconds)
+        span = self._tracer.start_span(
+            stage,
+            context=self._context,
+            start_time=started_ns,
+            attributes={
+                "vaanipay.language": self.language,
+                **{f"vaanipay.{k}": v for k, v in attributes.items()},
+            },
+        )
+        span.end(end_time=started_ns + _ns(seconds))
+        if self._turn is not None:
+            self._stages.append((stage, seconds))
+
+    @contextmanager
+    def stage(self, name: str, **attributes: Any) -> Iterator[None]:
+        """Time the enclosed block as one stage"""
+        started_ns = time.time_ns()
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - started, started_ns, **attributes)
+
+    async def time_to_first(
+        self, stage: str, items: AsyncIterable[T], **attributes: Any
+    ) -> AsyncIterator[T]:
+        """Pass items through, recording the wait for the first one as stage"""
+        started_ns = time.time_ns()
+        started = time.perf_counter()
+        first = True
+        async for item in items:
+            if first:
+                first = False
+                self.record(
+                    stage, time.perf_counter() - started, started_ns, **attributes
+                )
+            yield item
+
+    def _on_user_state_changed(self, ev: Any) -> None:
+        if ev.old_state == "speaking" and ev.new_state == "listening":
+            self.begin_turn(ev.created_at)
+
+    def _on_agent_state_changed(self, ev: Any) -> None:
+        if ev.new_state == "speaking":
+            self.end_turn(ev.created_at)
+
+    def _on_metrics_collected(self, ev: Any) -> None:
+        # Both delays are measured by LiveKit from the caller's end of speech
+        if isinstance(ev.metrics, metrics.EOUMetrics) and self._turn is not None:
+            self.record(
+                "stt_final", ev.metrics.transcription_delay, self._turn_started_ns
+            )
+            self.record(
+                "end_of_utterance",
+                ev.metrics.end_of_utterance_delay,
+                self._turn_started_ns,
+            )
@@ -0,0 +1,373 @@
+import asyncio
+
+import httpx
+import pytest
+
+import mock_banking_api
+from banking_api import (
+    BankingAPIClient,
+    PaymentOutcomeUnknownError,
+    PaymentRejectedError,
+)
+from mock_banking_api import USERS, app
+from mock_banking_store import InMemoryBankingStore
+
+
+def _client() -> BankingAPIClient:
+    return BankingAPIClient(
+        base_url="http://testserver",
+        transport=httpx.ASGITransport(app=app),
+    )
+
+
+@pytest.mark.asyncio
+async def test_reuses_one_pooled_client() -> None:
+    """All calls go through a single long-lived httpx client."""
+    async with _client() as api:
+        pooled = api._client()
+
+        user = await api.get_user_by_account("4421")
+        assert user["user_id"] == "rahul_sharma"
+        assert await api.get_accounts()
+        assert (await api.get_balance("4421"))["balance"] == 27940.0
+
+        assert api._client() is pooled
+        assert api.pool_stats()["requests"] == 3
+
+    assert pooled.is_closed
+
+
+@pytest.mark.asyncio
+async def test_reopens_after_aclose() -> None:
+    """A closed client reopens its pool on the next call."""
+    api = _client()
+    assert await api.get_loans()
+    await api.aclose()
+    assert await api.get_interest_rates()
+    await api.aclose()
+
+
+@pytest.mark.asyncio
+async def test_endpoint_timeouts_override_default() -> None:
+    api = BankingAPIClient(timeouts={"loans": httpx.Timeout(0.5)})
+    assert api._timeouts["loans"].read == 0.5
+    assert api._timeouts["transfer"].read == 15.0
+
+
+@pytest.mark.asyncio
+async def test_sessions_isolate_identity_and_share_pool() -> None:
+    """Concurrent callers keep their own user_id on one shared pool."""
+    pool = _client()
+    rahul, priya = pool.session(), pool.session()
+    assert pool.active_sessions == 2
+
+    await rahul.get_user_by_account("4421")
+    await priya.get_user_by_account("5532")
+
+    assert rahul.user_id == "rahul_sharma"
+    assert priya.user_id == "priya_patel"
+    assert pool.user_id is None
+    assert rahul._client() is priya._client() is pool._client()
+
+    shared = pool._client()
+    await rahul.aclose()
+    await rahul.aclose()
+    assert pool.active_sessions == 1
+    assert not shared.is_closed
+
+    # Last session on this loop closes the loop's pool
+    await priya.aclose()
+    assert pool.active_sessions == 0
+    assert shared.is_closed
+
+
+def test_sessions_on_separate_loops_get_separate_pools() -> None:
+    """LiveKit's thread executor runs each job on its own event loop."""
+    pool = _client()
+
+    async def job():
+        api = pool.session()
+        await api.get_user_by_account("4421")
+        http = api._client()
+        await api.aclose()
+        return http
+
+    first, second = asyncio.run(job()), asyncio.run(job())
+    assert first is not second
+    assert first.is_closed and second.is_closed
+
+
+@pytest.mark.asyncio
+async def test_prefetch_builds_profile_snapshot() -> None:
+    """Identification fans out once; follow-ups read the in-memory snapshot."""
+    async with _client() as api:
+        await api.get_user_by_account("4421")
+        api.start_prefetch()
+
+        profile = await api.get_profile()
+        assert profile.user_id == "rahul_sharma"
+        assert len(profile.accounts) == 3
+        assert profile.bills and profile.contacts and profile.transactions
+        assert profile.credit_limit["credit_limit"] == 250000.0
+        assert profile.find_account("9920")["balance"] == 3210.0
+
+        requests = api.pool_stats()["requests"]
+        assert await api.get_profile() is profile
+        assert api.pool_stats()["requests"] == requests
+
+        # Switching caller drops the old snapshot
+        await api.get_user_by_account("5532")
+        assert await api.get_profile() is None
+
+
+@pytest.mark.asyncio
+async def test_reference_data_cached_across_sessions() -> None:
+    pool = _client()
+    first, second = pool.session(), pool.session()
+
+    assert await first.get_loans()
+    assert await second.get_loans()
+    assert await second.get_interest_rates()
+    assert pool.pool_stats()["requests"] == 2
+    assert pool.reference_cache_stats()["hits"] == 1
+
+    pool.invalidate_reference_data("loans")
+    assert await first.get_loans()
+    assert pool.pool_stats()["requests"] == 3
+
+    await first.aclose()
+    await second.aclose()
+
+
+class _LosesFirstResponses(httpx.AsyncBaseTransport):
+    """Forwards to the app but drops the first responses, like a timeout after commit."""
+
+    def __init__(self, failures: int):
+        self._app = httpx.ASGITransport(app=app)
+        self.failures = failures
+        self.keys = []
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        self.keys.append(request.headers.get("Idempotency-Key"))
+        response = await self._app.handle_async_request(request)
+        if self.failures > 0:
+            self.failures -= 1
+            raise httpx.ReadTimeout("response lost", request=request)
+        return response
+
+
+@pytest.mark.asyncio
+async def test_transfer_retry_does_not_double_debit(monkeypatch) -> None:
+    monkeypatch.setattr(
+        mock_banking_api, "store", InMemoryBankingStore.from_users(USERS)
+    )
+    transport = _LosesFirstResponses(failures=2)
+    api = BankingAPIClient(
+        base_url="http://testserver", transport=transport, retry_backoff=0.001
+    )
+
+    result = await api.transfer_money("4421", "Anjali", 500.0, "1234")
+
+    assert result["status"] == "success"
+    assert len(transport.keys) == 3 and len(set(transport.keys)) == 1
+    assert mock_banking_api.store.find_account("4421")[1]["balance"] == 27440.0
+    assert api.pool_stats()["retries"] == 2
+    await api.aclose()
+
+
+@pytest.mark.asyncio
+async def test_unanswered_transfer_carries_its_key_for_resubmission(
+    monkeypatch,
+) -> None:
+    monkeypatch.setattr(
+        mock_banking_api, "store", InMemoryBankingStore.from_users(USERS)
+    )
+    transport = _LosesFirstResponses(failures=3)
+    api = BankingAPIClient(
+        base_url="http://testserver",
+        transport=transport,
+        max_retries=2,
+        retry_backoff=0.001,
+    )
+
+    with pytest.raises(PaymentOutcomeUnknownError) as unknown:
+        await api.transfer_money("4421", "Anjali", 500.0, "1234")
+    # The debit was applied even though no response came back
+    assert mock_banking_api.store.find_account("4421")[1]["balance"] == 27440.0
+
+    result = await api.transfer_money(
+        "4421", "Anjali", 500.0, "1234", unknown.value.idempotency_key
+    )
+    assert result["balance"] == 27440.0
+    assert len(mock_banking_api.store.ledger_entries("4421")) == 1
+    await api.aclose()
+
+
+@pytest.mark.asyncio
+async def test_rejected_payments_say_why(monkeypatch) -> None:
+    monkeypatch.setattr(
+        mock_banking_api, "store", InMemoryBankingStore.from_users(USERS)
+    )
+    async with _client() as api:
+        with pytest.raises(PaymentRejectedError) as bad_pin:
+            await api.transfer_money("4421", "Anjali", 500.0, "0000")
+        assert (bad_pin.value.code, bad_pin.value.status_code) == ("invalid_pin", 401)
+        with pytest.raises(PaymentRejectedError) as broke:
+            await api.transfer_money("9920", "Father", 10_000.0, "1234")
+        assert broke.value.code == "insufficient_funds"
+        with pytest.raises(PaymentRejectedError) as no_bill:
+            await api.pay_bill("4421", "Netflix", 10.0, "1234")
+        assert no_bill.value.code == "bill_not_found"
+
+
+@pytest.mark.asyncio
+async def test_retries_are_bounded() -> None:
+    api = BankingAPIClient(
+        base_url="http://testserver",
+        transport=_LosesFirstResponses(failures=10),
+        max_retries=1,
+        retry_backoff=0.001,
+    )
+    assert await api.get_loans() == []
+    assert api.pool_stats()["requests"] == 2
+    await api.aclose()
+
+
+class _FailingTransport(httpx.AsyncBaseTransport):
+    def __init__(self):
+        self.calls = 0
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        self.calls += 1
+        raise httpx.ConnectError("backend down", request=request)
+
+
+@pytest.mark.asyncio
+async def test_open_circuit_fails_fast() -> None:
+    transport = _FailingTransport()
+    api = BankingAPIClient(
+        base_url="http://testserver",
+        transport=transport,
+        max_retries=0,
+        breaker_failure_threshold=3,
+    )
+    api.set_user_id("rahul_sharma")
+
+    for _ in range(5):
+        assert await api.get_bills() == []
+
+    assert transport.calls == 3
+    assert not api.endpoint_healthy("bills")
+    assert api.circuit_stats()["bills"]["state"] == "open"
+    assert api.endpoint_healthy("accounts")
+    await api.aclose()
+
+
+class _SlowFirstRequest(httpx.AsyncBaseTransport):
+    """The first request stalls; later ones are fast."""
+
+    def __init__(self):
+        self._app = httpx.ASGITransport(app=app)
+        self.calls = 0
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        self.calls += 1
+        if self.calls == 1:
+            await asyncio.sleep(1.0)
+        return await self._app.handle_async_request(request)
+
+
+@pytest.mark.asyncio
+async def test_slow_get_is_hedged() -> None:
+    transport = _SlowFirstRequest()
+    api = BankingAPIClient(base_url="http://testserver", transport=transport)
+    tracker = api._latency_tracker("accounts")
+    for _ in range(tracker.min_samples):
+        tracker.record(0.01)
+    api.set_user_id("rahul_sharma")
+
+    started = asyncio.get_running_loop().time()
+    assert len(await api.get_accounts()) == 3
+    assert asyncio.get_running_loop().time() - started < 0.5
+
+    stats = api.pool_stats()
+    assert stats["hedges"] == 1 and stats["hedge_wins"] == 1
+    await api.aclose()
+
+
+@pytest.mark.asyncio
+async def test_iter_transactions_pages_with_filters(monkeypatch) -> None:
+    monkeypatch.setattr(
+        mock_banking_api, "store", InMemoryBankingStore.from_users(USERS)
+    )
+    async with _client() as api:
+        api.set_user_id("rahul_sharma")
+        everything = await api.get_transactions(limit=100)
+        paged = [txn async for txn in api.iter_transactions(page_size=3)]
+        assert paged == everything
+
+        november = [
+            txn
+            async for txn in api.iter_transactions(
+                start="2025-11-15", end="2025-11-18", page_size=2
+            )
+        ]
+        assert [t["id"] for t in november] == ["TXN006", "TXN007", "TXN008"]
+        utilities = await api.get_transactions(category="utilities")
+        assert utilities and all(t["category"] == "utilities" for t in utilities)
+
+        response = await api._client().get(
+            "/api/users/rahul_sharma/transactions", params={"start": "last month"}
+        )
+        assert response.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_fetch_many_returns_resources_in_one_request(monkeypatch) -> None:
+    monkeypatch.setattr(
+        mock_banking_api, "store", InMemoryBankingStore.from_users(USERS)
+    )
+    async with _client() as api:
+        batch = await api.fetch_many(
+            ["accounts", "bills", "credit_limit"], account_number="9920"
+        )
+        assert api.user_id == "rahul_sharma"
+        assert batch["user"]["account_number"] == "9920"
+        assert len(batch["accounts"]) == 3
+        assert batch["bills"] == await api.get_bills()
+        assert batch["credit_limit"]["credit_limit"] == 250000.0
+        assert "contacts" not in batch
+        assert api.pool_stats()["requests"] == 2
+
+        assert await api.fetch_many(["accounts", "passwords"]) is None
+        assert await api.fetch_many(["accounts"], account_number="0000") is None
+
+
+@pytest.mark.asyncio
+async def test_prefetch_falls_back_without_batch_endpoint(monkeypatch) -> None:
+    monkeypatch.setattr(
+        mock_banking_api, "store", InMemoryBankingStore.from_users(USERS)
+    )
+
+    async def no_batch(self, *args, **kwargs):
+        return None
+
+    monkeypatch.setattr(BankingAPIClient, "fetch_many", no_batch)
+    async with _client() as api:
+        api.set_user_id("rahul_sharma")
+        profile = await api.prefetch_profile()
+        assert len(profile.accounts) == 3 and profile.contacts
+        assert api.pool_stats()["requests"] == 5
+
+
+@pytest.mark.asyncio
+async def test_static_endpoints_serve_preserialized_bodies() -> None:
+    async with httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app), base_url="http://testserver"
+    ) as http:
+        loans = await http.get("/api/loans")
+        rates = await http.get("/api/interest-rates")
+    assert loans.headers["content-type"] == "application/json"
+    assert loans.content == mock_banking_api.LOANS_RESPONSE.body
+    assert loans.json() == {"loan_products": mock_banking_api.LOAN_PRODUCTS}
+    assert rates.json() == {"interest_rates": mock_banking_api.INTEREST_RATES}
@@ -0,0 +1,228 @@
+import asyncio
+from typing import Optional
+
+import httpx
+import pytest
+
+import mock_banking_api
+from banking_api import BankingAPIClient
+from banking_tools import BankingTools
+from mock_banking_api import USERS, app
+from mock_banking_store import InMemoryBankingStore
+
+
+def _tools(transport: Optional[httpx.AsyncBaseTransport] = None) -> BankingTools:
+    transport = transport or httpx.ASGITransport(app=app)
+    return BankingTools(
+        BankingAPIClient(
+            base_url="http://testserver", transport=transport, retry_backoff=0.001
+        )
+    )
+
+
+class _LosesPaymentResponses(httpx.AsyncBaseTransport):
+    """Applies every request but drops the first POST responses, like a timeout after the debit"""
+
+    def __init__(self, failures: int):
+        self._app = httpx.ASGITransport(app=app)
+        self.failures = failures
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        response = await self._app.handle_async_request(request)
+        if request.method == "POST" and self.failures > 0:
+            self.failures -= 1
+            raise httpx.ReadTimeout("response lost", request=request)
+        return response
+
+
+def _single_user_store(bill_status: str) -> InMemoryBankingStore:
+    return InMemoryBankingStore.from_users(
+        {
+            "kiran": {
+                "name": "Kiran Rao",
+                "credit_limit": 50000.0,
+                "credit_utilized": 0.0,
+                "accounts": [
+                    {
+                        "account_number": "7001",
+                        "account_type": "Savings",
+                        "balance": 1000.0,
+                        "currency": "INR",
+                    }
+                ],
+                "contacts": [
+                    {"name": "Meera Rao", "phone": "+91-90000-00001", "account": "7002"}
+                ],
+                "bills": [
+                    {
+                        "biller": "BESCOM",
+                        "amount": 300.0,
+                        "due_date": "2025-12-05",
+                        "status": bill_status,
+                    }
+                ],
+                "transactions": [],
+            },
+        }
+    )
+
+
+def test_tool_names_come_from_declared_tools() -> None:
+    names = BankingTools.tool_names()
+    assert {
+        "get_balance",
+        "get_bills",
+        "get_loans",
+        "transfer_money",
+        "pay_bill",
+    } <= set(names)
+    assert "degraded_answer" not in names
+    assert len(_tools().function_tools()) == len(names)
+
+
+@pytest.mark.asyncio
+async def test_identity_resolved_once_per_account() -> None:
+    tools = _tools()
+    async with tools.banking_api as api:
+        assert await tools.get_balance("4421") == "Account 4421: ₹27,940"
+        assert "BESCOM" in await tools.get_bills("4421")
+        assert "Anjali" in await tools.get_contacts("4421")
+        # one identify + one batched profile prefetch, then everything is answered from memory
+        assert api.pool_stats()["requests"] == 2
+
+
+@pytest.mark.asyncio
+async def test_identical_concurrent_calls_share_one_request() -> None:
+    tools = _tools()
+    async with tools.banking_api as api:
+        results = await asyncio.gather(*(tools.get_balance("4421") for _ in range(5)))
+        assert set(results) == {"Account 4421: ₹27,940"}
+        # one identify + one batched profile prefetch; the balance comes from the profile
+        assert api.pool_stats()["requests"] == 2
+
+
+@pytest.mark.asyncio
+async def test_reads_require_identity_but_reference_data_does_not() -> None:
+    tools = _tools()
+    async with tools.banking_api:
+        assert (
+            await tools.get_accounts("")
+            == "Please provide an account number so I can identify your accounts."
+        )
+        assert "Home Loan" in await tools.get_loans()
+
+
+@pytest.mark.asyncio
+async def test_duplicate_transfer_in_one_turn_debits_once(monkeypatch) -> None:
+    monkeypatch.setattr(
+        mock_banking_api, "store", InMemoryBankingStore.from_users(USERS)
+    )
+    tools = _tools()
+    async with tools.banking_api:
+        results = await asyncio.gather(
+            *(tools.transfer_money("4421", "Anjali", 500.0, "1234") for _ in range(2))
+        )
+        assert results[0] == results[1]
+        assert "Transaction ID" in results[0]
+        assert len(mock_banking_api.store.ledger_entries("4421")) == 1
+
+
+@pytest.mark.asyncio
+async def test_transaction_search_totals_filtered_history(monkeypatch) -> None:
+    monkeypatch.setattr(
+        mock_banking_api, "store", InMemoryBankingStore.from_users(USERS)
+    )
+    tools = _tools()
+    async with tools.banking_api:
+        answer = await tools.get_transactions("4421", category="utilities")
+        totals, header = answer.splitlines()[1], answer.splitlines()[2]
+        matching, spent, _ = totals.split("|")
+        assert int(matching) >= 1 and float(spent) > 0
+        assert header == "date|inr|description"
+        assert (
+            await tools.get_transactions(
+                "4421", category="utilities", start_date="2030-01-01"
+            )
+            == "No matching transactions."
+        )
+
+
+@pytest.mark.asyncio
+async def test_spending_is_totalled_by_the_backend(monkeypatch) -> None:
+    monkeypatch.setattr(
+        mock_banking_api, "store", InMemoryBankingStore.from_users(USERS)
+    )
+    tools = _tools()
+    async with tools.banking_api:
+        answer = await tools.get_spending(
+            "4421", start_month="2025-11", end_month="2025-11"
+        )
+        lines = answer.splitlines()
+        assert lines[0] == "category|spent_inr|received_inr|count"
+        assert lines[-1].startswith("total|")
+        assert any(line.startswith("utilities|") for line in lines)
+        assert (
+            await tools.get_spending("4421", start_month="2030-01")
+            == "No transactions in this period."
+        )
+        assert (
+            await tools.get_spending("4421", group_by="weekday")
+            == "API data temporarily unavailable, using fallback data"
+        )
+
+
+@pytest.mark.asyncio
+async def test_transfer_resolves_spoken_contact_names(monkeypatch) -> None:
+    monkeypatch.setattr(
+        mock_banking_api, "store", InMemoryBankingStore.from_users(USERS)
+    )
+    tools = _tools()
+    async with tools.banking_api:
+        sent = await tools.transfer_money("4421", "अंजली", 100.0, "1234")
+        assert "to Anjali Verma" in sent
+        assert "to Father" in await tools.transfer_money("4421", "papa", 50.0, "1234")
+
+        unknown = await tools.transfer_money("4421", "Priya", 100.0, "1234")
+        assert unknown.startswith(
+            "No saved contact matches Priya. The caller has: Anjali Verma"
+        )
+        assert unknown.endswith("No money was sent.")
+        assert len(mock_banking_api.store.ledger_entries("4421")) == 2
+
+        unpaid = await tools.pay_bill("4421", "Netflix", 1.0, "1234")
+        assert unpaid.startswith("No pending bill matches Netflix.")
+        assert unpaid.endswith("No money was debited.")
+
+
+@pytest.mark.asyncio
+async def test_payment_replies_distinguish_rejection_from_unknown_outcome(
+    monkeypatch,
+) -> None:
+    monkeypatch.setattr(mock_banking_api, "store", _single_user_store("pending"))
+    transport = _LosesPaymentResponses(failures=0)
+    tools = _tools(transport)
+    async with tools.banking_api:
+        assert await tools.transfer_money("7001", "Meera", 100.0, "0000") == (
+            "The PIN is incorrect. No money was sent. Ask the caller to enter their PIN again."
+        )
+        assert await tools.transfer_money("7001", "Meera", 5000.0, "1234") == (
+            "The account does not have enough balance. No money was sent."
+        )
+
+        # Every response to the next attempt (and its two retries) is lost
+        transport.failures = 3
+        unknown = await tools.transfer_money("7001", "Meera", 100.0, "1234")
+        assert unknown.startswith("The bank has not confirmed this transfer")
+        assert "failed" not in unknown.split("Do not say")[0]
+        # The debit happened; asking again re-checks under the same key
+        confirmed = await tools.transfer_money("7001", "Meera", 100.0, "1234")
+        assert "Transaction ID" in confirmed
+        assert len(mock_banking_api.store.ledger_entries("7001")) == 1
+
+
+@pytest.mark.asyncio
+async def test_all_bills_paid_is_an_answer_not_an_outage(monkeypatch) -> None:
+    monkeypatch.setattr(mock_banking_api, "store", _single_user_store("paid"))
+    tools = _tools()
+    async with tools.banking_api:
+        assert await tools.get_bills("7001") == "No pending bills."
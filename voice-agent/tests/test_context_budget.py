@@ -0,0 +1,143 @@
+from livekit.agents import llm
+
+from banking_tools import format_bills, format_transactions
+from context_budget import SUMMARY_HEADER, ContextBudget, compact_table, estimate_tokens
+
+EXAMPLES = "\nExample conversation flows:\nUser: What's my balance?\nYou: Could you provide your account number?"
+
+
+def _conversation(turns: int, tool_rows: int = 0) -> llm.ChatContext:
+    ctx = llm.ChatContext.empty()
+    ctx.add_message(role="system", content="You are VaaniPay." + EXAMPLES)
+    for n in range(turns):
+        ctx.add_message(role="user", content=f"Question number {n} about my account")
+        if tool_rows:
+            ctx.items.append(
+                llm.FunctionCall(
+                    call_id=f"c{n}",
+                    name="get_transactions",
+                    arguments='{"account_number": "4421"}',
+                )
+            )
+            rows = "\n".join(
+                f"2025-11-{d:02d}|-{d * 100}|Payment {d}"
+                for d in range(1, tool_rows + 1)
+            )
+            ctx.items.append(
+                llm.FunctionCallOutput(
+                    call_id=f"c{n}",
+                    name="get_transactions",
+                    output=rows,
+                    is_error=False,
+                )
+            )
+        ctx.add_message(role="assistant", content=f"Answer number {n}")
+    return ctx
+
+
+def _texts(ctx: llm.ChatContext) -> list:
+    return [item.text_content for item in ctx.items if item.type == "message"]
+
+
+def test_estimate_tokens_weights_indic_script_higher() -> None:
+    assert estimate_tokens("") == 0
+    assert estimate_tokens("balance") == 2
+    assert estimate_tokens("बैलेंस") == 3
+
+
+def test_compact_table() -> None:
+    assert (
+        compact_table(("biller", "inr"), [("BESCOM", 720), ("Airtel", 499)])
+        == "biller|inr\nBESCOM|720\nAirtel|499"
+    )
+    assert compact_table(("biller", "inr"), []) == ""
+
+
+def test_tool_formatters_are_compact() -> None:
+    txns = [
+        {
+            "timestamp": "2025-11-12T10:00:00",
+            "amount": -720.0,
+            "description": "BESCOM bill",
+        }
+    ] * 10
+    assert format_transactions(txns).splitlines()[:2] == [
+        "date|inr|description",
+        "2025-11-12|-720|BESCOM bill",
+    ]
+    bills = [
+        {
+            "biller": "BESCOM",
+            "amount": 720.0,
+            "due_date": "2025-11-20",
+            "status": "pending",
+        },
+        {
+            "biller": "Airtel",
+            "amount": 499.0,
+            "due_date": "2025-11-01",
+            "status": "paid",
+        },
+    ]
+    assert format_bills(bills) == "biller|inr|due\nBESCOM|720|2025-11-20"
+
+
+def test_short_call_is_untouched() -> None:
+    budget = ContextBudget(examples=EXAMPLES)
+    ctx = _conversation(2)
+    fitted, turn = budget.fit(ctx)
+    assert _texts(fitted) == _texts(ctx)
+    assert turn.tokens_before == turn.tokens_after
+    assert turn.summarized_turns == 0
+
+
+def test_examples_dropped_and_old_turns_summarized() -> None:
+    budget = ContextBudget(keep_turns=2, examples=EXAMPLES)
+    ctx = _conversation(5)
+    fitted, turn = budget.fit(ctx)
+    texts = _texts(fitted)
+    assert texts[0] == "You are VaaniPay."
+    assert texts[1].startswith(SUMMARY_HEADER)
+    assert "Caller: Question number 0 about my account" in texts[1]
+    assert "You: Answer number 2" in texts[1]
+    assert texts[2:] == [
+        "Question number 3 about my account",
+        "Answer number 3",
+        "Question number 4 about my account",
+        "Answer number 4",
+    ]
+    assert turn.summarized_turns == 3
+    assert turn.tokens_after < turn.tokens_before
+    # The agent's own history is left alone
+    assert len(ctx.items) == 11
+
+
+def test_budget_shrinks_earlier_tool_outputs_first() -> None:
+    ctx = _conversation(3, tool_rows=40)
+    budget = ContextBudget(max_tokens=700, keep_turns=3, max_tool_tokens=40)
+    fitted, turn = budget.fit(ctx)
+    outputs = [
+        item.output for item in fitted.items if item.type == "function_call_output"
+    ]
+    assert len(outputs) == 3
+    assert outputs[0].endswith("more rows)") and outputs[1].endswith("more rows)")
+    # The current turn's tool output stays whole
+    assert outputs[2].count("\n") == 39
+    assert turn.summarized_turns == 0
+    assert turn.tokens_after <= 700
+
+
+def test_budget_summarizes_more_turns_when_still_over() -> None:
+    ctx = _conversation(4, tool_rows=40)
+    budget = ContextBudget(max_tokens=500, keep_turns=4, max_tool_tokens=40)
+    fitted, turn = budget.fit(ctx)
+    assert turn.tokens_after <= 500
+    assert turn.summarized_turns >= 1
+    # Tool calls are never split from their outputs
+    calls = {item.call_id for item in fitted.items if item.type == "function_call"}
+    outputs = {
+        item.call_id for item in fitted.items if item.type == "function_call_output"
+    }
+    assert calls == outputs
+    assert budget.metrics()["turns"] == 1
+    assert budget.metrics()["saved_ratio"] > 0.5
@@ -0,0 +1,64 @@
+from intent_router import (
+    extract_account_number,
+    render_bills,
+    render_loans,
+    route_intent,
+)
+
+
+def test_routes_simple_lookups_in_several_languages() -> None:
+    intent = route_intent("balance of 4421")
+    assert (intent.name, intent.language, intent.slots) == (
+        "balance",
+        "en-IN",
+        {"account_number": "4421"},
+    )
+    assert route_intent("मेरा बैलेंस बताइए").name == "balance"
+    assert route_intent("मेरा बैलेंस बताइए").language == "hi-IN"
+    assert route_intent("show my bills").name == "bills"
+    assert route_intent("என் கடன் வட்டி விகிதம் என்ன?").name == "loans"
+    assert route_intent("నా బ్యాలెన్స్ ఎంత?").language == "te-IN"
+
+
+def test_actions_and_ambiguous_requests_go_to_the_llm() -> None:
+    assert route_intent("pay my BESCOM bill") is None
+    assert route_intent("बिजली का बिल भुगतान करो") is None
+    assert route_intent("Anjali ko 500 bhej do") is None
+    assert route_intent("what is my balance and my pending bills") is None
+    assert route_intent("hello there") is None
+    long = "I was wondering if you could possibly tell me what my balance might be right now please"
+    assert route_intent(long).confidence < 0.9
+
+
+def test_near_miss_questions_are_not_templated() -> None:
+    """Spending, deposit and savings rate questions share words with the templates."""
+    assert route_intent("how much money did I spend on groceries last month") is None
+    assert route_intent("what is the interest rate on my fixed deposit") is None
+    assert route_intent("savings account interest rate") is None
+    assert route_intent("FD पर ब्याज दर क्या है") is None
+    assert route_intent("what was my balance last month").confidence < 0.9
+    assert route_intent("loan against my fixed deposit").confidence < 0.9
+    assert (
+        route_intent("balance of 4421").confidence
+        > route_intent("what is my balance").confidence
+    )
+
+
+def test_account_number_grammar() -> None:
+    assert extract_account_number("account ४४२१") == "4421"
+    assert extract_account_number("account 4 4 2 1 balance") == "4421"
+    assert extract_account_number("only 12 rupees") is None
+
+
+def test_templates() -> None:
+    bills = [
+        {"biller": "BESCOM", "amount": 720.0, "status": "pending"},
+        {"biller": "Water", "amount": 350.0, "status": "paid"},
+    ]
+    assert render_bills("hi-IN", bills) == "आपके बकाया बिल: BESCOM 720 रुपये।"
+    assert render_bills("en-IN", bills[1:]) is None
+    loans = [{"type": "Home Loan", "interest_rate": 8.5}]
+    assert (
+        render_loans("xx-XX", loans)
+        == "Current annual loan interest rates: Home Loan 8.5%."
+    )
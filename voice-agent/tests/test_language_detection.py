@@ -0,0 +1,31 @@
+from language_detection import detect_language
+
+
+def test_detects_each_script() -> None:
+    assert detect_language("मेरा बैलेंस बताइए").language == "hi-IN"
+    assert detect_language("నా ఖాతా బ్యాలెన్స్ ఎంత?").language == "te-IN"
+    assert detect_language("என் கணக்கு இருப்பு என்ன?").language == "ta-IN"
+    assert detect_language("আমার ব্যালেন্স কত।").language == "bn-IN"
+    assert detect_language("What's my balance?").language == "en-IN"
+
+
+def test_mixed_script_prefers_indic_over_latin() -> None:
+    # Hindi speakers say "balance" and "account"; the Latin majority must not lock English
+    detection = detect_language("मेरा balance बताइए please, account number 4421")
+    assert detection.language == "hi-IN"
+    assert detection.counts == {"devanagari": 9, "latin": 26}
+    assert round(detection.confidence, 2) == 0.26
+    # A stray Indic letter in an English sentence is below MIN_INDIC_SHARE
+    assert (
+        detect_language("please transfer the money to my account ठ").language == "en-IN"
+    )
+
+    # Previously Devanagari always won because it was checked first
+    assert detect_language("நான் பணம் அனுப்ப வேண்டும் ok नहीं").language == "ta-IN"
+
+
+def test_empty_and_non_letter_input() -> None:
+    detection = detect_language("4421 ... ?")
+    assert detection.language == "en-IN"
+    assert detection.confidence == 0.0
+    assert detection.language_name == "English"
@@ -0,0 +1,199 @@
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from mock_banking_seed import USERS, generate_users
+from mock_banking_sqlite import MIGRATIONS, SQLiteBankingStore
+from mock_banking_store import InMemoryBankingStore, LedgerError
+
+
+@pytest.fixture
+def db(tmp_path) -> str:
+    return str(tmp_path / "bank.db")
+
+
+def _payer_and_payee() -> dict:
+    return {
+        "payer": {
+            "name": "Kiran Rao",
+            "accounts": [
+                {
+                    "account_number": "7001",
+                    "account_type": "Savings",
+                    "balance": 1000.0,
+                    "currency": "INR",
+                }
+            ],
+            "contacts": [
+                {"name": "Meera Rao", "phone": "+91-90000-00001", "account": "7002"}
+            ],
+            "bills": [
+                {
+                    "biller": "BESCOM",
+                    "amount": 300.0,
+                    "due_date": "2025-12-05",
+                    "status": "pending",
+                }
+            ],
+            "transactions": [],
+        },
+        "payee": {
+            "name": "Meera Rao",
+            "accounts": [
+                {
+                    "account_number": "7002",
+                    "account_type": "Savings",
+                    "balance": 50.0,
+                    "currency": "INR",
+                }
+            ],
+            "contacts": [],
+            "bills": [],
+            "transactions": [],
+        },
+    }
+
+
+def test_migrations_and_demo_data_round_trip(db) -> None:
+    store = SQLiteBankingStore.from_users(USERS, db)
+    assert store.schema_version() == len(MIGRATIONS)
+    assert store.get_user("rahul_sharma") == {
+        k: v for k, v in USERS["rahul_sharma"].items() if k != "transactions"
+    }
+
+    user_id, account = store.find_account("9920")
+    assert user_id == "rahul_sharma"
+    assert account["account_type"] == "Salary Account"
+    assert store.find_account("0000") is None
+    assert [t["id"] for t in store.recent_transactions("rahul_sharma", limit=3)] == [
+        "TXN001",
+        "TXN002",
+        "TXN003",
+    ]
+    with pytest.raises(ValueError):
+        store.add_account(
+            "arjun_reddy",
+            {"account_number": "9920", "account_type": "Savings", "balance": 0.0},
+        )
+
+    # Reopening applies no migrations and keeps the data; seeding only fills an empty database
+    reopened = SQLiteBankingStore(db)
+    assert reopened.migrate() == len(MIGRATIONS)
+    assert reopened.seed_if_empty(USERS.items()) == 0
+    assert len(reopened) == len(USERS)
+
+
+def test_reads_match_in_memory_store(db) -> None:
+    users = list(generate_users(3, seed=11, transactions_per_user=300))
+    memory = InMemoryBankingStore()
+    memory.load(users)
+    store = SQLiteBankingStore(db)
+    assert store.load(users) == 3
+    user_id = users[1][0]
+
+    for kwargs in (
+        {},
+        {"category": "groceries"},
+        {"start": "2025-06-01", "end": "2025-09-01"},
+    ):
+        memory_cursor = sqlite_cursor = None
+        while True:
+            expected, memory_cursor = memory.transactions_page(
+                user_id, limit=25, cursor=memory_cursor, **kwargs
+            )
+            page, sqlite_cursor = store.transactions_page(
+                user_id, limit=25, cursor=sqlite_cursor, **kwargs
+            )
+            assert page == expected
+            assert sqlite_cursor == memory_cursor
+            if sqlite_cursor is None:
+                break
+
+    for group_by in ("category", "month", "counterparty"):
+        expected = {g[group_by]: g for g in memory.spending_summary(user_id, group_by)}
+        assert {
+            g[group_by]: g for g in store.spending_summary(user_id, group_by)
+        } == expected
+    with pytest.raises(ValueError):
+        store.transactions_page(user_id, cursor="not-a-cursor")
+
+
+def test_transfer_credits_payee_and_replays_idempotently(db) -> None:
+    store = SQLiteBankingStore.from_users(_payer_and_payee(), db)
+
+    first = store.transfer("7001", "meera", 400.0, idempotency_key="k1")
+    assert first["balance"] == 600.0
+    assert store.find_account("7002")[1]["balance"] == 450.0
+    credit = store.recent_transactions("payee", 1)[0]
+    assert credit["description"] == "from Kiran Rao"
+    # Each leg has its own id; the credit's is derived from the payer's reference
+    legs = [e["transaction_id"] for e in store.ledger_entries()]
+    assert legs == [first["transaction_id"], credit["id"]] and len(set(legs)) == 2
+    assert store.transfer("7001", "meera", 400.0, idempotency_key="k1") == first
+    assert len(store.ledger_entries("7001")) == 1
+    with pytest.raises(LedgerError) as reused:
+        store.transfer("7001", "meera", 500.0, idempotency_key="k1")
+    assert reused.value.status_code == 422
+    with pytest.raises(LedgerError) as broke:
+        store.transfer("7001", "Meera", 10_000.0)
+    assert broke.value.status_code == 400
+
+    assert store.pay_bill("7001", "bescom", 300.0)["biller"] == "BESCOM"
+    assert store.get_user("payer")["bills"][0]["status"] == "paid"
+    with pytest.raises(LedgerError):
+        store.pay_bill("7001", "BESCOM", 300.0)
+    assert store.spending_summary("payer", "counterparty")[0] == {
+        "counterparty": "Meera Rao",
+        "spent": 400.0,
+        "received": 0.0,
+        "count": 1,
+    }
+
+
+def test_concurrent_transfers_across_workers_never_lose_updates(db) -> None:
+    # Two stores on one file stand in for two API worker processes
+    workers = [
+        SQLiteBankingStore.from_users(_payer_and_payee(), db),
+        SQLiteBankingStore(db),
+    ]
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        results = list(
+            pool.map(
+                lambda i: workers[i % 2].transfer("7001", "Meera", 1.0, f"c{i}"),
+                range(200),
+            )
+        )
+
+    assert len({r["transaction_id"] for r in results}) == 200
+    assert workers[1].find_account("7001")[1]["balance"] == 800.0
+    assert workers[0].find_account("7002")[1]["balance"] == 250.0
+    assert workers[0].ledger_stats()["ledger_entries"] == 400
+
+
+def test_failed_connect_returns_its_pool_slot(db, monkeypatch) -> None:
+    store = SQLiteBankingStore(db, pool_size=1)
+    store.close()
+    connect = store._connect
+
+    def refuse():
+        raise sqlite3.OperationalError("unable to open database file")
+
+    monkeypatch.setattr(store, "_connect", refuse)
+    with pytest.raises(sqlite3.OperationalError):
+        store.schema_version()
+    monkeypatch.setattr(store, "_connect", connect)
+    # Still room to open the one pooled connection instead of blocking on an empty pool
+    assert store.schema_version() == len(MIGRATIONS)
+
+
+def test_pay_bill_rejects_amounts_other_than_due(db) -> None:
+    store = SQLiteBankingStore.from_users(_payer_and_payee(), db)
+
+    with pytest.raises(LedgerError) as mismatch:
+        store.pay_bill("7001", "bescom", 250.0)
+    assert mismatch.value.code == "amount_mismatch"
+    assert store.find_account("7001")[1]["balance"] == 1000.0
+    assert store.get_user("payer")["bills"][0]["status"] == "pending"
+    assert store.pay_bill("7001", "bescom", 300.0)["balance"] == 700.0
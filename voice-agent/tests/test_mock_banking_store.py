@@ -0,0 +1,228 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from mock_banking_seed import USERS, generate_users
+from mock_banking_store import InMemoryBankingStore, LedgerError
+
+
+def test_indexes_match_demo_data() -> None:
+    store = InMemoryBankingStore.from_users(USERS)
+
+    user_id, account = store.find_account("9920")
+    assert user_id == "rahul_sharma"
+    assert account["account_type"] == "Salary Account"
+    assert store.find_account("0000") is None
+
+    recent = store.recent_transactions("rahul_sharma", limit=3)
+    assert [t["id"] for t in recent] == ["TXN001", "TXN002", "TXN003"]
+
+    window = store.transactions_between("rahul_sharma", "2025-11-15", "2025-11-18")
+    assert [t["id"] for t in window] == ["TXN008", "TXN007", "TXN006"]
+
+
+def test_mutations_keep_indexes_in_sync() -> None:
+    store = InMemoryBankingStore.from_users(USERS)
+
+    store.add_account(
+        "priya_patel",
+        {
+            "account_number": "6001",
+            "account_type": "Savings",
+            "balance": 10.0,
+            "currency": "INR",
+        },
+    )
+    assert store.find_account("6001")[0] == "priya_patel"
+    assert len(store.get_accounts("priya_patel")) == 3
+    with pytest.raises(ValueError):
+        store.add_account(
+            "arjun_reddy",
+            {"account_number": "6001", "account_type": "Savings", "balance": 0.0},
+        )
+
+    store.add_transaction(
+        "priya_patel", {"id": "T1", "amount": -5.0, "timestamp": "2025-11-20T00:00:00"}
+    )
+    store.add_transaction(
+        "priya_patel", {"id": "T2", "amount": -5.0, "timestamp": "2025-12-01T00:00:00"}
+    )
+    assert [t["id"] for t in store.recent_transactions("priya_patel", 2)] == [
+        "T2",
+        "TXN201",
+    ]
+
+
+def test_transactions_page_follows_cursors_with_filters() -> None:
+    store = InMemoryBankingStore()
+    [(user_id, user)] = generate_users(1, seed=3, transactions_per_user=300)
+    store.add_user(user_id, user)
+    everything = store.recent_transactions(user_id, limit=1000)
+
+    seen, cursor = [], None
+    while True:
+        page, cursor = store.transactions_page(user_id, limit=40, cursor=cursor)
+        seen += page
+        if cursor is None:
+            break
+    assert seen == everything
+
+    start, end = everything[200]["timestamp"][:10], everything[20]["timestamp"][:10]
+    groceries, cursor = store.transactions_page(
+        user_id, limit=1000, start=start, end=end, category="groceries"
+    )
+    assert cursor is None
+    assert groceries == [
+        t
+        for t in everything
+        if t["category"] == "groceries" and start <= t["timestamp"] < end
+    ]
+
+    # A transaction posted between pages does not shift the next page
+    page, cursor = store.transactions_page(user_id, limit=5)
+    store.add_transaction(
+        user_id,
+        {
+            "id": "NEW",
+            "amount": -1.0,
+            "timestamp": "2099-01-01T00:00:00",
+            "category": "groceries",
+        },
+    )
+    assert (
+        store.transactions_page(user_id, limit=5, cursor=cursor)[0] == everything[5:10]
+    )
+    assert (
+        store.transactions_page(user_id, limit=1, category="groceries")[0][0]["id"]
+        == "NEW"
+    )
+    with pytest.raises(ValueError):
+        store.transactions_page(user_id, cursor="not-a-cursor")
+
+
+def test_spending_rollup_matches_raw_transactions() -> None:
+    store = InMemoryBankingStore()
+    [(user_id, user)] = generate_users(1, seed=5, transactions_per_user=400)
+    store.add_user(user_id, user)
+    txns = store.recent_transactions(user_id, limit=1000)
+    month = txns[0]["timestamp"][:7]
+
+    by_category = store.spending_summary(user_id, "category", month, month)
+    in_month = [t for t in txns if t["timestamp"].startswith(month)]
+    for group in by_category:
+        expected = sum(
+            -t["amount"]
+            for t in in_month
+            if t["category"] == group["category"] and t["amount"] < 0
+        )
+        assert group["spent"] == round(expected, 2)
+    assert [g["spent"] for g in by_category] == sorted(
+        (g["spent"] for g in by_category), reverse=True
+    )
+
+    by_month = store.spending_summary(user_id, "month")
+    assert [g["month"] for g in by_month] == sorted({t["timestamp"][:7] for t in txns})
+    assert sum(g["count"] for g in by_month) == len(txns)
+    with pytest.raises(ValueError):
+        store.spending_summary(user_id, "weekday")
+
+
+def test_ledger_writes_update_spending_rollup() -> None:
+    store = InMemoryBankingStore.from_users(USERS)
+    before = {
+        g["counterparty"]: g
+        for g in store.spending_summary("rahul_sharma", "counterparty")
+    }
+    store.transfer("4421", "Anjali", 500.0)
+    store.add_transaction(
+        "rahul_sharma",
+        {
+            "id": "B1",
+            "amount": -720.0,
+            "description": "BESCOM bill payment",
+            "timestamp": "2025-11-25T09:00:00",
+            "category": "utilities",
+        },
+    )
+
+    after = {
+        g["counterparty"]: g
+        for g in store.spending_summary("rahul_sharma", "counterparty")
+    }
+    assert after["Anjali Verma"]["spent"] == before["Anjali Verma"]["spent"] + 500.0
+    assert after["BESCOM"]["spent"] == before["BESCOM"]["spent"] + 720.0
+
+
+def test_seed_generator_is_deterministic_and_indexable() -> None:
+    first = list(generate_users(50, seed=7))
+    assert first == list(generate_users(50, seed=7))
+
+    store = InMemoryBankingStore.from_users(USERS)
+    assert store.load(first) == 50
+    assert store.stats()["users"] == len(USERS) + 50
+    user_id, user = first[-1]
+    assert store.find_account(user["accounts"][0]["account_number"])[0] == user_id
+
+
+def test_transfer_debits_and_replays_idempotently() -> None:
+    store = InMemoryBankingStore.from_users(USERS)
+
+    first = store.transfer("4421", "Anjali", 500.0, idempotency_key="k1")
+    assert first["balance"] == 27440.0
+    assert store.find_account("4421")[1]["balance"] == 27440.0
+    assert (
+        store.recent_transactions("rahul_sharma", 1)[0]["id"] == first["transaction_id"]
+    )
+
+    # A retry with the same key does not debit again
+    assert store.transfer("4421", "Anjali", 500.0, idempotency_key="k1") == first
+    assert len(store.ledger_entries("4421")) == 1
+    with pytest.raises(LedgerError) as reused:
+        store.transfer("4421", "Anjali", 600.0, idempotency_key="k1")
+    assert reused.value.status_code == 422
+
+    with pytest.raises(LedgerError) as broke:
+        store.transfer("9920", "Father", 10_000.0)
+    assert broke.value.status_code == 400
+
+
+def test_pay_bill_marks_bill_paid() -> None:
+    store = InMemoryBankingStore.from_users(USERS)
+
+    result = store.pay_bill("4421", "bescom", 720.0)
+    assert result["biller"] == "BESCOM"
+    bill = next(
+        b for b in store.get_user("rahul_sharma")["bills"] if b["biller"] == "BESCOM"
+    )
+    assert bill["status"] == "paid"
+    with pytest.raises(LedgerError):
+        store.pay_bill("4421", "BESCOM", 720.0)
+
+
+def test_concurrent_transfers_never_lose_updates() -> None:
+    store = InMemoryBankingStore.from_users(USERS)
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        results = list(
+            pool.map(
+                lambda i: store.transfer("4421", "Ramesh", 1.0, f"c{i}"), range(400)
+            )
+        )
+
+    assert len({r["transaction_id"] for r in results}) == 400
+    assert store.find_account("4421")[1]["balance"] == 27940.0 - 400
+    assert store.ledger_stats()["ledger_entries"] == 400
+
+
+def test_pay_bill_rejects_amounts_other_than_due() -> None:
+    store = InMemoryBankingStore.from_users(USERS)
+
+    for amount in (700.0, 800.0):
+        with pytest.raises(LedgerError) as mismatch:
+            store.pay_bill("4421", "BESCOM", amount)
+        assert mismatch.value.status_code == 400
+        assert mismatch.value.code == "amount_mismatch"
+    # Nothing moved and the bill is still payable in full
+    assert store.find_account("4421")[1]["balance"] == 27940.0
+    assert store.ledger_entries("4421") == []
+    assert store.pay_bill("4421", "BESCOM", 720.0)["balance"] == 27220.0
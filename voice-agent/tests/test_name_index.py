@@ -0,0 +1,65 @@
+from mock_banking_seed import USERS
+from name_index import NameIndex, phonetic_key, transliterate
+
+CONTACTS = [
+    "Anjali Verma",
+    "Ramesh Kumar",
+    "Father",
+    "Sourav Ganguly",
+    "Karthik Subramanian",
+]
+
+
+def test_transliteration_shares_keys_across_scripts() -> None:
+    assert transliterate("अंजली") == "anjalii"
+    assert transliterate("रमेश") == "ramesh"
+    assert transliterate("Airtel") == "Airtel"
+    for latin, *spellings in [
+        ("Anjali", "Anjalee", "अंजली"),
+        ("Karthik", "కార్తీక్", "கார்த்திக்"),
+        ("Sanjay", "സഞ്ജയ്"),
+        ("BESCOM", "बेस्कॉम"),
+        ("Gautam", "गौतम"),
+    ]:
+        assert {phonetic_key(s) for s in spellings} == {phonetic_key(latin)}
+
+
+def test_resolves_spoken_names_to_saved_contacts() -> None:
+    index = NameIndex((name, {"name": name}) for name in CONTACTS)
+
+    assert index.resolve("Anjali Verma").score == 1.0
+    assert index.resolve("अंजली").name == "Anjali Verma"
+    assert index.resolve("अंजली वर्मा").name == "Anjali Verma"
+    assert index.resolve("Ramesh ji").name == "Ramesh Kumar"
+    assert index.resolve("Rmesh").name == "Ramesh Kumar"
+    assert index.resolve("সৌরভ").name == "Sourav Ganguly"
+    assert index.resolve("पापा").item == {"name": "Father"}
+    assert index.resolve("Priya") is None
+    assert index.search("") == []
+
+
+def test_ties_are_ambiguous() -> None:
+    index = NameIndex((name, name) for name in ["Anjali Verma", "Anjali Rao"])
+    assert index.resolve("Anjali") is None
+    assert [m.name for m in index.search("Anjali")] == ["Anjali Verma", "Anjali Rao"]
+    assert index.resolve("Anjali Rao").name == "Anjali Rao"
+
+
+def test_billers_match_common_words() -> None:
+    index = NameIndex(
+        (name, name) for name in ["BESCOM", "Water", "Airtel", "Credit Card"]
+    )
+    assert index.resolve("बिजली").name == "BESCOM"
+    assert index.resolve("एयरटेल").name == "Airtel"
+    assert index.resolve("card").name == "Credit Card"
+
+
+def test_seeded_billers_match_utility_words() -> None:
+    bills = USERS["rahul_sharma"]["bills"]
+    index = NameIndex((bill["biller"], bill) for bill in bills)
+    for spoken in ("बिजली", "bijli", "electricity", "current"):
+        assert index.resolve(spoken).name == "BESCOM"
+    assert index.resolve("पानी").name == "Water"
+    assert index.resolve("cylinder").name == "Gas"
+    # A board and a saved "Electricity" biller both answer to "bijli": ask, don't guess
+    assert NameIndex((n, n) for n in ["BESCOM", "Electricity"]).resolve("bijli") is None
@@ -0,0 +1,48 @@
+import time
+
+import pytest
+
+from resilience import CircuitBreaker, CircuitOpenError, LatencyTracker
+
+
+def test_breaker_opens_then_half_open_probe_closes_it() -> None:
+    breaker = CircuitBreaker("balance", failure_threshold=2, reset_timeout=0.05)
+    breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.CLOSED and not breaker.healthy
+
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    with pytest.raises(CircuitOpenError):
+        breaker.allow()
+
+    time.sleep(0.06)
+    breaker.allow()  # the single probe
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    with pytest.raises(CircuitOpenError):
+        breaker.allow()
+
+    breaker.record_success()
+    assert breaker.healthy
+    assert breaker.metrics()["rejected"] == 2
+
+
+def test_failed_probe_reopens_circuit() -> None:
+    breaker = CircuitBreaker("bills", failure_threshold=1, reset_timeout=0.01)
+    breaker.record_failure()
+    time.sleep(0.02)
+    breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    assert breaker.metrics()["opened"] == 2
+
+
+def test_latency_percentile_needs_samples() -> None:
+    tracker = LatencyTracker(window=100, min_samples=10)
+    for ms in range(1, 10):
+        tracker.record(ms / 1000)
+    assert tracker.percentile(95) is None
+    for ms in range(10, 101):
+        tracker.record(ms / 1000)
+    assert tracker.percentile(50) == pytest.approx(0.05, abs=0.002)
+    assert tracker.percentile(95) == pytest.approx(0.095, abs=0.002)
@@ -0,0 +1,72 @@
+import pytest
+
+from sanitizer import (
+    ResponseSanitizer,
+    StreamingSanitizer,
+    sanitize_response,
+    sanitize_stream,
+)
+
+
+def test_strips_tool_calls_and_json() -> None:
+    text = 'Tool: get_banking_data Parameters: {"data_type": "balance"} Your balance is 27,940 rupees.'
+    assert sanitize_response(text) == "Your balance is 27,940 rupees."
+    assert sanitize_response('Done {"status": "success"} .') == "Done."
+
+
+def test_cleans_whitespace_and_punctuation() -> None:
+    assert sanitize_response("  Hello  ,  world ..  ") == "Hello, world."
+    assert sanitize_response("Sure. calling: get_banking_data now. OK") == "Sure. OK"
+
+
+def test_leaves_natural_multilingual_text_alone() -> None:
+    text = "आपके खाते 4421 में 27,940 रुपये हैं। क्या मैं और कुछ मदद कर सकती हूँ?"
+    assert sanitize_response(text) == text
+    assert sanitize_response("") == ""
+
+
+def test_function_names_are_configurable() -> None:
+    sanitizer = ResponseSanitizer(["lookup_loans"])
+    assert sanitizer.sanitize("I used lookup_loans for that.") == "I used for that."
+    assert sanitizer.sanitize("pay_bill stays") == "pay_bill stays"
+
+
+def stream_in_chunks(text: str, size: int) -> str:
+    sanitizer = StreamingSanitizer()
+    out = [sanitizer.push(text[i : i + size]) for i in range(0, len(text), size)]
+    return "".join(out) + sanitizer.flush()
+
+
+def test_streaming_matches_whole_text() -> None:
+    samples = [
+        'Tool: get_banking_data Parameters: {"data_type": "balance. now"} Your balance is 27,940 rupees.',
+        "Sure. calling: get_banking_data now. OK, anything else?",
+        "आपके खाते में 27,940 रुपये हैं। क्या मैं और कुछ मदद कर सकती हूँ?",
+        "Hello , world .. Next one! Yes?",
+    ]
+    for text in samples:
+        for size in (1, 3, 7, len(text)):
+            assert stream_in_chunks(text, size) == sanitize_response(text)
+
+
+def test_streaming_releases_clauses_before_the_reply_ends() -> None:
+    sanitizer = StreamingSanitizer()
+    assert sanitizer.push("Your balance is 27,940") == ""
+    assert sanitizer.push(" rupees. Would") == "Your balance is 27,940 rupees."
+    assert sanitizer.push(' you like {"tool": "pay_bill", ') == ""
+    assert sanitizer.push('"x": 1} more help?') == ""
+    assert sanitizer.flush() == " Would you like more help?"
+
+
+@pytest.mark.asyncio
+async def test_sanitize_stream() -> None:
+    async def deltas():
+        for delta in [
+            "Tool: pay_bill Parameters: {",
+            '"biller": "BESCOM"}',
+            " Paid. ",
+            "Thanks!",
+        ]:
+            yield delta
+
+    assert [chunk async for chunk in sanitize_stream(deltas())] == ["Paid.", " Thanks!"]
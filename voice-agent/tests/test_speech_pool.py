@@ -0,0 +1,77 @@
+import asyncio
+
+import pytest
+
+from speech_pool import SpeechModelPool
+
+
+class FakeModel:
+    def __init__(self, kind: str, language: str):
+        self.kind = kind
+        self.language = language
+        self.prewarmed = False
+        self.closed = False
+
+    def prewarm(self) -> None:
+        self.prewarmed = True
+
+    async def aclose(self) -> None:
+        self.closed = True
+
+
+def make_pool() -> SpeechModelPool:
+    return SpeechModelPool(
+        stt_factory=lambda language: FakeModel("stt", language),
+        tts_factory=lambda language: FakeModel("tts", language),
+    )
+
+
+@pytest.mark.asyncio
+async def test_instances_are_reused_per_language() -> None:
+    pool = make_pool()
+    hindi = pool.tts("hi-IN")
+    assert pool.tts("hi-IN") is hindi
+    assert pool.tts("ta-IN") is not hindi
+    assert pool.stt("hi-IN").kind == "stt"
+    assert pool.metrics()["constructed"] == 3
+    assert pool.metrics()["reused"] == 1
+
+
+@pytest.mark.asyncio
+async def test_prewarm_and_close() -> None:
+    pool = make_pool()
+    pool.prewarm(["hi-IN"])
+    stt, tts = pool.stt("hi-IN"), pool.tts("hi-IN")
+    assert stt.prewarmed and tts.prewarmed
+    assert pool.metrics()["reused"] == 2
+
+    await pool.aclose()
+    assert stt.closed and tts.closed
+    assert pool.tts("hi-IN") is not tts
+
+
+def test_each_event_loop_gets_its_own_instances() -> None:
+    pool = make_pool()
+
+    async def get():
+        return pool.tts("hi-IN")
+
+    assert asyncio.run(get()) is not asyncio.run(get())
+
+
+def test_built_before_any_loop_is_adopted_by_the_first() -> None:
+    """prewarm_fnc builds with no loop running; the process's job loop uses those instances"""
+    pool = make_pool()
+    assert pool.build(["hi-IN"]) == 2
+    assert pool.build(["unknown"], kinds=("stt",)) == 1
+    built = pool.metrics()["constructed"]
+
+    async def job():
+        return pool.stt("unknown"), pool.tts("hi-IN")
+
+    first = asyncio.run(job())
+    assert pool.metrics()["constructed"] == built
+    assert first[0].language == "unknown" and first[1].language == "hi-IN"
+    # A later loop (thread executor job) builds its own
+    assert asyncio.run(job())[1] is not first[1]
+    assert pool.metrics()["constructed"] == built + 2
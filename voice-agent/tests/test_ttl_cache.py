@@ -0,0 +1,70 @@
+import asyncio
+
+import pytest
+
+from ttl_cache import AsyncTTLCache
+
+
+class _Backend:
+    def __init__(self, delay: float = 0.0):
+        self.calls = 0
+        self.delay = delay
+        self.fail = False
+
+    async def fetch(self) -> int:
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        if self.fail:
+            raise RuntimeError("backend down")
+        return self.calls
+
+
+@pytest.mark.asyncio
+async def test_concurrent_misses_share_one_fetch() -> None:
+    cache, backend = AsyncTTLCache(ttl=60), _Backend(delay=0.01)
+
+    results = await asyncio.gather(
+        *[cache.get_or_fetch("loans", backend.fetch) for _ in range(10)]
+    )
+
+    assert results == [1] * 10
+    assert backend.calls == 1
+    assert cache.metrics()["misses"] == 1
+    assert cache.metrics()["coalesced"] == 9
+
+    assert await cache.get_or_fetch("loans", backend.fetch) == 1
+    assert cache.metrics()["hits"] == 1
+
+
+@pytest.mark.asyncio
+async def test_stale_value_served_while_revalidating() -> None:
+    cache, backend = AsyncTTLCache(ttl=0, stale_ttl=60), _Backend()
+    assert await cache.get_or_fetch("rates", backend.fetch) == 1
+
+    # Expired but within the stale window: old value now, refresh in background
+    assert await cache.get_or_fetch("rates", backend.fetch) == 1
+    await asyncio.sleep(0.01)
+    assert backend.calls == 2
+    assert cache.metrics()["stale_hits"] == 1
+
+    # A failed refresh keeps serving the stale value
+    backend.fail = True
+    assert await cache.get_or_fetch("rates", backend.fetch) == 2
+    await asyncio.sleep(0.01)
+    assert cache.metrics()["refresh_errors"] == 1
+
+
+@pytest.mark.asyncio
+async def test_invalidate_and_errors_are_not_cached() -> None:
+    cache, backend = AsyncTTLCache(ttl=60), _Backend()
+    assert await cache.get_or_fetch("loans", backend.fetch) == 1
+
+    cache.invalidate("loans")
+    assert await cache.get_or_fetch("loans", backend.fetch) == 2
+
+    cache.invalidate()
+    backend.fail = True
+    with pytest.raises(RuntimeError):
+        await cache.get_or_fetch("loans", backend.fetch)
+    backend.fail = False
+    assert await cache.get_or_fetch("loans", backend.fetch) == 4
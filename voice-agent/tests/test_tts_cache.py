@@ -0,0 +1,153 @@
+import pytest
+from livekit import rtc
+
+from tts_cache import CachedAudio, TTSAudioCache, phrase_key, speak_cached
+
+
+def make_frames(count: int, fill: int = 1) -> list:
+    return [
+        rtc.AudioFrame(
+            data=bytes([fill, 0]) * 480,
+            sample_rate=24000,
+            num_channels=1,
+            samples_per_channel=480,
+        )
+        for _ in range(count)
+    ]
+
+
+def test_key_normalizes_text_but_not_voice() -> None:
+    key = phrase_key("hi-IN", "manisha", "bulbul:v2", "Please enter your PIN")
+    assert (
+        phrase_key("hi-IN", "manisha", "bulbul:v2", "  please  enter your PIN ") == key
+    )
+    assert phrase_key("en-IN", "manisha", "bulbul:v2", "Please enter your PIN") != key
+    assert phrase_key("hi-IN", "anushka", "bulbul:v2", "Please enter your PIN") != key
+
+
+def test_cached_audio_round_trip() -> None:
+    audio = CachedAudio.from_frames(make_frames(3))
+    restored = CachedAudio.from_bytes(audio.to_bytes())
+    assert restored == audio
+    frames = list(restored.frames())
+    assert len(frames) == 3
+    assert sum(f.samples_per_channel for f in frames) == 1440
+
+
+@pytest.mark.asyncio
+async def test_phrases_are_admitted_on_second_request() -> None:
+    cache = TTSAudioCache(admit_after=2)
+    key = phrase_key("en-IN", "manisha", "bulbul:v2", "Please enter your PIN")
+
+    assert await cache.get(key) is None
+    assert not await cache.put(key, make_frames(2))
+    assert await cache.get(key) is None
+    assert await cache.put(key, make_frames(2))
+
+    cached = await cache.get(key)
+    assert cached is not None and len(cached.pcm) == 2 * 960
+    assert cache.metrics()["memory_hits"] == 1
+
+
+@pytest.mark.asyncio
+async def test_memory_tier_is_bounded() -> None:
+    cache = TTSAudioCache(memory_bytes=3 * 960, admit_after=0)
+    for i in range(3):
+        await cache.put(f"k{i}", make_frames(1))
+    await cache.get("k0")
+    await cache.put("k3", make_frames(1))
+
+    assert await cache.get("k1") is None
+    assert await cache.get("k0") is not None
+    assert cache.metrics()["evictions"] == 1
+
+
+@pytest.mark.asyncio
+async def test_disk_tier_survives_restart_and_is_bounded(tmp_path) -> None:
+    cache = TTSAudioCache(
+        disk_dir=str(tmp_path), disk_bytes=2 * (960 + 8), admit_after=0
+    )
+    for i in range(3):
+        await cache.put(f"k{i}", make_frames(1, fill=i))
+
+    restarted = TTSAudioCache(disk_dir=str(tmp_path), admit_after=0)
+    assert await restarted.get("k0") is None
+    cached = await restarted.get("k2")
+    assert cached is not None and cached.pcm[0] == 2
+    assert restarted.metrics()["disk_hits"] == 1
+    assert len(list(tmp_path.iterdir())) == 2
+
+
+def test_amounts_and_balances_are_never_cached() -> None:
+    cache = TTSAudioCache()
+    assert cache.cacheable("Please enter your PIN")
+    assert not cache.cacheable("Your balance is 27,940 rupees")
+    assert not cache.cacheable("खाता ४४२१")
+    assert not cache.cacheable("Sent ₹500 to Anjali")
+
+
+async def _reply(*phrases: str):
+    for phrase in phrases:
+        yield phrase
+
+
+@pytest.mark.asyncio
+async def test_reply_streams_once_and_splices_cache_hits() -> None:
+    cache = TTSAudioCache(admit_after=2)
+    streams = []
+
+    async def synthesize(text):
+        streams.append([])
+        async for chunk in text:
+            streams[-1].append(chunk)
+            for frame in make_frames(1, fill=len(streams)):
+                yield frame
+
+    def key_of(phrase):
+        return phrase_key("en-IN", "manisha", "bulbul:v2", phrase)
+
+    async def speak(*phrases):
+        streams.clear()
+        return [
+            f.data[0]
+            async for f in speak_cached(_reply(*phrases), cache, key_of, synthesize)
+        ]
+
+    # Streamed the first time; synthesized on its own to be stored once admitted
+    await speak("Is that correct?")
+    assert streams == [["Is that correct? "]]
+    await speak("Is that correct?")
+    assert streams == [["Is that correct?"]]
+
+    fills = await speak(
+        "Sending 500 rupees to Anjali.",
+        "Is that correct?",
+        "Shall I go ahead",
+        "with it?",
+    )
+    # Uncached text shares one stream per run; the cached phrase plays in between without synthesis
+    assert streams == [
+        ["Sending 500 rupees to Anjali. "],
+        ["Shall I go ahead ", "with it? "],
+    ]
+    assert fills == [1, 1, 2, 2]
+    assert cache.metrics()["memory_hits"] == 1
+
+
+@pytest.mark.asyncio
+async def test_marked_reference_readout_is_admitted() -> None:
+    cache = TTSAudioCache(admit_after=2)
+    rates = "Home Loan 8.5%, Personal Loan 10.5%, Car Loan 9.0%."
+    assert not cache.cacheable(rates)
+
+    cache.mark_reference(f"Current loan rates: {rates}")
+    assert cache.cacheable(rates)
+    # Only the marked text: amounts elsewhere stay caller-specific
+    assert not cache.cacheable("Your balance is 27,940 rupees")
+
+    key = phrase_key("en-IN", "manisha", "bulbul:v2", rates)
+    assert await cache.get(key) is None
+    assert not await cache.put(key, make_frames(2))
+    assert await cache.get(key) is None
+    assert await cache.put(key, make_frames(2))
+    assert await cache.get(key) is not None
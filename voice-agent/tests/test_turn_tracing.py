@@ -0,0 +1,137 @@
+import time
+from types import SimpleNamespace
+
+import pytest
+from livekit.agents import metrics
+from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+from prometheus_client import REGISTRY
+
+from turn_tracing import TurnTracer
+
+
+class FakeSession:
+    def __init__(self):
+        self.handlers = {}
+
+    def on(self, event, handler):
+        self.handlers[event] = handler
+
+    def emit(self, event, **fields):
+        self.handlers[event](SimpleNamespace(**fields))
+
+
+@pytest.fixture
+def spans():
+    exporter = InMemorySpanExporter()
+    provider = TracerProvider()
+    provider.add_span_processor(SimpleSpanProcessor(exporter))
+    return exporter, provider.get_tracer("test")
+
+
+def _count(metric: str, **labels) -> float:
+    return REGISTRY.get_sample_value(f"{metric}_count", labels) or 0.0
+
+
+def test_stages_are_children_of_the_turn(spans) -> None:
+    exporter, otel_tracer = spans
+    tracer = TurnTracer(call_id="room-1", tracer=otel_tracer)
+    tracer.language = "te-IN"
+    stages_before = _count(
+        "vaanipay_turn_stage_seconds", stage="tool:balance", language="te-IN"
+    )
+    turns_before = _count(
+        "vaanipay_turn_latency_seconds", language="te-IN", path="fast_path"
+    )
+
+    tracer.begin_turn()
+    with tracer.stage("tool:balance"):
+        time.sleep(0.01)
+    tracer.path = "fast_path"
+    latency = tracer.end_turn()
+
+    finished = {span.name: span for span in exporter.get_finished_spans()}
+    turn = finished["turn"]
+    tool = finished["tool:balance"]
+    assert tool.parent.span_id == turn.context.span_id
+    assert tool.end_time - tool.start_time >= 10_000_000
+    assert turn.attributes["vaanipay.call_id"] == "room-1"
+    assert turn.attributes["vaanipay.path"] == "fast_path"
+    assert latency >= 0.01
+    assert (
+        _count("vaanipay_turn_stage_seconds", stage="tool:balance", language="te-IN")
+        == stages_before + 1
+    )
+    assert (
+        _count("vaanipay_turn_latency_seconds", language="te-IN", path="fast_path")
+        == turns_before + 1
+    )
+
+
+def test_session_events_open_and_close_turns(spans) -> None:
+    exporter, otel_tracer = spans
+    tracer = TurnTracer(tracer=otel_tracer)
+    session = FakeSession()
+    tracer.observe(session)
+    now = time.time()
+
+    session.emit(
+        "user_state_changed",
+        old_state="speaking",
+        new_state="listening",
+        created_at=now,
+    )
+    session.emit(
+        "metrics_collected",
+        metrics=metrics.EOUMetrics(
+            timestamp=now,
+            end_of_utterance_delay=0.5,
+            transcription_delay=0.2,
+            on_user_turn_completed_delay=0.0,
+        ),
+    )
+    session.emit(
+        "agent_state_changed",
+        old_state="thinking",
+        new_state="speaking",
+        created_at=now + 1.2,
+    )
+
+    finished = {span.name: span for span in exporter.get_finished_spans()}
+    assert finished["turn"].end_time - finished["turn"].start_time == pytest.approx(
+        1.2e9, rel=1e-3
+    )
+    assert finished["stt_final"].end_time - finished[
+        "stt_final"
+    ].start_time == pytest.approx(0.2e9, rel=1e-3)
+    assert finished["end_of_utterance"].start_time == finished["turn"].start_time
+    assert tracer.turns == 1
+
+
+def test_unanswered_turn_is_closed_by_the_next_one(spans) -> None:
+    exporter, otel_tracer = spans
+    tracer = TurnTracer(tracer=otel_tracer)
+    tracer.begin_turn()
+    tracer.begin_turn()
+    assert tracer.end_turn() is not None
+    turns = [span for span in exporter.get_finished_spans() if span.name == "turn"]
+    assert [span.attributes["vaanipay.answered"] for span in turns] == [False, True]
+    assert tracer.end_turn() is None
+
+
+@pytest.mark.asyncio
+async def test_time_to_first_records_only_the_first_item(spans) -> None:
+    exporter, otel_tracer = spans
+    tracer = TurnTracer(tracer=otel_tracer)
+
+    async def tokens():
+        for token in ("Your", " balance", " is"):
+            yield token
+
+    assert [t async for t in tracer.time_to_first("llm_first_token", tokens())] == [
+        "Your",
+        " balance",
+        " is",
+    ]
+    assert [span.name for span in exporter.get_finished_spans()] == ["llm_first_token"]